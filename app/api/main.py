@@ -37,6 +37,12 @@ async def _init_db_background():
         init_db()
         mark_db_initialized()
         logger.info("✓ Background database initialization complete")
+        if settings.retrieval_backend == "memory":
+            from app.qa.vector_index import warm_chunk_index
+            await asyncio.to_thread(warm_chunk_index)
+        if settings.low_match_rewrite_mode == "speculative":
+            from app.qa.speculative import warm_low_match_history
+            await asyncio.to_thread(warm_low_match_history)
     except Exception as e:
         logger.error(f"✗ Background database initialization failed: {e}", exc_info=True)
         logger.warning("⚠️  Some endpoints may not work until database is accessible")
@@ -61,20 +67,21 @@ async def _prewarm_cache():
     from app.qa.cache import get_answer_cache, prewarm_from_db_history, _is_incomplete_answer, get_top_weak_match_questions
 
     cache = get_answer_cache()
+    # Let the background Redis load finish so phases below see every entry
+    await asyncio.to_thread(cache.wait_for_hydration, 60)
 
     # ── Phase 0: Clean incomplete cached answers ──
     logger.info("  🧹 Cleaning incomplete cached answers...")
     
     incomplete_count = 0
-    with cache._lock:
-        entries_to_delete = []
-        for entry in cache._entries:
-            answer = entry.response.get("answer", "")
-            if _is_incomplete_answer(answer):
-                incomplete_count += 1
-                entries_to_delete.append(entry.question)
-                logger.info("  ✗ Found incomplete: '%.50s...' (ends: '...%.30s')", 
-                           entry.question, answer[-30:] if answer else "")
+    entries_to_delete = []
+    for entry in cache.entries():
+        answer = entry.response.get("answer", "")
+        if _is_incomplete_answer(answer):
+            incomplete_count += 1
+            entries_to_delete.append(entry.question)
+            logger.info("  ✗ Found incomplete: '%.50s...' (ends: '...%.30s')", 
+                       entry.question, answer[-30:] if answer else "")
     
     if incomplete_count > 0:
         deleted = 0
@@ -224,6 +231,9 @@ async def _lifespan(_app: FastAPI):
     logger.info("="*60)
     logger.info("✓ Application startup complete (DB init deferred)")
     logger.info("Starting background DB initialization task...")
+    if settings.embedding_provider in ("sentence_transformers", "onnx"):
+        from app.indexing.embeddings import warm_embedding_model
+        asyncio.create_task(asyncio.to_thread(warm_embedding_model))
     asyncio.create_task(_init_db_background())
     asyncio.create_task(_prewarm_cache())
     asyncio.create_task(_daily_weak_match_prewarm_loop())
@@ -7,6 +7,13 @@ from sqlalchemy.orm import Session
 
 from app.api.auth import get_client_ip
 from app.api.rate_limit import enforce_rate_limit
+from app.core.concurrency import (
+    QuestionCapacityError,
+    acquire_question_slot,
+    release_question_slot,
+    run_sync,
+    stats as ask_concurrency_stats,
+)
 from app.core.config import settings
 from app.core.db import get_db
 from app.qa.guardrails import inspect_question, log_guardrail_block
@@ -50,13 +57,8 @@ def ask_options():
     return {"status": "ok"}
 
 
-@router.post("/ask")
-def ask(
-    payload: AskRequest,
-    request: Request,
-    db: Session = Depends(get_db),
-    bypass_cache: bool = Query(default=False),
-):
+async def _checked_question(payload: AskRequest, request: Request, route: str) -> tuple[str, str]:
+    """Validate, rate-limit and guardrail a question; returns (client ip, question)."""
     ip = get_client_ip(request)
     question = _normalize_incoming_question(payload.question)
     enforce_rate_limit(ip, question)
@@ -69,48 +71,85 @@ def ask(
     if settings.question_guardrails_enabled:
         decision = inspect_question(question)
         if not decision.allowed:
-            log_guardrail_block(question=question, user_ip=ip, decision=decision, route="/ask")
+            await run_sync(log_guardrail_block, question=question, user_ip=ip, decision=decision, route=route)
             raise HTTPException(status_code=400, detail=decision.message)
+    return ip, question
+
+
+async def _question_slot() -> None:
+    try:
+        await acquire_question_slot()
+    except QuestionCapacityError:
+        raise HTTPException(
+            status_code=503,
+            detail="We're answering a lot of questions right now. Please try again in a moment.",
+            headers={"Retry-After": "5"},
+        )
+
 
-    from app.qa.service import answer_question
+class _SlotStreamingResponse(StreamingResponse):
+    """
+    ``StreamingResponse`` that frees the request's question slot when the response is over.
 
-    if bypass_cache:
-        return answer_question(db, question, user_ip=ip, bypass_cache=True)
-    return answer_question(db, question, user_ip=ip)
+    Releasing it around the whole ASGI call, rather than in the body
+    generator, also covers clients that disconnect before the first chunk,
+    when the generator never starts and its ``finally`` never runs.
+    """
+
+    slot_held = True
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.release_slot()
+
+    def release_slot(self) -> None:
+        if self.slot_held:
+            self.slot_held = False
+            release_question_slot()
+
+
+@router.post("/ask")
+async def ask(
+    payload: AskRequest,
+    request: Request,
+    db: Session = Depends(get_db),
+    bypass_cache: bool = Query(default=False),
+):
+    ip, question = await _checked_question(payload, request, "/ask")
+
+    from app.qa.service import answer_question_async
+
+    await _question_slot()
+    try:
+        if bypass_cache:
+            return await answer_question_async(db, question, user_ip=ip, bypass_cache=True)
+        return await answer_question_async(db, question, user_ip=ip)
+    finally:
+        release_question_slot()
 
 
 @router.post("/ask/stream")
-def ask_stream(
+async def ask_stream(
     payload: AskRequest,
     request: Request,
     db: Session = Depends(get_db),
     bypass_cache: bool = Query(default=False),
 ):
     """Stream an answer using Server-Sent Events (SSE)."""
-    ip = get_client_ip(request)
-    question = _normalize_incoming_question(payload.question)
-    enforce_rate_limit(ip, question)
-    if not question:
-        raise HTTPException(status_code=400, detail="Question cannot be empty")
-    if _looks_like_placeholder_question(question):
-        raise HTTPException(status_code=400, detail="Please send a real question instead of a template placeholder")
-    if len(question) > 500:
-        raise HTTPException(status_code=400, detail="Question must be 500 characters or fewer")
-    if settings.question_guardrails_enabled:
-        decision = inspect_question(question)
-        if not decision.allowed:
-            log_guardrail_block(question=question, user_ip=ip, decision=decision, route="/ask/stream")
-            raise HTTPException(status_code=400, detail=decision.message)
+    ip, question = await _checked_question(payload, request, "/ask/stream")
 
-    from app.qa.service import answer_question_stream
+    from app.qa.service import answer_question_stream_async
 
     stream = (
-        answer_question_stream(db, question, user_ip=ip, context=payload.context or [], bypass_cache=True)
+        answer_question_stream_async(db, question, user_ip=ip, context=payload.context or [], bypass_cache=True)
         if bypass_cache
-        else answer_question_stream(db, question, user_ip=ip, context=payload.context or [])
+        else answer_question_stream_async(db, question, user_ip=ip, context=payload.context or [])
     )
 
-    return StreamingResponse(
+    await _question_slot()
+    return _SlotStreamingResponse(
         stream,
         media_type="text/event-stream",
         headers={
@@ -123,7 +162,21 @@ def ask_stream(
 
 @router.get("/api/cache/stats")
 def get_cache_stats():
-    """Return answer cache statistics."""
+    """Return answer and query-embedding cache statistics."""
+    from app.indexing.embedding_cache import get_embedding_cache
     from app.qa.cache import get_answer_cache
-
-    return get_answer_cache().stats()
+    from app.qa.metadata_pool import get_metadata_pool_stats
+    from app.qa.revalidate import get_stale_refresh_stats
+    from app.qa.singleflight import get_singleflight
+
+    stats = get_answer_cache().stats()
+    stats["stale_refresh"] = get_stale_refresh_stats()
+    stats["singleflight"] = get_singleflight().stats()
+    stats["ask_concurrency"] = ask_concurrency_stats()
+    stats["metadata_pool"] = get_metadata_pool_stats()
+    stats["embedding_cache"] = get_embedding_cache().stats()
+    if settings.embedding_provider == "openai" and settings.embedding_batch_window_ms > 0:
+        from app.indexing.embedding_batcher import get_embedding_batcher
+
+        stats["embedding_batcher"] = get_embedding_batcher().stats()
+    return stats
@@ -2,6 +2,7 @@ from fastapi import APIRouter, BackgroundTasks, Depends, Request
 from fastapi.security import HTTPBasicCredentials
 
 from app.api.auth import admin_auth, security
+from app.core.config import settings
 from app.core.db import get_session_local
 
 router = APIRouter()
@@ -13,6 +14,9 @@ def _run_ingestion_bg() -> None:
     db = get_session_local()()
     try:
         run_ingestion(db)
+        if settings.retrieval_backend == "memory":
+            from app.qa.vector_index import get_chunk_index
+            get_chunk_index().refresh(db)
     finally:
         db.close()
 
@@ -26,3 +30,19 @@ def ingest(
     admin_auth(credentials, request)
     background_tasks.add_task(_run_ingestion_bg)
     return {"status": "accepted"}
+
+
+@router.post("/admin/retrieval-index/reload")
+def reload_retrieval_index(
+    request: Request,
+    credentials: HTTPBasicCredentials = Depends(security),
+):
+    """Admin endpoint: fully reload the in-process chunk index after a re-embed."""
+    admin_auth(credentials, request)
+    if settings.retrieval_backend != "memory":
+        return {"status": "skipped", "reason": "retrieval_backend is not memory"}
+
+    from app.qa.vector_index import get_chunk_index
+
+    started = get_chunk_index().refresh_in_background(full=True)
+    return {"status": "accepted" if started else "busy"}
@@ -1,6 +1,7 @@
 import logging
 
 from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
 from sqlalchemy import text
 from sqlalchemy.orm import Session
 
@@ -24,6 +25,9 @@ def status(db: Session = Depends(get_db)):
 
     try:
         from app.storage.models import IngestRun
+        from app.qa.vector_index import get_chunk_index
+        from app.qa.speculative import get_speculative_rewrite_stats
+        from app.indexing.embeddings import local_model_stats
 
         episode_count = db.scalar(text("SELECT COUNT(*) FROM episodes"))
         chunk_count = db.scalar(text("SELECT COUNT(*) FROM chunks"))
@@ -40,6 +44,11 @@ def status(db: Session = Depends(get_db)):
             "notification_generation_model": settings.notification_generation_model,
             "embedding_provider": settings.embedding_provider,
             "embedding_model": settings.embedding_model,
+            "local_embedding_model": local_model_stats() if settings.embedding_provider in ("sentence_transformers", "onnx") else None,
+            "retrieval_backend": settings.retrieval_backend,
+            "retrieval_index": get_chunk_index().stats() if settings.retrieval_backend == "memory" else None,
+            "low_match_rewrite_mode": settings.low_match_rewrite_mode,
+            "speculative_rewrite": get_speculative_rewrite_stats() if settings.low_match_rewrite_mode == "speculative" else None,
             "max_tokens": settings.answer_max_tokens,
             "temperature": settings.answer_temperature,
             "cache_similarity_threshold": settings.cache_similarity_threshold,
@@ -60,3 +69,13 @@ def status(db: Session = Depends(get_db)):
             "db_ready": False,
             "message": str(e),
         }
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Expose this worker's in-process metrics in the Prometheus text format."""
+    from app.core import metrics
+    from app.qa.cache import get_answer_cache
+
+    get_answer_cache()  # builds the cache (and its gauges) on a first scrape
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
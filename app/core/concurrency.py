@@ -0,0 +1,110 @@
+"""
+Per-worker concurrency limits for the async /ask pipeline.
+
+The /ask handlers run on the event loop. Admission is bounded by a
+semaphore of ``ask_max_in_flight`` question slots; a request that cannot get
+one within ``ask_queue_timeout_seconds`` is turned away instead of queueing
+behind minutes of OpenAI calls.
+
+The blocking phases of /ask and /ask/stream (cache lookups, embedding,
+retrieval, logging) still use the sync SQLAlchemy session, so ``run_sync``
+runs them on worker threads capped by a dedicated limiter of
+``ask_sync_threads``. Each phase holds a thread for milliseconds; the
+10-25 s answer call and single-flight follower waits are awaited on the
+loop, so every admitted question makes progress without a thread of its own.
+
+Both limits live in anyio ``RunVar``s, so every event loop (each uvicorn
+worker, each test client) gets its own.
+"""
+
+import functools
+import logging
+
+import anyio
+import anyio.to_thread
+from anyio.lowlevel import RunVar
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+IN_FLIGHT = metrics.gauge("ask_questions_in_flight", "Questions this worker is answering right now")
+REJECTED = metrics.counter(
+    "ask_questions_rejected_total", "Questions turned away because every question slot stayed busy"
+)
+
+_slots: RunVar[anyio.Semaphore] = RunVar("ask_question_slots")
+_sync_limiter: RunVar[anyio.CapacityLimiter] = RunVar("ask_sync_limiter")
+
+_in_flight = 0
+_peak_in_flight = 0
+_rejected = 0
+
+
+class QuestionCapacityError(RuntimeError):
+    """Every question slot stayed busy for ``ask_queue_timeout_seconds``."""
+
+
+def _get_slots() -> anyio.Semaphore:
+    try:
+        return _slots.get()
+    except LookupError:
+        slots = anyio.Semaphore(max(1, settings.ask_max_in_flight))
+        _slots.set(slots)
+        return slots
+
+
+def _get_sync_limiter() -> anyio.CapacityLimiter:
+    try:
+        return _sync_limiter.get()
+    except LookupError:
+        limiter = anyio.CapacityLimiter(max(1, settings.ask_sync_threads))
+        _sync_limiter.set(limiter)
+        return limiter
+
+
+async def acquire_question_slot() -> None:
+    """
+    Take a question slot, waiting up to ``ask_queue_timeout_seconds``.
+
+    Raises ``QuestionCapacityError`` if none frees up. Every successful call
+    must be paired with ``release_question_slot``.
+    """
+    global _in_flight, _peak_in_flight, _rejected
+    slots = _get_slots()
+    acquired = False
+    with anyio.move_on_after(settings.ask_queue_timeout_seconds):
+        await slots.acquire()
+        acquired = True
+    if not acquired:
+        _rejected += 1
+        REJECTED.inc()
+        logger.warning("All %d question slots busy for %.1fs; rejecting request",
+                       settings.ask_max_in_flight, settings.ask_queue_timeout_seconds)
+        raise QuestionCapacityError("Too many questions in flight")
+    _in_flight += 1
+    _peak_in_flight = max(_peak_in_flight, _in_flight)
+    IN_FLIGHT.set(_in_flight)
+
+
+def release_question_slot() -> None:
+    global _in_flight
+    _in_flight -= 1
+    IN_FLIGHT.set(_in_flight)
+    _get_slots().release()
+
+
+async def run_sync(fn, *args, **kwargs):
+    """Run a blocking QA phase on the dedicated /ask thread limiter."""
+    return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs), limiter=_get_sync_limiter())
+
+
+def stats() -> dict:
+    return {
+        "in_flight": _in_flight,
+        "peak_in_flight": _peak_in_flight,
+        "rejected": _rejected,
+        "max_in_flight": settings.ask_max_in_flight,
+        "sync_threads": settings.ask_sync_threads,
+    }
@@ -2,6 +2,16 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import field_validator
 
 
+# Names accepted by app.qa.eviction.make_eviction_policy
+CACHE_EVICTION_POLICIES = ("gdsf", "lfu", "oldest")
+# Encodings accepted by app.qa.cache for Redis entry embeddings
+CACHE_EMBEDDING_DTYPES = ("float32", "float16")
+# Candidate search backends understood by app.qa.retrieval
+RETRIEVAL_BACKENDS = ("pgvector", "memory")
+# Modes understood by app.qa.service / app.qa.speculative
+LOW_MATCH_REWRITE_MODES = ("sequential", "batched", "speculative")
+
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -73,18 +83,34 @@ class Settings(BaseSettings):
     min_similarity: float = 0.15
     diversity_lambda: float = 0.7  # MMR: 0.0=max diversity, 1.0=max relevance
     max_cited_episodes: int = 5  # Maximum number of episodes to cite in response
+    retrieval_backend: str = "pgvector"  # pgvector | memory (in-process index, pgvector as fallback)
+    retrieval_index_refresh_seconds: int = 300  # Memory backend: pick up newly ingested chunks this often
 
     # Embeddings
-    embedding_provider: str = "local"  # local | sentence_transformers | openai
+    embedding_provider: str = "local"  # local | sentence_transformers | onnx (quantized all-MiniLM-L6-v2 on ONNX Runtime) | openai
     embedding_dim: int = 384
     # Keep this aligned with stored chunk vectors. Switch to text-embedding-3-large
     # only as part of a full re-embedding migration.
     embedding_model: str = "text-embedding-3-small"
+    embedding_cache_enabled: bool = True  # Memoize query embeddings (openai / sentence_transformers providers)
+    embedding_cache_max_entries: int = 4096  # In-memory LRU size (~1.5KB per 384-dim vector)
+    embedding_cache_ttl_seconds: int = 2592000  # Redis tier TTL (30 days); uses REDIS_URL when set
+    embedding_batch_window_ms: int = 5  # OpenAI provider: coalesce concurrent query embeds within this window (0 = off)
+    embedding_batch_max_size: int = 64  # OpenAI provider: send a coalesced batch early once it has this many texts
+    onnx_embedding_file: str = "onnx/model_quint8_avx2.onnx"  # onnx provider: weights file in the model repo (int8-quantized)
+    onnx_embedding_threads: int = 2  # onnx provider: ONNX Runtime intra-op threads per encode
+    local_embedding_batch_size: int = 32  # sentence_transformers / onnx providers: encode batch size
 
     # Transcription
     transcription_provider: str = "openai"  # openai | faster_whisper | none
     whisper_model: str = "tiny"  # Only used if transcription_provider="faster_whisper"
     openai_api_key: str | None = None  # OpenAI API key for transcription (optional if using faster_whisper)
+    openai_max_connections: int = 40  # Interactive client pool per worker (answers, follow-ups, headlines, query embeddings)
+    openai_max_keepalive_connections: int = 20  # Idle connections each pool keeps open for reuse
+    openai_background_max_connections: int = 4  # Background client pool per process (notification copy)
+    openai_keepalive_expiry_seconds: float = 60.0  # Drop idle OpenAI connections after this long
+    openai_connect_timeout_seconds: float = 5.0  # TCP + TLS connect timeout for OpenAI requests
+    openai_timeout_seconds: float = 90.0  # Read/write timeout for OpenAI requests (a whole non-streamed answer, or between streamed chunks)
 
     # Answer Generation
     answer_generation_provider: str = "openai"  # openai | basic
@@ -93,11 +119,34 @@ class Settings(BaseSettings):
     notification_generation_model: str = "gpt-4o-mini"  # QOTD/motivation copy generation
     answer_max_tokens: int = 800  # Maximum tokens for generated answers
     answer_temperature: float = 0.7  # 0.0 = deterministic, 1.0 = creative
+    answer_structured_generation: bool = False  # One OpenAI call returns answer + follow-ups + headline (JSON schema; streams end with a metadata trailer); separate calls fill any gaps
+    metadata_workers: int = 32  # Process-wide threads for follow-up/headline OpenAI calls (shared by all requests)
+    metadata_max_queued: int = 128  # Metadata tasks waiting for a worker; beyond this follow-ups use topic-based fallbacks
+    metadata_headline_max_queued: int = 32  # Headlines are shed first: past this queue depth the headline is taken from the answer text
+    ask_max_in_flight: int = 200  # Questions one worker answers at once (/ask + /ask/stream); waiting on OpenAI holds no thread
+    ask_queue_timeout_seconds: float = 5.0  # Wait this long for a free question slot before answering 503
+    ask_sync_threads: int = 32  # Threads per worker for /ask and /ask/stream's blocking phases (cache, embedding, retrieval, logging)
     low_match_retrieval_confidence_threshold: float = 0.42  # Trigger second-pass retrieval rewrite below this confidence
     low_match_best_similarity_threshold: float = 0.36  # Trigger second-pass retrieval when top chunk similarity is weak
+    low_match_rewrite_mode: str = "sequential"  # sequential: only after a weak first pass | batched: search original and rewrite together on every cache miss | speculative: parallel rewrite for predicted low-match questions
+    speculative_rewrite_threshold: float = 0.5  # Speculative mode: start the rewrite in parallel when the low-match score reaches this
+    speculative_rewrite_workers: int = 2  # Speculative mode: background threads for rewrite embed + retrieval
+    speculative_rewrite_history_size: int = 500  # Speculative mode: weak-match questions / key terms remembered
     cache_similarity_threshold: float = 0.89  # Minimum cosine similarity for cache hits (lowered from 0.92 to improve hit rate)
     cache_ttl_seconds: int = 604800  # Cache TTL (default: 7 days) to improve repeat-question hit rate
+    cache_stale_ttl_seconds: int = 86400  # Serve answers up to this long past TTL while one background refresh runs (0 = off)
+    cache_refresh_workers: int = 1  # Background regenerations for stale answers, process-wide
+    singleflight_enabled: bool = True  # Concurrent requests for the same question share one generation
+    singleflight_wait_seconds: int = 90  # Longest a coalesced request waits on the leader before generating itself
+    singleflight_max_waiters: int = 16  # Non-streaming requests allowed to wait on a leader at once
     cache_namespace: str = "citations-v3"  # bump to invalidate stale persisted answers safely
+    cache_background_hydration: bool = True  # Stream Redis entries into memory after startup instead of blocking
+    cache_embedding_dtype: str = "float32"  # Redis entry embedding encoding: float32 | float16 (half the bytes)
+    cache_eviction_policy: str = "gdsf"  # gdsf (hits × regeneration cost, aged) | lfu | oldest
+    cache_shared_memory_path: str | None = None  # e.g. /dev/shm/amt-answer-cache — mmap tier shared by all workers on the host
+    cache_shared_memory_entries: int = 2000  # Shared tier capacity (~17.5KB per entry with the defaults)
+    cache_shared_entry_bytes: int = 16384  # Max encoded entry size in the shared tier; larger answers stay worker-local
+    cache_l1_max_entries: int = 128  # Per-worker cache size when the shared tier is enabled
     weak_match_prewarm_enabled: bool = True
     weak_match_prewarm_daily_limit: int = 12
     weak_match_prewarm_lookback_days: int = 30
@@ -167,5 +216,61 @@ class Settings(BaseSettings):
             )
         return v
 
+    @field_validator("cache_eviction_policy")
+    @classmethod
+    def check_cache_eviction_policy(cls, v: str) -> str:
+        """Fall back to gdsf with a warning instead of failing the first cached request."""
+        import logging
+        policy = v.strip().lower()
+        if policy not in CACHE_EVICTION_POLICIES:
+            logging.getLogger(__name__).warning(
+                "Unknown CACHE_EVICTION_POLICY %r (expected one of %s); using 'gdsf'",
+                v, ", ".join(CACHE_EVICTION_POLICIES),
+            )
+            return "gdsf"
+        return policy
+
+    @field_validator("cache_embedding_dtype")
+    @classmethod
+    def check_cache_embedding_dtype(cls, v: str) -> str:
+        """Fall back to float32 with a warning instead of failing the first cached request."""
+        import logging
+        dtype = v.strip().lower()
+        if dtype not in CACHE_EMBEDDING_DTYPES:
+            logging.getLogger(__name__).warning(
+                "Unknown CACHE_EMBEDDING_DTYPE %r (expected one of %s); using 'float32'",
+                v, ", ".join(CACHE_EMBEDDING_DTYPES),
+            )
+            return "float32"
+        return dtype
+
+    @field_validator("low_match_rewrite_mode")
+    @classmethod
+    def check_low_match_rewrite_mode(cls, v: str) -> str:
+        """Fall back to sequential with a warning rather than silently ignoring a typo."""
+        import logging
+        mode = v.strip().lower()
+        if mode not in LOW_MATCH_REWRITE_MODES:
+            logging.getLogger(__name__).warning(
+                "Unknown LOW_MATCH_REWRITE_MODE %r (expected one of %s); using 'sequential'",
+                v, ", ".join(LOW_MATCH_REWRITE_MODES),
+            )
+            return "sequential"
+        return mode
+
+    @field_validator("retrieval_backend")
+    @classmethod
+    def check_retrieval_backend(cls, v: str) -> str:
+        """Fall back to pgvector with a warning rather than silently ignoring a typo."""
+        import logging
+        backend = v.strip().lower()
+        if backend not in RETRIEVAL_BACKENDS:
+            logging.getLogger(__name__).warning(
+                "Unknown RETRIEVAL_BACKEND %r (expected one of %s); using 'pgvector'",
+                v, ", ".join(RETRIEVAL_BACKENDS),
+            )
+            return "pgvector"
+        return backend
+
 
 settings = Settings()
@@ -0,0 +1,173 @@
+"""
+In-process counters and histograms, exported in the Prometheus text format.
+
+Each uvicorn worker keeps its own values; Prometheus scrapes ``GET /metrics``
+on every worker (or target) and sums the series. The exposition format is
+simple enough that no client library is needed:
+
+    # HELP answer_cache_lookups_total Answer cache lookups by method and outcome
+    # TYPE answer_cache_lookups_total counter
+    answer_cache_lookups_total{method="exact",outcome="hit"} 42
+
+Metrics are module-level singletons created with ``counter()``,
+``gauge()`` or ``histogram()``; calling a factory again with the same name
+returns the existing metric.
+"""
+
+import bisect
+import math
+import threading
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; tuned for in-memory lookups (sub-millisecond) up to Redis round trips
+LOOKUP_SECONDS_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+
+_registry: dict[str, "_Metric"] = {}
+_registry_lock = threading.Lock()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _samples(self):
+        raise NotImplementedError
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, names, values, value in self._samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(names, values)} {_format_value(value)}")
+        return lines
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def _samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            yield "", self.labelnames, key, value
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets=LOOKUP_SECONDS_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def snapshot(self, **labels) -> dict:
+        """Cumulative bucket counts ({upper bound: count}), sum and count for one label set."""
+        with self._lock:
+            counts, total = self._values.get(self._key(labels)) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts = list(counts)
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"buckets": buckets, "sum": total, "count": cumulative}
+
+    def _samples(self):
+        with self._lock:
+            keys = sorted(self._values)
+        names = self.labelnames + ("le",)
+        for key in keys:
+            snap = self.snapshot(**dict(zip(self.labelnames, key)))
+            for bound, count in snap["buckets"].items():
+                yield "_bucket", names, key + (_format_value(bound),), count
+            yield "_sum", self.labelnames, key, snap["sum"]
+            yield "_count", self.labelnames, key, snap["count"]
+
+
+def _register(cls, name: str, help: str, labelnames, **kwargs):
+    with _registry_lock:
+        metric = _registry.get(name)
+        if metric is None:
+            metric = _registry[name] = cls(name, help, tuple(labelnames), **kwargs)
+        elif not isinstance(metric, cls):
+            raise ValueError(f"metric {name} is already registered as a {metric.kind}")
+        return metric
+
+
+def counter(name: str, help: str, labelnames=()) -> Counter:
+    return _register(Counter, name, help, labelnames)
+
+
+def gauge(name: str, help: str, labelnames=()) -> Gauge:
+    return _register(Gauge, name, help, labelnames)
+
+
+def histogram(name: str, help: str, labelnames=(), buckets=LOOKUP_SECONDS_BUCKETS) -> Histogram:
+    return _register(Histogram, name, help, labelnames, buckets=buckets)
+
+
+def render() -> str:
+    """All registered metrics in the Prometheus text exposition format."""
+    with _registry_lock:
+        metrics = sorted(_registry.values(), key=lambda m: m.name)
+    lines = []
+    for metric in metrics:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
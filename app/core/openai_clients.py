@@ -0,0 +1,218 @@
+"""
+Process-wide pooled OpenAI clients.
+
+Building ``OpenAI(api_key=...)`` per call gives every request a fresh httpx
+connection pool, so every answer, follow-up and headline call paid for a
+new TCP connection and TLS handshake to api.openai.com. Clients here are
+built once per pool and keep connections alive between requests.
+
+There are two pools so background work cannot take the connections user
+requests are waiting on:
+
+- ``interactive``: answers, follow-ups, headlines, query embeddings;
+- ``background``: notification copy generation and other batch jobs.
+
+Each pool's requests are traced through httpx: a request either reuses a
+kept-alive connection or opens a new one, and the TCP + TLS setup time of
+new connections is recorded per pool. ``track_connections`` collects the
+same numbers for one request so the QA phase-timing log can show how much
+setup time connection reuse saved.
+
+Async clients are bound to the event loop they were created on, so they
+are kept per loop (anyio ``RunVar``) rather than per process.
+"""
+
+import contextlib
+import contextvars
+import threading
+import time
+
+from anyio.lowlevel import RunVar
+
+from app.core import metrics
+from app.core.config import settings
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+# Seconds; a TLS handshake to api.openai.com is typically 30-300 ms
+CONNECT_SECONDS_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.15, 0.25, 0.5, 1.0, 2.5)
+
+REQUESTS = metrics.counter(
+    "openai_client_requests_total",
+    "OpenAI API requests by client pool and whether they reused a kept-alive connection (new, reused)",
+    ("pool", "connection"),
+)
+CONNECT_SECONDS = metrics.histogram(
+    "openai_client_connect_seconds",
+    "TCP + TLS setup time of new OpenAI connections by client pool",
+    ("pool",),
+    buckets=CONNECT_SECONDS_BUCKETS,
+)
+
+_clients: dict[str, tuple[str, object]] = {}
+_clients_lock = threading.Lock()
+_async_clients: RunVar[dict] = RunVar("openai_async_clients")
+_usage: contextvars.ContextVar[dict | None] = contextvars.ContextVar("openai_connection_usage", default=None)
+
+
+def _pool_options(pool: str) -> dict:
+    # Limits/Timeout come from the HTTP library the installed SDK is built on
+    import openai
+
+    if pool == BACKGROUND:
+        max_connections = settings.openai_background_max_connections
+        keepalive = min(max_connections, settings.openai_max_keepalive_connections)
+    else:
+        max_connections = settings.openai_max_connections
+        keepalive = settings.openai_max_keepalive_connections
+    return {
+        "limits": type(openai.DEFAULT_CONNECTION_LIMITS)(
+            max_connections=max_connections,
+            max_keepalive_connections=keepalive,
+            keepalive_expiry=settings.openai_keepalive_expiry_seconds,
+        ),
+        "timeout": openai.Timeout(settings.openai_timeout_seconds, connect=settings.openai_connect_timeout_seconds),
+    }
+
+
+class _ConnectionTrace:
+    """httpcore trace callback timing new-connection setup for one request."""
+
+    __slots__ = ("connect_started", "connect_seconds")
+
+    def __init__(self):
+        self.connect_started = None
+        self.connect_seconds = None
+
+    def __call__(self, event: str, info: dict) -> None:
+        if event == "connection.connect_tcp.started":
+            self.connect_started = time.perf_counter()
+        elif event in ("connection.connect_tcp.complete", "connection.start_tls.complete"):
+            if self.connect_started is not None:
+                self.connect_seconds = time.perf_counter() - self.connect_started
+
+    async def atrace(self, event: str, info: dict) -> None:
+        self(event, info)
+
+
+def _on_request(request, trace: _ConnectionTrace, asynchronous: bool) -> None:
+    request.extensions["trace"] = trace.atrace if asynchronous else trace
+    request.extensions["openai_connection_trace"] = trace
+
+
+def _on_response(pool: str, response) -> None:
+    trace = response.request.extensions.get("openai_connection_trace")
+    if trace is None:
+        return
+    usage = _usage.get()
+    if trace.connect_seconds is None:
+        REQUESTS.inc(pool=pool, connection="reused")
+        if usage is not None:
+            usage["reused"] += 1
+        return
+    REQUESTS.inc(pool=pool, connection="new")
+    CONNECT_SECONDS.observe(trace.connect_seconds, pool=pool)
+    if usage is not None:
+        usage["new"] += 1
+        usage["connect_ms"] += trace.connect_seconds * 1000
+
+
+def _sync_http_client(pool: str):
+    from openai import DefaultHttpxClient
+
+    return DefaultHttpxClient(
+        **_pool_options(pool),
+        event_hooks={
+            "request": [lambda request: _on_request(request, _ConnectionTrace(), asynchronous=False)],
+            "response": [lambda response: _on_response(pool, response)],
+        },
+    )
+
+
+def _async_http_client(pool: str):
+    from openai import DefaultAsyncHttpxClient
+
+    async def on_request(request):
+        _on_request(request, _ConnectionTrace(), asynchronous=True)
+
+    async def on_response(response):
+        _on_response(pool, response)
+
+    return DefaultAsyncHttpxClient(
+        **_pool_options(pool),
+        event_hooks={"request": [on_request], "response": [on_response]},
+    )
+
+
+def get_openai_client(api_key: str, pool: str = INTERACTIVE):
+    """The shared ``OpenAI`` client for ``pool`` (rebuilt if the API key changes)."""
+    cached = _clients.get(pool)
+    if cached is not None and cached[0] == api_key:
+        return cached[1]
+    from openai import OpenAI
+
+    with _clients_lock:
+        cached = _clients.get(pool)
+        if cached is None or cached[0] != api_key:
+            client = OpenAI(api_key=api_key, http_client=_sync_http_client(pool))
+            _clients[pool] = cached = (api_key, client)
+        return cached[1]
+
+
+def get_async_openai_client(api_key: str, pool: str = INTERACTIVE):
+    """The shared ``AsyncOpenAI`` client for ``pool`` on the running event loop."""
+    try:
+        clients = _async_clients.get()
+    except LookupError:
+        clients = {}
+        _async_clients.set(clients)
+    cached = clients.get(pool)
+    if cached is None or cached[0] != api_key:
+        from openai import AsyncOpenAI
+
+        cached = clients[pool] = (api_key, AsyncOpenAI(api_key=api_key, http_client=_async_http_client(pool)))
+    return cached[1]
+
+
+@contextlib.contextmanager
+def track_connections():
+    """Collect connection reuse for OpenAI requests made in this context; yields the usage dict."""
+    usage = {"new": 0, "reused": 0, "connect_ms": 0.0}
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+
+def start_tracking_connections() -> dict:
+    """``track_connections`` for the rest of the current task (async generators that can't hold a ``with``)."""
+    usage = {"new": 0, "reused": 0, "connect_ms": 0.0}
+    _usage.set(usage)
+    return usage
+
+
+def _mean_connect_ms(pool: str) -> float:
+    snapshot = CONNECT_SECONDS.snapshot(pool=pool)
+    return snapshot["sum"] * 1000 / snapshot["count"] if snapshot["count"] else 0.0
+
+
+def connection_timings() -> dict:
+    """
+    Phase-timing fields for the tracked request, or {} if none is tracked.
+
+    ``openai_connect_saved_ms`` estimates the setup time avoided by reusing
+    connections: reused requests times the interactive pool's mean
+    new-connection setup time.
+    """
+    usage = _usage.get()
+    if usage is None or not (usage["new"] or usage["reused"]):
+        return {}
+    return {
+        "openai_connect_ms": int(usage["connect_ms"]),
+        "openai_connect_saved_ms": int(usage["reused"] * _mean_connect_ms(INTERACTIVE)),
+        "openai_connections_reused": usage["reused"],
+        "openai_connections_new": usage["new"],
+    }
+
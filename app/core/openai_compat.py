@@ -51,23 +51,16 @@ def uses_max_completion_tokens(model: str | None) -> bool:
     return False
 
 
-def create_chat_completion(
-    client: Any,
-    *,
+def _chat_completion_payload(
     model: str,
     messages: list[dict[str, str]],
-    max_tokens: int | None = None,
-    temperature: float | None = None,
-    presence_penalty: float | None = None,
-    frequency_penalty: float | None = None,
-    stream: bool = False,
-    **extra: Any,
-) -> Any:
-    """Create a Chat Completions response with model-compatible parameters.
-
-    Newer models (GPT-5/o-series, GPT-4o, GPT-4.1+) use ``max_completion_tokens``
-    and may reject older sampling controls. Older models keep legacy parameters.
-    """
+    max_tokens: int | None,
+    temperature: float | None,
+    presence_penalty: float | None,
+    frequency_penalty: float | None,
+    stream: bool,
+    extra: dict[str, Any],
+) -> dict[str, Any]:
     payload: dict[str, Any] = {
         "model": model,
         "messages": messages,
@@ -90,10 +83,12 @@ def create_chat_completion(
             payload["presence_penalty"] = presence_penalty
         if frequency_penalty is not None:
             payload["frequency_penalty"] = frequency_penalty
+    return payload
 
-    try:
-        return client.chat.completions.create(**payload)
-    except TypeError as exc:
+
+def _compat_retry_payload(payload: dict[str, Any], model: str, exc: Exception) -> dict[str, Any] | None:
+    """Payload to retry with after a token-parameter rejection, or None to re-raise ``exc``."""
+    if isinstance(exc, TypeError):
         # Handle SDK compatibility issues with parameter names
         error_msg = str(exc)
         
@@ -108,58 +103,112 @@ def create_chat_completion(
                         "upgrade the OpenAI SDK to support this model family.",
                         model,
                     )
-                    raise
+                    return None
                 legacy_payload = dict(payload)
                 legacy_payload["max_tokens"] = legacy_payload.pop("max_completion_tokens")
-                return client.chat.completions.create(**legacy_payload)
+                return legacy_payload
         
         # If SDK rejects max_tokens, retry with max_completion_tokens
         if "max_tokens" in error_msg and "unexpected keyword" in error_msg.lower():
             if "max_tokens" in payload:
                 legacy_payload = dict(payload)
                 legacy_payload["max_completion_tokens"] = legacy_payload.pop("max_tokens")
-                return client.chat.completions.create(**legacy_payload)
+                return legacy_payload
         
         # Re-raise if it's not a parameter compatibility issue
-        raise
-    except Exception as exc:
-        # Handle API-level parameter errors (BadRequestError from OpenAI)
-        error_msg = str(exc).lower()
-        
-        # Check if it's a max_tokens/max_completion_tokens parameter error
-        is_max_tokens_error = (
-            "max_tokens" in error_msg 
-            and ("max_completion_tokens" in error_msg or "unsupported parameter" in error_msg)
+        return None
+
+    # Handle API-level parameter errors (BadRequestError from OpenAI)
+    error_msg = str(exc).lower()
+    
+    # Check if it's a max_tokens/max_completion_tokens parameter error
+    is_max_tokens_error = (
+        "max_tokens" in error_msg 
+        and ("max_completion_tokens" in error_msg or "unsupported parameter" in error_msg)
+    )
+    is_max_completion_tokens_error = (
+        "max_completion_tokens" in error_msg 
+        and ("max_tokens" in error_msg or "unsupported parameter" in error_msg)
+    )
+    
+    # If API says max_tokens is not supported, use max_completion_tokens
+    if is_max_tokens_error and "max_tokens" in payload:
+        retry_payload = dict(payload)
+        token_value = retry_payload.pop("max_tokens")
+        retry_payload["max_completion_tokens"] = token_value
+        logger.info(
+            "OpenAI API rejected max_tokens for model %s, retrying with max_completion_tokens",
+            model
         )
-        is_max_completion_tokens_error = (
-            "max_completion_tokens" in error_msg 
-            and ("max_tokens" in error_msg or "unsupported parameter" in error_msg)
+        return retry_payload
+    
+    # If API says max_completion_tokens is not supported, use max_tokens
+    if is_max_completion_tokens_error and "max_completion_tokens" in payload:
+        retry_payload = dict(payload)
+        token_value = retry_payload.pop("max_completion_tokens")
+        retry_payload["max_tokens"] = token_value
+        logger.info(
+            "OpenAI API rejected max_completion_tokens for model %s, retrying with max_tokens",
+            model
         )
-        
-        # If API says max_tokens is not supported, use max_completion_tokens
-        if is_max_tokens_error and "max_tokens" in payload:
-            retry_payload = dict(payload)
-            token_value = retry_payload.pop("max_tokens")
-            retry_payload["max_completion_tokens"] = token_value
-            logger.info(
-                "OpenAI API rejected max_tokens for model %s, retrying with max_completion_tokens",
-                model
-            )
-            return client.chat.completions.create(**retry_payload)
-        
-        # If API says max_completion_tokens is not supported, use max_tokens
-        if is_max_completion_tokens_error and "max_completion_tokens" in payload:
-            retry_payload = dict(payload)
-            token_value = retry_payload.pop("max_completion_tokens")
-            retry_payload["max_tokens"] = token_value
-            logger.info(
-                "OpenAI API rejected max_completion_tokens for model %s, retrying with max_tokens",
-                model
-            )
-            return client.chat.completions.create(**retry_payload)
-        
-        # Re-raise if it's not a parameter compatibility issue
-        raise
+        return retry_payload
+    
+    # Re-raise if it's not a parameter compatibility issue
+    return None
+
+
+def create_chat_completion(
+    client: Any,
+    *,
+    model: str,
+    messages: list[dict[str, str]],
+    max_tokens: int | None = None,
+    temperature: float | None = None,
+    presence_penalty: float | None = None,
+    frequency_penalty: float | None = None,
+    stream: bool = False,
+    **extra: Any,
+) -> Any:
+    """Create a Chat Completions response with model-compatible parameters.
+
+    Newer models (GPT-5/o-series, GPT-4o, GPT-4.1+) use ``max_completion_tokens``
+    and may reject older sampling controls. Older models keep legacy parameters.
+    """
+    payload = _chat_completion_payload(
+        model, messages, max_tokens, temperature, presence_penalty, frequency_penalty, stream, extra
+    )
+    try:
+        return client.chat.completions.create(**payload)
+    except Exception as exc:
+        retry_payload = _compat_retry_payload(payload, model, exc)
+        if retry_payload is None:
+            raise
+        return client.chat.completions.create(**retry_payload)
+
+
+async def acreate_chat_completion(
+    client: Any,
+    *,
+    model: str,
+    messages: list[dict[str, str]],
+    max_tokens: int | None = None,
+    temperature: float | None = None,
+    presence_penalty: float | None = None,
+    frequency_penalty: float | None = None,
+    stream: bool = False,
+    **extra: Any,
+) -> Any:
+    """``create_chat_completion`` for an ``AsyncOpenAI`` client."""
+    payload = _chat_completion_payload(
+        model, messages, max_tokens, temperature, presence_penalty, frequency_penalty, stream, extra
+    )
+    try:
+        return await client.chat.completions.create(**payload)
+    except Exception as exc:
+        retry_payload = _compat_retry_payload(payload, model, exc)
+        if retry_payload is None:
+            raise
+        return await client.chat.completions.create(**retry_payload)
 
 
 def openai_semantic_score(text: str, context: dict = None) -> float:
@@ -0,0 +1,125 @@
+"""
+Shared vector math for embeddings.
+
+Cache lookups, retrieval (MMR + the in-process index) and the hashed
+embedding provider all compare or normalise the same 384-dim vectors. This
+module gives them one implementation:
+
+- vectors are float32 and normalised once, on write (``normalize``,
+  ``normalized_matrix``), so similarity is a plain dot product afterwards;
+- ``matvec`` scores one query against many rows in a single call;
+- ``top_k`` returns the best row indices without a full sort.
+
+NumPy is a required dependency (retrieval, the vector index and the shared
+answer store use it directly too); inputs may be lists or arrays, results
+are float32 arrays unless a helper says otherwise.
+"""
+
+import numpy as np
+
+
+def normalize(values):
+    """Return a unit-length float32 copy of ``values``. Zero vectors stay zero."""
+    vector = np.array(values, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    if norm > 0:
+        vector /= norm
+    return vector
+
+
+def normalize_rows(matrix):
+    """Normalise every row of ``matrix`` to unit length in place and return it."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+def empty_matrix(dim: int):
+    """A matrix with zero rows and ``dim`` columns."""
+    return np.empty((0, dim), dtype=np.float32)
+
+
+def zeros(rows: int, dim: int):
+    """Preallocated all-zero float32 matrix."""
+    return np.zeros((rows, dim), dtype=np.float32)
+
+
+def grow(matrix, rows: int, dim: int):
+    """Return a zero matrix with ``rows`` rows whose leading rows are copied from ``matrix``."""
+    grown = zeros(rows, dim)
+    grown[:len(matrix)] = matrix
+    return grown
+
+
+def normalized_matrix(rows, dim: int | None = None):
+    """Stack ``rows`` into a contiguous float32 matrix with unit-length rows."""
+    matrix = np.ascontiguousarray(np.asarray(rows, dtype=np.float32))
+    if dim is not None:
+        matrix = matrix.reshape(len(rows), dim)
+    return normalize_rows(matrix)
+
+
+def count_matrix(rows_of_indices: list[list[int]], dim: int):
+    """float32 matrix where row ``i`` counts the occurrences of each index in ``rows_of_indices[i]``."""
+    lengths = [len(indices) for indices in rows_of_indices]
+    flat = np.fromiter(
+        (index for indices in rows_of_indices for index in indices), dtype=np.int64, count=sum(lengths)
+    )
+    flat += np.repeat(np.arange(len(rows_of_indices), dtype=np.int64) * dim, lengths)
+    counts = np.bincount(flat, minlength=len(rows_of_indices) * dim)
+    return counts.astype(np.float32).reshape(len(rows_of_indices), dim)
+
+
+def stack(rows, dim: int | None = None):
+    """Stack already-normalised vectors into a matrix (no renormalisation)."""
+    if not len(rows):
+        return empty_matrix(dim or 0)
+    return np.stack(rows).astype(np.float32, copy=False)
+
+
+def dot(a, b) -> float:
+    """Dot product of two vectors (cosine similarity when both are normalised)."""
+    return float(np.dot(a, b))
+
+
+def cosine_similarity(a, b) -> float:
+    """Cosine similarity of two raw (not necessarily normalised) vectors."""
+    return dot(normalize(a), normalize(b))
+
+
+def matvec(matrix, vector):
+    """Dot every row of ``matrix`` with ``vector``; returns one score per row."""
+    if not len(matrix):
+        return np.empty(0, dtype=np.float32)
+    return np.asarray(matrix, dtype=np.float32) @ np.asarray(vector, dtype=np.float32)
+
+
+def argmax(scores) -> int:
+    """Index of the highest score (the first one on ties)."""
+    return int(np.argmax(scores))
+
+
+def top_k(scores, k: int) -> list[int]:
+    """Indices of the ``k`` highest scores, best first (ties keep row order)."""
+    scores = np.asarray(scores)
+    count = len(scores)
+    k = min(k, count)
+    if k <= 0:
+        return []
+    if k < count:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(count)
+    # Sort the partition by (score desc, index asc) so ties are stable
+    top = top[np.lexsort((top, -scores[top]))]
+    return top.tolist()
+
+
+def rows_to_lists(matrix) -> list[list[float]]:
+    """Plain nested lists of Python floats, one per matrix row."""
+    return np.asarray(matrix).tolist()
+
+
+def to_list(vector) -> list[float]:
+    """Plain list of Python floats (for JSON, pgvector parameters, etc.)."""
+    return np.asarray(vector).tolist()
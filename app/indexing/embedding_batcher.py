@@ -0,0 +1,127 @@
+"""
+Micro-batching for query embeddings.
+
+Right after a QOTD push lands, dozens of /ask requests arrive together and
+each used to send its own single-text ``embeddings.create`` call. The
+``EmbeddingBatcher`` coalesces concurrent calls instead: the first caller in
+a window becomes the leader, waits up to ``max_wait_ms`` (or until the batch
+reaches ``max_batch_size`` texts), sends everything collected as one request
+and fans the vectors back to the waiting callers.
+
+The /ask and /ask/stream handlers are async, but they run each blocking step
+of the answer pipeline (embedding included) on a thread via ``run_sync`` and
+its capacity limiter (``app.core.concurrency``). Callers therefore arrive on
+those limiter threads, so the batcher is thread-based rather than
+asyncio-based and needs no background worker: the leader thread does the call
+while its followers block on the batch for at most the leader's round trip.
+"""
+
+import logging
+import threading
+import time
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class _Batch:
+    __slots__ = ("texts", "callers", "full", "done", "results", "error")
+
+    def __init__(self):
+        self.texts: list[str] = []
+        self.callers = 0
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results: list[list[float]] | None = None
+        self.error: BaseException | None = None
+
+
+class EmbeddingBatcher:
+    """Coalesce concurrent embed calls into batched provider requests."""
+
+    def __init__(self, embed_fn, max_wait_ms: float = 5, max_batch_size: int = 64):
+        self._embed_fn = embed_fn
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000
+        self.max_batch_size = max(1, max_batch_size)
+        self._lock = threading.Lock()
+        self._open: _Batch | None = None
+        self.requests = 0
+        self.batches = 0
+        self.texts = 0
+        self.largest_batch = 0
+
+    def embed(self, texts: list[str]) -> list[list[float]]:
+        with self._lock:
+            batch = self._open
+            leader = batch is None
+            if leader:
+                batch = self._open = _Batch()
+            offset = len(batch.texts)
+            batch.texts.extend(texts)
+            batch.callers += 1
+            self.requests += 1
+            if len(batch.texts) >= self.max_batch_size:
+                self._open = None
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.max_wait_seconds)
+            with self._lock:
+                if self._open is batch:
+                    self._open = None
+            self._run(batch)
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        return batch.results[offset:offset + len(texts)]
+
+    def _run(self, batch: _Batch) -> None:
+        started = time.perf_counter()
+        try:
+            batch.results = self._embed_fn(batch.texts)
+        except BaseException as exc:  # re-raised in every caller
+            batch.error = exc
+        finally:
+            batch.done.set()
+        with self._lock:
+            self.batches += 1
+            self.texts += len(batch.texts)
+            self.largest_batch = max(self.largest_batch, len(batch.texts))
+        if batch.callers > 1:
+            logger.info(
+                "Embedding batch: %d texts from %d callers in %d ms",
+                len(batch.texts), batch.callers, int((time.perf_counter() - started) * 1000),
+            )
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "api_calls": self.batches,
+                "texts": self.texts,
+                "calls_saved": self.requests - self.batches,
+                "largest_batch": self.largest_batch,
+                "max_wait_ms": round(self.max_wait_seconds * 1000, 1),
+                "max_batch_size": self.max_batch_size,
+            }
+
+
+# Global singleton
+_embedding_batcher: EmbeddingBatcher | None = None
+
+
+def get_embedding_batcher() -> EmbeddingBatcher:
+    """Get the process-wide OpenAI query embedding batcher."""
+    global _embedding_batcher
+    if _embedding_batcher is None:
+        from app.indexing.embeddings import _openai_embed
+
+        _embedding_batcher = EmbeddingBatcher(
+            lambda texts: _openai_embed(texts, settings.embedding_dim),
+            max_wait_ms=settings.embedding_batch_window_ms,
+            max_batch_size=settings.embedding_batch_max_size,
+        )
+    return _embedding_batcher
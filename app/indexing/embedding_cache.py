@@ -0,0 +1,176 @@
+"""
+Query embedding cache.
+
+Every /ask embeds the question (and possibly a rewrite); prewarm loops embed
+the same QOTD and topic questions on every deploy. With the OpenAI provider
+each of those is a 100–400 ms network round trip, so embeddings are memoised
+here, keyed by (provider, model, dim, whitespace-normalised text):
+
+- L1: bounded in-memory LRU of float32 ``array('f')`` vectors (~1.5KB each);
+- L2: optional Redis tier (shared across workers and deploys) when
+  ``REDIS_URL`` is set, stored as raw float32 bytes with a TTL.
+
+Ingestion and re-embedding scripts bypass the cache (``use_cache=False``) so
+chunk texts don't evict the query working set.
+"""
+
+import hashlib
+import logging
+import threading
+from array import array
+from collections import OrderedDict
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_embedding_text(text: str) -> str:
+    """Collapse whitespace; embeddings are case-sensitive so case is kept."""
+    return " ".join((text or "").split())
+
+
+class EmbeddingCache:
+    """Thread-safe LRU of query embeddings with an optional Redis tier."""
+
+    def __init__(self, max_entries: int = 4096, redis_url: str | None = None, ttl_seconds: int = 2592000):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple, array] = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = None
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+        if redis_url:
+            self._connect_redis(redis_url)
+
+    # ── Redis helpers ──────────────────────────────────────────────────────
+
+    def _connect_redis(self, redis_url: str) -> None:
+        try:
+            import redis as redis_lib
+            self._redis = redis_lib.from_url(
+                redis_url,
+                decode_responses=False,
+                socket_connect_timeout=3,
+                socket_timeout=3,
+            )
+            self._redis.ping()
+            logger.info("Embedding cache Redis tier connected: %s", redis_url.split("@")[-1])
+        except Exception as exc:
+            logger.warning("Embedding cache Redis unavailable (%s) — in-memory only", exc)
+            self._redis = None
+
+    @staticmethod
+    def _redis_key(key: tuple) -> str:
+        h = hashlib.sha256("\x1f".join(str(part) for part in key).encode()).hexdigest()[:24]
+        return f"amt:emb:{h}"
+
+    def _redis_get_many(self, keys: list[tuple]) -> list[array | None]:
+        if self._redis is None or not keys:
+            return [None] * len(keys)
+        try:
+            raws = self._redis.mget([self._redis_key(key) for key in keys])
+        except Exception as exc:
+            logger.warning("Embedding cache Redis read failed: %s", exc)
+            return [None] * len(keys)
+
+        vectors = []
+        for key, raw in zip(keys, raws):
+            vector = None
+            if raw:
+                vector = array("f")
+                vector.frombytes(raw)
+                if len(vector) != key[2]:
+                    vector = None
+            vectors.append(vector)
+        return vectors
+
+    def _redis_put_many(self, items: list[tuple[tuple, array]]) -> None:
+        if self._redis is None or not items:
+            return
+        try:
+            pipe = self._redis.pipeline(transaction=False)
+            for key, vector in items:
+                pipe.set(self._redis_key(key), vector.tobytes(), ex=self.ttl_seconds)
+            pipe.execute()
+        except Exception as exc:
+            logger.warning("Embedding cache Redis write failed: %s", exc)
+
+    # ── Public API ─────────────────────────────────────────────────────────
+
+    def get_many(self, keys: list[tuple]) -> list[list[float] | None]:
+        """Return a cached embedding (or None) for each key, checking memory then Redis."""
+        found: list[array | None] = [None] * len(keys)
+        missing: list[int] = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._entries.get(key)
+                if vector is None:
+                    missing.append(i)
+                else:
+                    self._entries.move_to_end(key)
+                    found[i] = vector
+            self.hits += len(keys) - len(missing)
+
+        if missing:
+            from_redis = self._redis_get_many([keys[i] for i in missing])
+            with self._lock:
+                for i, vector in zip(missing, from_redis):
+                    if vector is None:
+                        self.misses += 1
+                        continue
+                    self.redis_hits += 1
+                    found[i] = vector
+                    self._store(keys[i], vector)
+
+        return [vector.tolist() if vector is not None else None for vector in found]
+
+    def put_many(self, keys: list[tuple], embeddings: list[list[float]]) -> None:
+        items = [(key, array("f", embedding)) for key, embedding in zip(keys, embeddings)]
+        with self._lock:
+            for key, vector in items:
+                self._store(key, vector)
+        self._redis_put_many(items)
+
+    def _store(self, key: tuple, vector: array) -> None:
+        # Caller holds the lock
+        self._entries[key] = vector
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.redis_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "redis_hits": self.redis_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.redis_hits) / lookups, 3) if lookups else 0.0,
+                "backend": "redis+memory" if self._redis else "memory",
+            }
+
+
+# Global singleton
+_embedding_cache: EmbeddingCache | None = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Get the process-wide embedding cache singleton."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(
+            max_entries=settings.embedding_cache_max_entries,
+            redis_url=settings.redis_url,
+            ttl_seconds=settings.embedding_cache_ttl_seconds,
+        )
+    return _embedding_cache
@@ -1,70 +1,197 @@
 import hashlib
-import math
 import logging
+import threading
+import time
+from app.core import vectors
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+_LOCAL_MODEL_NAME = "all-MiniLM-L6-v2"
+
 # Singleton for caching the embedding model
 _embedding_model = None
+_embedding_model_lock = threading.Lock()
+_local_stats_lock = threading.Lock()
 _openai_client = None
 
+# Load time and encode throughput of the local (sentence_transformers / onnx) model
+_local_model_stats = {
+    "load_ms": None,
+    "batches": 0,
+    "texts": 0,
+    "encode_ms": 0.0,
+    "last_batch_size": None,
+    "last_batch_ms": None,
+}
+
+
+def _load_local_model():
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError as exc:
+        raise RuntimeError(
+            "sentence-transformers not installed. Install optional dependency 'embeddings'."
+        ) from exc
+
+    if settings.embedding_provider != "onnx":
+        return SentenceTransformer(_LOCAL_MODEL_NAME)
+
+    # ONNX Runtime on CPU with int8-quantized weights (needs sentence-transformers[onnx] >= 3.2)
+    import onnxruntime
+
+    session_options = onnxruntime.SessionOptions()
+    session_options.intra_op_num_threads = settings.onnx_embedding_threads
+    session_options.inter_op_num_threads = 1
+    return SentenceTransformer(
+        _LOCAL_MODEL_NAME,
+        backend="onnx",
+        model_kwargs={
+            "file_name": settings.onnx_embedding_file,
+            "provider": "CPUExecutionProvider",
+            "session_options": session_options,
+        },
+    )
+
 
 def _get_embedding_model():
-    """Lazy load and cache the sentence-transformers model."""
+    """Load (once) and cache the local sentence-transformers / ONNX model."""
     global _embedding_model
     if _embedding_model is None:
-        try:
-            from sentence_transformers import SentenceTransformer
-        except ImportError as exc:
-            raise RuntimeError(
-                "sentence-transformers not installed. Install optional dependency 'embeddings'."
-            ) from exc
-        _embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+        # A request arriving during warm-up waits for that load instead of starting a second one
+        with _embedding_model_lock:
+            if _embedding_model is None:
+                started = time.perf_counter()
+                model = _load_local_model()
+                _local_model_stats["load_ms"] = int((time.perf_counter() - started) * 1000)
+                logger.info(
+                    "Local embedding model loaded (%s) in %d ms",
+                    settings.embedding_provider, _local_model_stats["load_ms"],
+                )
+                _embedding_model = model
     return _embedding_model
 
 
+def _local_encode(texts: list[str]) -> list[list[float]]:
+    model = _get_embedding_model()
+    started = time.perf_counter()
+    vecs = model.encode(texts, batch_size=max(1, settings.local_embedding_batch_size))
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with _local_stats_lock:
+        _local_model_stats["batches"] += 1
+        _local_model_stats["texts"] += len(texts)
+        _local_model_stats["encode_ms"] += elapsed_ms
+        _local_model_stats["last_batch_size"] = len(texts)
+        _local_model_stats["last_batch_ms"] = round(elapsed_ms, 2)
+    return [vec.tolist() for vec in vecs]
+
+
+def local_model_stats() -> dict:
+    """Load time and throughput of the local embedding model (None fields until loaded/used)."""
+    with _local_stats_lock:
+        stats = dict(_local_model_stats)
+    stats["provider"] = settings.embedding_provider
+    stats["loaded"] = _embedding_model is not None
+    stats["encode_ms"] = round(stats["encode_ms"], 1)
+    stats["texts_per_second"] = (
+        round(stats["texts"] / (stats["encode_ms"] / 1000), 1) if stats["encode_ms"] else None
+    )
+    return stats
+
+
+def warm_embedding_model() -> None:
+    """Load the local embedding model ahead of the first request (local providers only)."""
+    if settings.embedding_provider not in ("sentence_transformers", "onnx"):
+        return
+    try:
+        _local_encode(["warm up"])
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Local embedding model warm-up failed; will load on first request: %s", exc)
+
+
 def _get_openai_client():
     """Lazy load and cache the OpenAI client."""
     global _openai_client
     if _openai_client is None:
         import os
-        from openai import OpenAI
+        from app.core.openai_clients import get_openai_client
         api_key = os.getenv("OPENAI_API_KEY") or getattr(settings, 'openai_api_key', None)
         if not api_key:
             raise ValueError("OPENAI_API_KEY not set — required for openai embedding provider")
-        _openai_client = OpenAI(api_key=api_key)
+        _openai_client = get_openai_client(api_key)
     return _openai_client
 
 
-def embed_text(text: str) -> list[float]:
-    if settings.embedding_provider == "openai":
-        return _openai_embed([text], settings.embedding_dim)[0]
+def embed_text(text: str, use_cache: bool = True) -> list[float]:
+    return embed_text_batch([text], use_cache=use_cache)[0]
 
-    if settings.embedding_provider == "sentence_transformers":
-        model = _get_embedding_model()
-        vec = model.encode([text])[0]
-        return vec.tolist()
-
-    # Local deterministic fallback: hashed bag-of-words embedding
-    return _hashed_embedding(text, settings.embedding_dim)
 
+def embed_text_batch(texts: list[str], use_cache: bool = True) -> list[list[float]]:
+    """
+    Embed multiple texts at once for better performance.
 
-def embed_text_batch(texts: list[str]) -> list[list[float]]:
-    """Embed multiple texts at once for better performance."""
+    Query texts go through the embedding cache; pass ``use_cache=False`` for
+    bulk chunk embedding (ingestion, re-embedding) so it isn't polluted.
+    """
     if not texts:
         return []
+    if not use_cache:
+        return _embed_uncached(texts)
+    if _uses_embedding_cache():
+        return _embed_cached(texts)
+    return _embed_queries(texts)
 
+
+def _uses_embedding_cache() -> bool:
+    # The local hashed provider is cheaper to recompute than to look up
+    return settings.embedding_cache_enabled and settings.embedding_provider != "local"
+
+
+def _embedding_model_name() -> str:
+    if settings.embedding_provider == "sentence_transformers":
+        return _LOCAL_MODEL_NAME
+    if settings.embedding_provider == "onnx":
+        # Quantized weights give slightly different vectors, so key them separately
+        return f"{_LOCAL_MODEL_NAME}:{settings.onnx_embedding_file}"
+    return settings.embedding_model
+
+
+def _embed_cached(texts: list[str]) -> list[list[float]]:
+    """Serve texts from the embedding cache, embedding only the unique misses in one call."""
+    from app.indexing.embedding_cache import get_embedding_cache, normalize_embedding_text
+
+    cache = get_embedding_cache()
+    normalized = [normalize_embedding_text(text) for text in texts]
+    prefix = (settings.embedding_provider, _embedding_model_name(), settings.embedding_dim)
+    keys = [prefix + (text,) for text in normalized]
+    results = cache.get_many(keys)
+
+    missing = list(dict.fromkeys(text for text, vector in zip(normalized, results) if vector is None))
+    if missing:
+        embedded = dict(zip(missing, _embed_queries(missing)))
+        cache.put_many([prefix + (text,) for text in missing], [embedded[text] for text in missing])
+        results = [vector if vector is not None else embedded[text] for text, vector in zip(normalized, results)]
+    return results
+
+
+def _embed_queries(texts: list[str]) -> list[list[float]]:
+    """Embed query texts, coalescing concurrent OpenAI calls into micro-batches."""
+    if settings.embedding_provider == "openai" and settings.embedding_batch_window_ms > 0:
+        from app.indexing.embedding_batcher import get_embedding_batcher
+
+        return get_embedding_batcher().embed(texts)
+    return _embed_uncached(texts)
+
+
+def _embed_uncached(texts: list[str]) -> list[list[float]]:
     if settings.embedding_provider == "openai":
         return _openai_embed(texts, settings.embedding_dim)
 
-    if settings.embedding_provider == "sentence_transformers":
-        model = _get_embedding_model()
-        vecs = model.encode(texts)
-        return [vec.tolist() for vec in vecs]
+    if settings.embedding_provider in ("sentence_transformers", "onnx"):
+        return _local_encode(texts)
 
-    # Local deterministic fallback
-    return [_hashed_embedding(text, settings.embedding_dim) for text in texts]
+    # Local deterministic fallback: hashed bag-of-words embedding
+    return _hashed_embeddings(texts, settings.embedding_dim)
 
 
 def _openai_embed(texts: list[str], dim: int) -> list[list[float]]:
@@ -103,19 +230,32 @@ def _openai_embed(texts: list[str], dim: int) -> list[list[float]]:
     return all_embeddings
 
 
-def _hashed_embedding(text: str, dim: int) -> list[float]:
-    tokens = [t for t in text.lower().split() if t.isalpha()]
-    if not tokens:
-        return [0.0] * dim
+# token -> bucket, per embedding dim. SHA-256 is kept (rather than a faster
+# non-cryptographic hash) so vectors stay identical to the ones already
+# stored; memoising it means it runs once per distinct token instead of
+# once per occurrence.
+_token_buckets: dict[int, dict[str, int]] = {}
+_MAX_CACHED_TOKENS = 200_000
+
+
+def _token_bucket(token: str, dim: int) -> int:
+    """Bucket for a token: first 32 bits of its SHA-256, mod ``dim``."""
+    return int.from_bytes(hashlib.sha256(token.encode("utf-8")).digest()[:4], "big") % dim
+
+
+def _hashed_embeddings(texts: list[str], dim: int) -> list[list[float]]:
+    """Hashed bag-of-words embeddings for a whole batch, built as one count matrix."""
+    tokens = [[token for token in text.lower().split() if token.isalpha()] for text in texts]
 
-    vec = [0.0] * dim
-    for token in tokens:
-        h = hashlib.sha256(token.encode("utf-8")).hexdigest()
-        idx = int(h[:8], 16) % dim
-        vec[idx] += 1.0
+    table = _token_buckets.setdefault(dim, {})
+    unseen = {token for row in tokens for token in row}.difference(table)
+    if len(table) + len(unseen) > _MAX_CACHED_TOKENS:
+        # Swap in a fresh table so concurrent callers keep a consistent one
+        table = _token_buckets[dim] = {}
+        unseen = {token for row in tokens for token in row}
+    for token in unseen:
+        table[token] = _token_bucket(token, dim)
 
-    # L2 normalize
-    norm = math.sqrt(sum(v * v for v in vec))
-    if norm == 0:
-        return vec
-    return [v / norm for v in vec]
+    buckets = [[table[token] for token in row] for row in tokens]
+    # L2 normalize; texts without alphabetic tokens stay all-zero
+    return vectors.rows_to_lists(vectors.normalize_rows(vectors.count_matrix(buckets, dim)))
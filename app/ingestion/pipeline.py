@@ -64,7 +64,7 @@ def run_ingestion(db: Session):
             enriched_chunks = []
             for chunk in chunks:
                 topic, tone, domain = tag_chunk(chunk["text"])
-                embedding = embed_text(chunk["text"])
+                embedding = embed_text(chunk["text"], use_cache=False)
                 enriched_chunks.append(
                     {
                         "start": chunk["start"],
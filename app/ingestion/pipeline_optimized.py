@@ -189,7 +189,7 @@ def run_ingestion_optimized(db: Session, max_episodes: int | None = None, entrie
                 # 7. BATCH EMBED all chunks at once (MUCH FASTER!)
                 logger.info("  ├─ Embedding %s chunks (batch mode)...", len(tagged_chunks))
                 chunk_texts = [c["text"] for c in tagged_chunks]
-                embeddings = embed_text_batch(chunk_texts)
+                embeddings = embed_text_batch(chunk_texts, use_cache=False)
                 
                 # Combine tags with embeddings
                 enriched_chunks = []
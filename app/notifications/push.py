@@ -19,6 +19,7 @@ from sqlalchemy import text
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.openai_clients import BACKGROUND, get_openai_client
 from app.core.openai_compat import create_chat_completion, openai_semantic_score
 from app.core.quote_selector import QuoteSelector, QuoteCandidate
 from app.core.feedback_logger import log_quote_feedback
@@ -767,7 +768,6 @@ def generate_qotd_batch(db: Session, n: int = 20) -> int:
     Returns the number of questions actually inserted.
     """
     import os
-    from openai import OpenAI
 
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
@@ -819,7 +819,7 @@ Example: {{"question": "How do I stop abandoning myself just to keep the peace?"
 
 Return only the JSON array, no other text."""
 
-    client = OpenAI(api_key=api_key)
+    client = get_openai_client(api_key, pool=BACKGROUND)
     try:
         response = create_chat_completion(
             client,
@@ -1192,7 +1192,6 @@ def generate_motivation_batch(db: Session, n: int = 20) -> int:
     Returns the number of messages actually inserted.
     """
     import os
-    from openai import OpenAI
 
     api_key = os.getenv("OPENAI_API_KEY") or settings.openai_api_key
     if not api_key:
@@ -1231,8 +1230,7 @@ Example: {{"title": "Come Back Inward", "body": "You may not need more pressure
 
 Return only the JSON array, no other text."""
 
-    from openai import OpenAI
-    client = OpenAI(api_key=api_key)
+    client = get_openai_client(api_key, pool=BACKGROUND)
     try:
         response = create_chat_completion(
             client,
@@ -1298,7 +1296,6 @@ def _generate_personalized_motivation(questions: list[str]) -> dict | None:
     Returns None if generation fails (caller should fall back to pool).
     """
     import os
-    from openai import OpenAI
 
     api_key = os.getenv("OPENAI_API_KEY") or settings.openai_api_key
     if not api_key:
@@ -1320,7 +1317,7 @@ Rules:
 Respond with a single JSON object with keys: "title", "body", "question", "emoji" (single emoji for title), "theme" (one word).
 Return only the JSON object, no other text."""
 
-    client = OpenAI(api_key=api_key)
+    client = get_openai_client(api_key, pool=BACKGROUND)
     try:
         response = create_chat_completion(
             client,
@@ -1,4 +1,5 @@
 from datetime import timedelta
+import json
 import re
 import os
 import logging
@@ -346,6 +347,67 @@ def generate_follow_up_questions(question: str, answer: str, chunks: list[dict])
     return _generate_follow_up_questions(question, answer, chunks)
 
 
+class AnswerCall:
+    """
+    The model call of ``compose_answer_steps``.
+
+    Whoever drives the steps sends back ``(answer_text, metadata)`` or
+    throws the model's error in: ``run_answer_steps`` calls
+    ``generate_answer`` on its own thread, while the async /ask pipeline
+    awaits ``generate_answer_async`` so no thread waits on the model.
+    """
+
+    __slots__ = ("question", "chunks")
+
+    def __init__(self, question: str, chunks: list[dict]):
+        self.question = question
+        self.chunks = chunks
+
+
+def generate_answer(question: str, chunks: list[dict]) -> tuple[str, dict]:
+    """
+    Answer text plus any follow-ups/headline the answer call returned.
+
+    With ``answer_structured_generation`` one JSON-schema call returns all
+    three; if it fails, a plain answer call is made and the metadata is empty.
+    """
+    from app.core.config import settings
+
+    if settings.answer_structured_generation:
+        try:
+            return _generate_structured_answer(question, chunks)
+        except Exception as exc:
+            logger.warning("Structured answer generation failed, using separate calls: %s", exc)
+    return _generate_intelligent_answer(question, chunks), {}
+
+
+async def generate_answer_async(question: str, chunks: list[dict]) -> tuple[str, dict]:
+    """``generate_answer`` on ``AsyncOpenAI``."""
+    from app.core.config import settings
+
+    if settings.answer_structured_generation:
+        try:
+            return await _generate_structured_answer_async(question, chunks)
+        except Exception as exc:
+            logger.warning("Structured answer generation failed, using separate calls: %s", exc)
+    return await _generate_intelligent_answer_async(question, chunks), {}
+
+
+def run_answer_steps(steps):
+    """Drive a generator of ``AnswerCall`` steps on this thread and return its result."""
+    value, error = None, None
+    while True:
+        try:
+            call = steps.throw(error) if error is not None else steps.send(value)
+        except StopIteration as finished:
+            return finished.value
+        value, error = None, None
+        try:
+            value = generate_answer(call.question, call.chunks)
+        except Exception as exc:  # noqa: BLE001 - handed back to the step that asked
+            error = exc
+
+
 def compose_answer(
     question: str,
     chunks: list[dict],
@@ -355,12 +417,29 @@ def compose_answer(
     """
     Generate an intelligent answer using OpenAI GPT based on relevant chunks.
     Falls back to basic extraction if OpenAI is not available.
+
+    See ``compose_answer_steps`` for the arguments.
+    """
+    return run_answer_steps(compose_answer_steps(question, chunks, citation_override, include_followups))
+
+
+def compose_answer_steps(
+    question: str,
+    chunks: list[dict],
+    citation_override: list[dict] = None,
+    include_followups: bool = True,
+):
+    """
+    ``compose_answer`` as a generator that yields its model call as an ``AnswerCall``.
     
     Args:
         question: The user's question
         chunks: List of chunk dictionaries for answer generation
         citation_override: Optional list of specific chunks to use for citations
                           (if None, uses all chunks for citations)
+        include_followups: Also generate follow-up questions and a shareable
+                          headline. With ``answer_structured_generation`` they
+                          come from the answer call itself when it returned them.
     """
     from app.core.config import settings
     
@@ -384,11 +463,12 @@ def compose_answer(
     answer_source = "openai"
     answer_status = "generated"
     fallback_reason = None
+    answer_metadata = {}
 
     if settings.answer_generation_provider == "openai":
         try:
             logger.info("Attempting intelligent answer generation with OpenAI...")
-            answer_text = _generate_intelligent_answer(question, ranked[:6])
+            answer_text, answer_metadata = yield AnswerCall(question, ranked[:6])
             logger.info("Successfully generated intelligent answer")
         except Exception as e:
             logger.error(f"OpenAI answer generation failed: {e}", exc_info=True)
@@ -417,13 +497,16 @@ def compose_answer(
     }
     if fallback_reason:
         result["fallback_reason"] = fallback_reason
+    # Structured generation may already have produced these; without
+    # include_followups the caller generates whatever is still missing
+    result["follow_up_questions"] = answer_metadata.get("follow_up_questions", [])
+    result["shareable_headline"] = answer_metadata.get("shareable_headline", "")
     if include_followups:
-        result["follow_up_questions"] = generate_follow_up_questions(question, answer_text, citation_chunks)
-        # Generate shareable headline for reflection cards
-        result["shareable_headline"] = generate_shareable_headline(question, answer_text, citation_chunks)
-    else:
-        result["follow_up_questions"] = []
-        result["shareable_headline"] = ""
+        if not result["follow_up_questions"]:
+            result["follow_up_questions"] = generate_follow_up_questions(question, answer_text, citation_chunks)
+        if not result["shareable_headline"]:
+            # Generate shareable headline for reflection cards
+            result["shareable_headline"] = generate_shareable_headline(question, answer_text, citation_chunks)
 
     return result
 
@@ -441,9 +524,9 @@ def _generate_follow_up_questions(question: str, answer: str, chunks: list[dict]
             if not api_key:
                 raise ValueError("No API key")
 
-            from openai import OpenAI
+            from app.core.openai_clients import get_openai_client
             from app.core.openai_compat import create_chat_completion
-            client = OpenAI(api_key=api_key)
+            client = get_openai_client(api_key)
 
             # Build brief context from episode titles
             episode_titles = list(dict.fromkeys(
@@ -719,6 +802,12 @@ def generate_shareable_headline(question: str, answer: str, chunks: list[dict])
     return _build_inspirational_headline(question, answer)
 
 
+def _fallback_shareable_headline(question: str, answer: str) -> str:
+    """Headline from the answer text alone, without an OpenAI call."""
+    extracted = sanitize_shareable_headline(_extract_best_sentence_headline(answer), answer)
+    return extracted or _build_inspirational_headline(question, answer)
+
+
 def _build_inspirational_headline(question: str, answer: str) -> str:
     """Return a deterministic, complete fallback headline when extraction fails."""
     theme = _infer_follow_up_theme(f"{question} {answer}")
@@ -740,6 +829,26 @@ def _build_inspirational_headline(question: str, answer: str) -> str:
     return fallback
 
 
+_HEADLINE_GUIDELINES = (
+    "- Captures a SPECIFIC insight from the episode wisdom (not generic advice)\n"
+    "- Is grounded in what was actually said (reference concrete ideas)\n"
+    "- Is memorable and deep (not surface-level or vague)\n"
+    "- Is 8-22 words (50-140 characters)\n"
+    "- Is a complete, standalone sentence (not a fragment)\n"
+    "- Does NOT start with: But, And, Or, So, Because, If, When, Where, What, How, Why\n"
+    "- Is NOT a question (no ? at end)\n"
+    "- Sounds natural, not scripted or forced\n"
+    "- Avoids phrases like 'this reflection,' 'the key is,' 'remember to'\n\n"
+    "Good examples:\n"
+    "- \"What you have in this relationship right now is already worth protecting.\"\n"
+    "- \"Grief asks for space, not solutions—permission to feel whatever comes.\"\n\n"
+    "Bad examples:\n"
+    "- \"But where do I feel even the tiniest spark of quiet joy?\" (fragment + question)\n"
+    "- \"Return to the kind of connection you want to build.\" (vague)\n\n"
+    "Make the headline feel directly connected to this specific question and answer, not generic."
+)
+
+
 def _generate_shareable_headline(question: str, answer: str, chunks: list[dict]) -> str:
     """
     Generate a shareable reflection card headline that is:
@@ -757,9 +866,9 @@ def _generate_shareable_headline(question: str, answer: str, chunks: list[dict])
             if not api_key:
                 raise ValueError("No API key")
 
-            from openai import OpenAI
+            from app.core.openai_clients import get_openai_client
             from app.core.openai_compat import create_chat_completion
-            client = OpenAI(api_key=api_key)
+            client = get_openai_client(api_key)
 
             # Build brief context from the strongest citation
             citation_excerpt = ""
@@ -781,22 +890,7 @@ def _generate_shareable_headline(question: str, answer: str, chunks: list[dict])
                                 "content": (
                                     "You create shareable reflection card headlines for Mirror Talk podcast wisdom. "
                                     "Write ONE complete, insightful sentence that:\n"
-                                    "- Captures a SPECIFIC insight from the episode wisdom (not generic advice)\n"
-                                    "- Is grounded in what was actually said (reference concrete ideas)\n"
-                                    "- Is memorable and deep (not surface-level or vague)\n"
-                                    "- Is 8-22 words (50-140 characters)\n"
-                                    "- Is a complete, standalone sentence (not a fragment)\n"
-                                    "- Does NOT start with: But, And, Or, So, Because, If, When, Where, What, How, Why\n"
-                                    "- Is NOT a question (no ? at end)\n"
-                                    "- Sounds natural, not scripted or forced\n"
-                                    "- Avoids phrases like 'this reflection,' 'the key is,' 'remember to'\n\n"
-                                    "Good examples:\n"
-                                    "- \"What you have in this relationship right now is already worth protecting.\"\n"
-                                    "- \"Grief asks for space, not solutions—permission to feel whatever comes.\"\n\n"
-                                    "Bad examples:\n"
-                                    "- \"But where do I feel even the tiniest spark of quiet joy?\" (fragment + question)\n"
-                                    "- \"Return to the kind of connection you want to build.\" (vague)\n\n"
-                                    "Make the headline feel directly connected to this specific question and answer, not generic.\n\n"
+                                    f"{_HEADLINE_GUIDELINES}\n\n"
                                     "Return ONLY the headline text, nothing else."
                                 ),
                             },
@@ -935,108 +1029,286 @@ def _extract_best_sentence_headline(answer: str) -> str:
     return ""
 
 
-def _generate_intelligent_answer(question: str, chunks: list[dict]) -> str:
+def _answer_request(question: str, chunks: list[dict], structured: bool = False):
     """
-    Use OpenAI GPT to generate a well-structured, intelligent answer.
+    Yield (model, kwargs) for each candidate model of a non-streamed answer.
+
+    Settings are tuned for natural, human responses. If the configured
+    premium model is unavailable in an environment, callers retry with the
+    next stable quality model instead of exposing transcript fragments.
     """
-    from openai import OpenAI
-    from app.core.openai_compat import create_chat_completion
     from app.core.config import settings
-    
-    api_key = os.getenv("OPENAI_API_KEY") or settings.openai_api_key
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY not set")
-    
-    client = OpenAI(api_key=api_key)
-    
-    # Build context from chunks
-    context_parts = []
-    for idx, chunk in enumerate(chunks, 1):
-        episode_title = chunk["episode"]["title"]
-        text = chunk["text"].strip()
-        context_parts.append(f"[Source {idx} - {episode_title}]\n{text}")
-    
-    context = "\n\n".join(context_parts)
-    
-    # Create a structured prompt for GPT - More human, intelligent, and soulful
-    system_prompt = _SYSTEM_PROMPT
-
-    user_prompt = _build_user_prompt(question, context)
 
-    # Call OpenAI API with settings optimized for natural, human responses.
-    # If the configured premium model is unavailable in an environment, retry
-    # with stable quality models instead of exposing transcript fragments.
-    response = None
-    last_error: Exception | None = None
+    system_prompt = _SYSTEM_PROMPT + (_answer_metadata_instructions(stream=False) if structured else "")
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": _build_user_prompt(question, _source_context(chunks))},
+    ]
+    max_tokens = settings.answer_max_tokens + (_ANSWER_METADATA_MAX_TOKENS if structured else 0)
     for model in _answer_model_candidates(settings.answer_generation_model):
-        try:
-            response = create_chat_completion(
-                client,
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=settings.answer_temperature,
-                max_tokens=settings.answer_max_tokens,
-                presence_penalty=0.4,   # Reduce repetition
-                frequency_penalty=0.3,  # Encourage varied vocabulary
-            )
-            if model != settings.answer_generation_model:
-                logger.warning("Answer generation used fallback model %s after primary model issue", model)
-            break
-        except Exception as exc:
-            last_error = exc
-            logger.warning("Answer generation model %s failed: %s", model, exc)
+        request = {
+            "model": model,
+            "messages": messages,
+            "temperature": settings.answer_temperature,
+            "max_tokens": max_tokens,
+            "presence_penalty": 0.4,   # Reduce repetition
+            "frequency_penalty": 0.3,  # Encourage varied vocabulary
+        }
+        if structured:
+            request["response_format"] = _STRUCTURED_ANSWER_FORMAT
+        yield model, request
 
-    if response is None:
-        raise last_error or RuntimeError("Answer generation failed for all configured models")
-    
+
+def _intelligent_answer_text(response) -> str:
     message = response.choices[0].message
-    
+
     # Check for refusal (GPT-5 models may refuse)
     if hasattr(message, 'refusal') and message.refusal:
         raise RuntimeError(f"Answer generation refused by model: {message.refusal}")
-    
+
     # Check if content is None or empty
     answer = message.content
     if not answer:
         raise RuntimeError("Answer generation returned empty content")
-    
+
     answer = answer.strip()
     logger.info("Generated intelligent answer (length: %d chars)", len(answer))
-    
     return answer
 
 
-def generate_intelligent_answer_stream(question: str, chunks: list[dict], context: list[dict] | None = None):
+def _generate_intelligent_answer(question: str, chunks: list[dict]) -> str:
     """
-    Stream an intelligent answer using OpenAI GPT with server-sent events.
-    Yields chunks of text as they arrive from the API.
+    Use OpenAI GPT to generate a well-structured, intelligent answer.
     """
-    from openai import OpenAI
+    from app.core.openai_clients import get_openai_client
     from app.core.openai_compat import create_chat_completion
     from app.core.config import settings
 
-    api_key = os.getenv("OPENAI_API_KEY") or settings.openai_api_key
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY not set")
+    client = get_openai_client(_openai_api_key())
 
-    client = OpenAI(api_key=api_key)
+    response = None
+    last_error: Exception | None = None
+    for model, request in _answer_request(question, chunks):
+        try:
+            response = create_chat_completion(client, **request)
+            if model != settings.answer_generation_model:
+                logger.warning("Answer generation used fallback model %s after primary model issue", model)
+            break
+        except Exception as exc:
+            last_error = exc
+            logger.warning("Answer generation model %s failed: %s", model, exc)
 
-    # Build RAG context from chunks
+    if response is None:
+        raise last_error or RuntimeError("Answer generation failed for all configured models")
+    return _intelligent_answer_text(response)
+
+
+async def _generate_intelligent_answer_async(question: str, chunks: list[dict]) -> str:
+    """``_generate_intelligent_answer`` on ``AsyncOpenAI``."""
+    from app.core.openai_clients import get_async_openai_client
+    from app.core.openai_compat import acreate_chat_completion
+    from app.core.config import settings
+
+    client = get_async_openai_client(_openai_api_key())
+
+    response = None
+    last_error: Exception | None = None
+    for model, request in _answer_request(question, chunks):
+        try:
+            response = await acreate_chat_completion(client, **request)
+            if model != settings.answer_generation_model:
+                logger.warning("Answer generation used fallback model %s after primary model issue", model)
+            break
+        except Exception as exc:
+            last_error = exc
+            logger.warning("Answer generation model %s failed: %s", model, exc)
+
+    if response is None:
+        raise last_error or RuntimeError("Answer generation failed for all configured models")
+    return _intelligent_answer_text(response)
+
+
+def _source_context(chunks: list[dict]) -> str:
+    """Numbered episode excerpts for the answer prompt."""
     context_parts = []
     for idx, chunk in enumerate(chunks, 1):
         episode_title = chunk["episode"]["title"]
         text = chunk["text"].strip()
         context_parts.append(f"[Source {idx} - {episode_title}]\n{text}")
+    return "\n\n".join(context_parts)
+
+
+# ── Structured generation: answer, follow-ups and headline from one call ──
+
+# Line the streamed answer ends with before its JSON metadata trailer
+_ANSWER_METADATA_MARKER = "<<<CARD>>>"
+# Room for three follow-ups and a headline on top of answer_max_tokens
+_ANSWER_METADATA_MAX_TOKENS = 250
+
+_STRUCTURED_ANSWER_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "mirror_talk_answer",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "answer": {"type": "string"},
+                "follow_up_questions": {"type": "array", "items": {"type": "string"}},
+                "shareable_headline": {"type": "string"},
+            },
+            "required": ["answer", "follow_up_questions", "shareable_headline"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+
+def _answer_metadata_instructions(stream: bool) -> str:
+    """System prompt addition asking for follow-ups and a headline alongside the answer."""
+    fields = (
+        '- "follow_up_questions": exactly 3 short, natural follow-up questions a listener might ask '
+        "after hearing this answer. Questions should be curious, personal-growth oriented, and conversational.\n"
+        '- "shareable_headline": a reflection card headline, ONE complete, insightful sentence that:\n'
+        f"{_HEADLINE_GUIDELINES}"
+    )
+    if stream:
+        return (
+            "\n\n**After the answer:**\n"
+            f"When the answer is complete, write a new line containing only {_ANSWER_METADATA_MARKER}, "
+            "then one line of JSON with these keys:\n"
+            f"{fields}\n"
+            "Write nothing after the JSON."
+        )
+    return (
+        "\n\n**Output format:**\n"
+        "Return a JSON object with these keys:\n"
+        '- "answer": the complete answer, written exactly as described above\n'
+        f"{fields}"
+    )
+
+
+def _parse_answer_metadata(raw: str) -> dict | None:
+    """The JSON object a structured answer returned, or None if it is not one."""
+    cleaned = (raw or "").strip()
+    # Strip markdown code fences if present (```json ... ```)
+    if cleaned.startswith("```"):
+        cleaned = cleaned.split("\n", 1)[-1]
+        if cleaned.endswith("```"):
+            cleaned = cleaned[:-3]
+        cleaned = cleaned.strip()
+    try:
+        data = json.loads(cleaned)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
 
-    rag_context = "\n\n".join(context_parts)
 
-    user_prompt = _build_user_prompt(question, rag_context)
+def structured_answer_metadata(answer: str, raw: dict | None) -> dict:
+    """
+    Follow-up questions and shareable headline from a structured answer.
+
+    They go through the same polishing and sanitizing as the separate calls'
+    output. Pieces that are missing or unusable are left out, so callers
+    know which ones still need ``generate_follow_up_questions`` or
+    ``generate_shareable_headline``.
+    """
+    metadata = {}
+    if not raw:
+        return metadata
+    questions = raw.get("follow_up_questions")
+    if isinstance(questions, list):
+        polished = [p for q in questions if (p := _polish_follow_up_question(str(q)))]
+        if polished:
+            metadata["follow_up_questions"] = polished[:3]
+    headline = raw.get("shareable_headline")
+    if isinstance(headline, str):
+        sanitized = sanitize_shareable_headline(headline, answer)
+        if sanitized:
+            metadata["shareable_headline"] = sanitized
+    return metadata
+
+
+def _structured_answer_data(response) -> tuple[str, dict]:
+    """Answer text and parsed JSON of a structured answer response; raises if it has no answer."""
+    message = response.choices[0].message
+    if getattr(message, "refusal", None):
+        raise RuntimeError(f"Structured answer refused by model: {message.refusal}")
+    data = _parse_answer_metadata(message.content)
+    answer = data.get("answer") if data else None
+    if not isinstance(answer, str) or not answer.strip():
+        raise RuntimeError("Structured answer returned no answer text")
+    answer = answer.strip()
+    logger.info("Generated structured answer (length: %d chars)", len(answer))
+    return answer, structured_answer_metadata(answer, data)
+
+
+def _generate_structured_answer(question: str, chunks: list[dict]) -> tuple[str, dict]:
+    """
+    Answer, follow-up questions and headline from one JSON-schema OpenAI call.
+
+    Returns the answer text and ``structured_answer_metadata`` for it.
+    Raises if no model produced a usable answer, so the caller can fall
+    back to ``_generate_intelligent_answer``.
+    """
+    from app.core.openai_clients import get_openai_client
+    from app.core.openai_compat import create_chat_completion
+    from app.core.config import settings
+
+    client = get_openai_client(_openai_api_key())
+
+    last_error: Exception | None = None
+    for model, request in _answer_request(question, chunks, structured=True):
+        try:
+            result = _structured_answer_data(create_chat_completion(client, **request))
+        except Exception as exc:
+            last_error = exc
+            logger.warning("Structured answer generation model %s failed: %s", model, exc)
+            continue
+        if model != settings.answer_generation_model:
+            logger.warning("Structured answer generation used fallback model %s after primary model issue", model)
+        return result
+
+    raise last_error or RuntimeError("Structured answer generation failed for all configured models")
+
+
+async def _generate_structured_answer_async(question: str, chunks: list[dict]) -> tuple[str, dict]:
+    """``_generate_structured_answer`` on ``AsyncOpenAI``."""
+    from app.core.openai_clients import get_async_openai_client
+    from app.core.openai_compat import acreate_chat_completion
+    from app.core.config import settings
+
+    client = get_async_openai_client(_openai_api_key())
+
+    last_error: Exception | None = None
+    for model, request in _answer_request(question, chunks, structured=True):
+        try:
+            result = _structured_answer_data(await acreate_chat_completion(client, **request))
+        except Exception as exc:
+            last_error = exc
+            logger.warning("Structured answer generation model %s failed: %s", model, exc)
+            continue
+        if model != settings.answer_generation_model:
+            logger.warning("Structured answer generation used fallback model %s after primary model issue", model)
+        return result
+
+    raise last_error or RuntimeError("Structured answer generation failed for all configured models")
+
+
+def _stream_messages(
+    question: str, chunks: list[dict], context: list[dict] | None, structured: bool = False
+) -> list[dict]:
+    """
+    System prompt, optional prior conversation turns and the RAG prompt for a streamed answer.
+
+    With ``structured`` the model is also asked to write the follow-up
+    questions and headline as a JSON trailer after the answer.
+    """
+    user_prompt = _build_user_prompt(question, _source_context(chunks))
 
     # Build messages: system + optional prior conversation turns + current question
-    messages = [{"role": "system", "content": _SYSTEM_PROMPT}]
+    system_prompt = _SYSTEM_PROMPT + (_answer_metadata_instructions(stream=True) if structured else "")
+    messages = [{"role": "system", "content": system_prompt}]
     if context:
         # Limit prior turns to last 6 (3 user + 3 assistant) to stay within token budget
         for turn in context[-6:]:
@@ -1045,21 +1317,190 @@ def generate_intelligent_answer_stream(question: str, chunks: list[dict], contex
             if role in ("user", "assistant") and content:
                 messages.append({"role": role, "content": str(content)[:600]})
     messages.append({"role": "user", "content": user_prompt})
+    return messages
+
+
+def _stream_request(messages: list[dict], structured: bool = False):
+    """Yield (model, kwargs) for each candidate model of a streamed answer."""
+    from app.core.config import settings
+
+    max_tokens = settings.answer_max_tokens + (_ANSWER_METADATA_MAX_TOKENS if structured else 0)
+    for model in _answer_model_candidates(settings.answer_generation_model):
+        yield model, {
+            "model": model,
+            "messages": messages,
+            "temperature": settings.answer_temperature,
+            "max_tokens": max_tokens,
+            "presence_penalty": 0.4,
+            "frequency_penalty": 0.3,
+            "stream": True,
+        }
+
+
+class _PhraseBuffer:
+    """
+    Buffer tokens into small phrases (3-6 words) for smoother perceived streaming.
+
+    Single-token SSE events feel jittery; short phrases feel more natural and
+    reduce network overhead by ~5x.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.word_count = 0
+
+    def add(self, content: str) -> str | None:
+        self.buffer += content
+        self.word_count += content.count(" ")
+
+        # Flush on: ≥4 words, sentence boundary, or paragraph break
+        if self.word_count >= 4 or self.buffer.rstrip().endswith((".", "!", "?", ":", "\n")):
+            return self.flush()
+        return None
+
+    def flush(self) -> str:
+        phrase = self.buffer
+        self.buffer = ""
+        self.word_count = 0
+        return phrase
+
+
+class _StreamedAnswer:
+    """
+    Turns streamed model deltas into answer phrases.
+
+    With a ``metadata`` dict (structured mode) the text from
+    ``_ANSWER_METADATA_MARKER`` on is kept out of the answer and parsed into
+    ``metadata`` when the stream ends. Trailing whitespace and anything that
+    could be the start of a marker split across deltas is held back until
+    the next delta shows it is answer text.
+    """
+
+    def __init__(self, metadata: dict | None = None):
+        self.metadata = metadata
+        self.phrases = _PhraseBuffer()
+        self.pending = ""
+        self.trailer = None
+
+    def add(self, content: str) -> str | None:
+        if self.metadata is None:
+            return self.phrases.add(content)
+        if self.trailer is not None:
+            self.trailer += content
+            return None
+        self.pending += content
+        marker_at = self.pending.find(_ANSWER_METADATA_MARKER)
+        if marker_at >= 0:
+            self.trailer = self.pending[marker_at + len(_ANSWER_METADATA_MARKER):]
+            text, self.pending = self.pending[:marker_at].rstrip(), ""
+        else:
+            held = 0
+            for size in range(min(len(_ANSWER_METADATA_MARKER) - 1, len(self.pending)), 0, -1):
+                if self.pending.endswith(_ANSWER_METADATA_MARKER[:size]):
+                    held = size
+                    break
+            keep = len(self.pending[:len(self.pending) - held].rstrip())
+            text, self.pending = self.pending[:keep], self.pending[keep:]
+        return self.phrases.add(text) if text else None
+
+    def finish(self) -> str | None:
+        """The last phrase, if any; fills ``metadata`` from the trailer."""
+        if self.metadata is not None:
+            if self.trailer is None:
+                self.phrases.add(self.pending.rstrip())
+                logger.warning("Streamed answer ended without its metadata trailer")
+            else:
+                parsed = _parse_answer_metadata(self.trailer)
+                if parsed is None:
+                    logger.warning("Streamed answer metadata trailer is not a JSON object: %s", self.trailer[:200])
+                else:
+                    self.metadata.update(parsed)
+            self.pending = ""
+        return self.phrases.flush() if self.phrases.buffer else None
+
+
+def _openai_api_key() -> str:
+    from app.core.config import settings
+
+    api_key = os.getenv("OPENAI_API_KEY") or settings.openai_api_key
+    if not api_key:
+        raise ValueError("OPENAI_API_KEY not set")
+    return api_key
+
+
+def generate_intelligent_answer_stream(
+    question: str, chunks: list[dict], context: list[dict] | None = None, metadata: dict | None = None
+):
+    """
+    Stream an intelligent answer using OpenAI GPT with server-sent events.
+    Yields chunks of text as they arrive from the API.
+
+    Passing a ``metadata`` dict asks the model for follow-up questions and a
+    headline after the answer; they are parsed into it (raw, see
+    ``structured_answer_metadata``) and never yielded as answer text.
+    """
+    from app.core.openai_clients import get_openai_client
+    from app.core.openai_compat import create_chat_completion
+    from app.core.config import settings
+
+    client = get_openai_client(_openai_api_key())
+    structured = metadata is not None
+    messages = _stream_messages(question, chunks, context, structured=structured)
 
     stream = None
     last_error: Exception | None = None
-    for model in _answer_model_candidates(settings.answer_generation_model):
+    for model, request in _stream_request(messages, structured=structured):
+        try:
+            stream = create_chat_completion(client, **request)
+            if model != settings.answer_generation_model:
+                logger.warning("Streaming answer generation used fallback model %s after primary model issue", model)
+            break
+        except Exception as exc:
+            last_error = exc
+            logger.warning("Streaming answer generation model %s failed: %s", model, exc)
+
+    if stream is None:
+        raise last_error or RuntimeError("Streaming answer generation failed for all configured models")
+
+    answer = _StreamedAnswer(metadata)
+    # Closing the stream hands its connection back to the shared pool, also
+    # when the client disconnects mid-answer
+    with stream:
+        for chunk in stream:
+            delta = chunk.choices[0].delta
+            if delta.content:
+                phrase = answer.add(delta.content)
+                if phrase:
+                    yield phrase
+
+    # Flush any remaining content
+    phrase = answer.finish()
+    if phrase:
+        yield phrase
+
+
+async def generate_intelligent_answer_stream_async(
+    question: str, chunks: list[dict], context: list[dict] | None = None, metadata: dict | None = None
+):
+    """
+    ``generate_intelligent_answer_stream`` on ``AsyncOpenAI``.
+
+    Waiting on the model does not hold a thread, so a worker can keep many
+    answers streaming at once.
+    """
+    from app.core.openai_clients import get_async_openai_client
+    from app.core.openai_compat import acreate_chat_completion
+    from app.core.config import settings
+
+    client = get_async_openai_client(_openai_api_key())
+    structured = metadata is not None
+    messages = _stream_messages(question, chunks, context, structured=structured)
+
+    stream = None
+    last_error: Exception | None = None
+    for model, request in _stream_request(messages, structured=structured):
         try:
-            stream = create_chat_completion(
-                client,
-                model=model,
-                messages=messages,
-                temperature=settings.answer_temperature,
-                max_tokens=settings.answer_max_tokens,
-                presence_penalty=0.4,
-                frequency_penalty=0.3,
-                stream=True,
-            )
+            stream = await acreate_chat_completion(client, **request)
             if model != settings.answer_generation_model:
                 logger.warning("Streaming answer generation used fallback model %s after primary model issue", model)
             break
@@ -1070,26 +1511,19 @@ def generate_intelligent_answer_stream(question: str, chunks: list[dict], contex
     if stream is None:
         raise last_error or RuntimeError("Streaming answer generation failed for all configured models")
 
-    # Buffer tokens into small phrases (3-6 words) for smoother perceived streaming.
-    # Single-token SSE events feel jittery; short phrases feel more natural and
-    # reduce network overhead by ~5x.
-    buffer = ""
-    word_count = 0
-    for chunk in stream:
-        delta = chunk.choices[0].delta
-        if delta.content:
-            buffer += delta.content
-            word_count += delta.content.count(" ")
-
-            # Flush on: ≥4 words, sentence boundary, or paragraph break
-            if word_count >= 4 or buffer.rstrip().endswith((".", "!", "?", ":", "\n")):
-                yield buffer
-                buffer = ""
-                word_count = 0
+    answer = _StreamedAnswer(metadata)
+    async with stream:
+        async for chunk in stream:
+            delta = chunk.choices[0].delta
+            if delta.content:
+                phrase = answer.add(delta.content)
+                if phrase:
+                    yield phrase
 
     # Flush any remaining content
-    if buffer:
-        yield buffer
+    phrase = answer.finish()
+    if phrase:
+        yield phrase
 
 
 def _generate_basic_answer(question: str, chunks: list[dict]) -> str:
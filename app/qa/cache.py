@@ -8,19 +8,70 @@ is found above the similarity threshold.
 Primary store: in-memory with a TTL (fast lookups, O(n) similarity scan).
 Persistence layer: optional Redis (set REDIS_URL env var) — survives
 restarts/deploys so the pre-warm dataset is not lost on every deploy.
+Entries are read back from Redis in MGET pages, optionally on a background
+thread so startup isn't blocked while they stream in.
 """
 
 import time
+import heapq
+import itertools
 import threading
 import logging
-import math
 import json
+import struct
+import zlib
+from collections import deque
 from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, field
 
+from app.core import metrics, vectors
+from app.core.rwlock import ReadWriteLock
+from app.qa.eviction import make_eviction_policy, regeneration_cost
+from app.qa.preprocessing import canonical_question_key
+
 logger = logging.getLogger(__name__)
 INTERNAL_USER_IP = "cache-prewarm"
 
+# Similarity buckets are dense around cache_similarity_threshold (0.89 by
+# default) so near misses show how far a threshold change would move hits.
+SIMILARITY_BUCKETS = (0.5, 0.6, 0.7, 0.75, 0.8, 0.83, 0.85, 0.86, 0.87, 0.88, 0.89,
+                      0.9, 0.91, 0.92, 0.93, 0.95, 0.97, 0.99)
+
+CACHE_LOOKUPS = metrics.counter(
+    "answer_cache_lookups_total",
+    "Answer cache lookups by method (exact, canonical, similarity) and outcome (hit, shared_hit, miss)",
+    ("method", "outcome"),
+)
+CACHE_LOOKUP_SECONDS = metrics.histogram(
+    "answer_cache_lookup_seconds", "Answer cache lookup time by method", ("method",)
+)
+CACHE_SIMILARITY = metrics.histogram(
+    "answer_cache_best_similarity",
+    "Best cosine similarity seen by similarity lookups, by outcome",
+    ("outcome",),
+    buckets=SIMILARITY_BUCKETS,
+)
+CACHE_LATENCY_SAVED = metrics.counter(
+    "answer_cache_latency_saved_seconds_total",
+    "Generation time avoided by cache hits (the hit entry's regeneration cost minus lookup time)",
+)
+CACHE_PUT_SKIPPED = metrics.counter(
+    "answer_cache_put_skipped_total", "Answers not cached, by reason", ("reason",)
+)
+CACHE_REMOVALS = metrics.counter(
+    "answer_cache_removals_total", "Entries dropped from the in-memory cache, by reason (evicted, expired)", ("reason",)
+)
+CACHE_STALE_SERVED = metrics.counter(
+    "answer_cache_stale_served_total", "Past-TTL answers served while a background refresh runs"
+)
+CACHE_REDIS_ERRORS = metrics.counter(
+    "answer_cache_redis_errors_total", "Failed Redis operations by the answer cache", ("operation",)
+)
+CACHE_ENTRIES = metrics.gauge("answer_cache_entries", "Entries in this worker's in-memory answer cache")
+CACHE_SIMILARITY_THRESHOLD = metrics.gauge(
+    "answer_cache_similarity_threshold", "Configured minimum cosine similarity for a hit"
+)
+
 
 def normalize_question(q: str) -> str:
     """
@@ -40,6 +91,62 @@ def normalize_question(q: str) -> str:
 DEFAULT_SIMILARITY_THRESHOLD = 0.88  # Lowered to 0.88 to catch more question variations (was 0.92)
 DEFAULT_TTL_SECONDS = 14400  # 4 hours (answers don't change often)
 DEFAULT_MAX_ENTRIES = 500
+PENDING_HITS_FLUSH = 4096  # fold queued hit counts in once this many pile up
+REDIS_LOAD_PAGE_SIZE = 200  # keys per MGET when hydrating from Redis
+SHARED_REHYDRATE_SECONDS = 3600  # a shared tier loaded from Redis more recently is reused as-is
+
+# Binary Redis entry format (v1):
+#   magic "AMTC" | version u8 | dtype u8 | created_at f64 | hit_count u32
+#   | dim u32 | question_len u32 | question utf-8 | embedding (little-endian
+#   float32/float16) | zlib(JSON response)
+# Entries written before v1 are plain JSON and are still read.
+ENTRY_MAGIC = b"AMTC"
+ENTRY_FORMAT_VERSION = 1
+_ENTRY_HEADER = struct.Struct("<4sBBdIII")
+_EMBEDDING_DTYPES = {"float32": (0, "f"), "float16": (1, "e")}
+_EMBEDDING_CODES = {tag: code for tag, code in _EMBEDDING_DTYPES.values()}
+
+
+def encode_entry(entry: "CacheEntry", dtype: str = "float32") -> bytes:
+    """Serialise a CacheEntry to the compact binary format (no pickle for safety)."""
+    tag, code = _EMBEDDING_DTYPES[dtype]
+    question = entry.question.encode("utf-8")
+    dim = len(entry.embedding)
+    header = _ENTRY_HEADER.pack(
+        ENTRY_MAGIC, ENTRY_FORMAT_VERSION, tag, entry.created_at, entry.hit_count, dim, len(question)
+    )
+    embedding = struct.pack(f"<{dim}{code}", *entry.embedding)
+    response = zlib.compress(json.dumps(entry.response, separators=(",", ":")).encode(), 6)
+    return header + question + embedding + response
+
+
+def decode_entry(raw: bytes) -> "CacheEntry":
+    """Inverse of encode_entry(); falls back to the legacy JSON format."""
+    if not raw.startswith(ENTRY_MAGIC):
+        data = json.loads(raw.decode())
+        return CacheEntry(
+            question=data["question"],
+            embedding=data["embedding"],
+            response=data["response"],
+            created_at=data["created_at"],
+            hit_count=data.get("hit_count", 0),
+        )
+    _, version, tag, created_at, hit_count, dim, question_len = _ENTRY_HEADER.unpack_from(raw)
+    if version != ENTRY_FORMAT_VERSION or tag not in _EMBEDDING_CODES:
+        raise ValueError(f"unsupported cache entry format v{version} dtype {tag}")
+    code = _EMBEDDING_CODES[tag]
+    offset = _ENTRY_HEADER.size
+    question = raw[offset:offset + question_len].decode("utf-8")
+    offset += question_len
+    embedding = list(struct.unpack_from(f"<{dim}{code}", raw, offset))
+    offset += dim * struct.calcsize(code)
+    return CacheEntry(
+        question=question,
+        embedding=embedding,
+        response=json.loads(zlib.decompress(raw[offset:])),
+        created_at=created_at,
+        hit_count=hit_count,
+    )
 
 
 def _looks_like_degraded_answer_text(answer: str) -> bool:
@@ -97,16 +204,20 @@ class CacheEntry:
     response: dict
     created_at: float = field(default_factory=time.time)
     hit_count: int = 0
-
-
-def _cosine_similarity(a: list[float], b: list[float]) -> float:
-    """Compute cosine similarity between two vectors."""
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(x * x for x in b))
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+    unit: object = field(default=None, repr=False, compare=False)  # normalised float32 embedding
+    slot: int = field(default=-1, repr=False, compare=False)  # row in AnswerCache's matrix (-1 = not stored)
+    cost: float = field(default=0.0, repr=False, compare=False)  # seconds to regenerate on a miss
+    priority: float = field(default=0.0, repr=False, compare=False)  # set by the eviction policy
+    canonical: str | None = field(default=None, repr=False, compare=False)  # canonical_question_key(question)
+
+    def __post_init__(self):
+        # Normalise once on write so lookups are a single batched dot product
+        if self.unit is None:
+            self.unit = vectors.normalize(self.embedding)
+        if not self.cost:
+            self.cost = regeneration_cost(self.response)
+        if self.canonical is None:
+            self.canonical = canonical_question_key(self.question)
 
 
 class AnswerCache:
@@ -117,6 +228,29 @@ class AnswerCache:
     cache survives application restarts and Railway deploys.  Redis is used as
     a write-through / read-on-startup persistence layer; all hot-path reads and
     similarity scans always happen in-memory for speed.
+
+    Embeddings live in a preallocated float32 matrix of normalised rows (one
+    slot per entry, freed slots are zeroed and reused), so a similarity lookup
+    is one matrix-vector product plus argmax. A min-heap on ``created_at``
+    expires entries without rescanning the cache; when the cache is full an
+    eviction policy (see app.qa.eviction) picks the entry to drop.
+
+    Lookups (``get``, ``get_exact``, ``entries``) share a read lock and run in
+    parallel; ``put``, ``delete``, expiry and eviction take the write lock.
+    Hits are queued on a deque (atomic append, no lock) and folded into
+    ``hit_count`` by the next writer or ``stats()``.
+
+    With a ``shared_store`` (app.qa.shared_cache), this instance becomes a
+    small per-worker L1: misses fall through to the host-wide shared tier
+    and hits there are promoted into L1. Puts go to both tiers, and only
+    one worker per host hydrates the shared tier from Redis.
+
+    With ``stale_ttl_seconds`` > 0 (stale-while-revalidate), an entry past
+    ``ttl_seconds`` but younger than ``ttl_seconds + stale_ttl_seconds`` is
+    still served, flagged ``cache_stale``, and ``refresh_callback`` is called
+    once per question to regenerate it in the background. The caller reports
+    completion with ``refresh_done()``; until then, later stale hits don't
+    start another regeneration.
     """
 
     def __init__(
@@ -126,18 +260,66 @@ class AnswerCache:
         max_entries: int = DEFAULT_MAX_ENTRIES,
         redis_url: str | None = None,
         namespace: str = "default",
+        background_hydration: bool = False,
+        embedding_dtype: str = "float32",
+        eviction_policy: str = "gdsf",
+        shared_store=None,
+        stale_ttl_seconds: int = 0,
+        refresh_callback=None,
     ):
-        self._entries: list[CacheEntry] = []
         self._entries_by_question: dict[str, CacheEntry] = {}
-        self._lock = threading.Lock()
+        self._entries_by_canonical: dict[str, CacheEntry] = {}  # secondary exact index
+        self._slots: list[CacheEntry | None] = []  # matrix row -> entry
+        self._free_slots: list[int] = []
+        self._matrix = None  # allocated on first insert, grown by doubling up to max_entries
+        self._dim: int | None = None
+        self._expiry: list[tuple[float, int, CacheEntry]] = []  # heap of (created_at, seq, entry)
+        self._expiry_seq = itertools.count()
+        self._lock = ReadWriteLock()
+        self._eviction = make_eviction_policy(eviction_policy)
+        self._pending_hits: deque[CacheEntry] = deque()
         self.similarity_threshold = similarity_threshold
+        CACHE_SIMILARITY_THRESHOLD.set(similarity_threshold)
+        CACHE_ENTRIES.set(0)
         self.ttl_seconds = ttl_seconds
+        self.stale_ttl_seconds = max(0, stale_ttl_seconds)
+        self._refresh_callback = refresh_callback  # (question key, original question) -> None
+        self._refreshing: set[str] = set()
+        self._refresh_lock = threading.Lock()
+        self._stale_served = 0
         self.max_entries = max_entries
         self.namespace = (namespace or "default").strip()
         self._redis = None
+        self._shared = shared_store
+        if embedding_dtype not in _EMBEDDING_DTYPES:
+            raise ValueError(f"embedding_dtype must be one of {sorted(_EMBEDDING_DTYPES)}")
+        self.embedding_dtype = embedding_dtype
+        self._codec_lock = threading.Lock()
+        self._codec_stats = {
+            "encoded": 0, "encoded_bytes": 0, "encode_ms": 0.0,
+            "decoded": 0, "decoded_legacy_json": 0, "decode_ms": 0.0,
+        }
+        self._hydrated = threading.Event()
+        self._load_stats = {
+            "state": "disabled",
+            "loaded": 0,
+            "skipped_incomplete": 0,
+            "stale_keys": 0,
+            "pages": 0,
+            "lazy_fetches": 0,
+            "load_ms": 0.0,
+        }
 
         if redis_url:
             self._connect_redis(redis_url)
+        if self._redis is None:
+            self._hydrated.set()
+        elif background_hydration:
+            # Serve from memory straight away; get_exact() falls back to a
+            # single Redis GET for questions that haven't streamed in yet.
+            self._load_stats["state"] = "loading"
+            threading.Thread(target=self._load_from_redis, name="answer-cache-hydrate", daemon=True).start()
+        else:
             self._load_from_redis()
 
     # ── Redis helpers ──────────────────────────────────────────────────────
@@ -154,6 +336,7 @@ class AnswerCache:
             self._redis.ping()
             logger.info("Redis cache backend connected: %s", redis_url.split("@")[-1])
         except Exception as exc:
+            CACHE_REDIS_ERRORS.inc(operation="connect")
             logger.warning("Redis unavailable (%s) — falling back to in-memory only", exc)
             self._redis = None
 
@@ -167,215 +350,579 @@ class AnswerCache:
         return f"amt:cache:index:{self.namespace}"
 
     def _serialize_entry(self, entry: CacheEntry) -> bytes:
-        """Serialise a CacheEntry to JSON bytes (no pickle for safety)."""
-        data = {
-            "question": entry.question,
-            "embedding": entry.embedding,
-            "response": entry.response,
-            "created_at": entry.created_at,
-            "hit_count": entry.hit_count,
-        }
-        return json.dumps(data).encode()
+        """Serialise a CacheEntry for Redis (see encode_entry)."""
+        started = time.perf_counter()
+        raw = encode_entry(entry, self.embedding_dtype)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        with self._codec_lock:
+            self._codec_stats["encoded"] += 1
+            self._codec_stats["encoded_bytes"] += len(raw)
+            self._codec_stats["encode_ms"] += elapsed_ms
+        return raw
 
     def _deserialize_entry(self, raw: bytes) -> CacheEntry | None:
         try:
-            data = json.loads(raw.decode())
-            return CacheEntry(
-                question=data["question"],
-                embedding=data["embedding"],
-                response=data["response"],
-                created_at=data["created_at"],
-                hit_count=data.get("hit_count", 0),
-            )
+            started = time.perf_counter()
+            entry = decode_entry(raw)
+            elapsed_ms = (time.perf_counter() - started) * 1000
         except Exception as exc:
             logger.warning("Failed to deserialise Redis cache entry: %s", exc)
             return None
+        with self._codec_lock:
+            self._codec_stats["decoded"] += 1
+            self._codec_stats["decode_ms"] += elapsed_ms
+            if not raw.startswith(ENTRY_MAGIC):
+                self._codec_stats["decoded_legacy_json"] += 1
+        return entry
+
+    def _serialization_stats(self) -> dict:
+        with self._codec_lock:
+            codec = dict(self._codec_stats)
+        encoded, decoded = codec["encoded"], codec["decoded"]
+        return {
+            "format": f"v{ENTRY_FORMAT_VERSION}-{self.embedding_dtype}-zlib",
+            "entries_written": encoded,
+            "avg_entry_bytes": round(codec["encoded_bytes"] / encoded) if encoded else 0,
+            "avg_serialize_ms": round(codec["encode_ms"] / encoded, 4) if encoded else 0.0,
+            "entries_read": decoded,
+            "legacy_json_read": codec["decoded_legacy_json"],
+            "avg_deserialize_ms": round(codec["decode_ms"] / decoded, 4) if decoded else 0.0,
+        }
+
+    def _accept_loaded(self, entry: CacheEntry, now: float, raw: bytes | None = None) -> str:
+        """
+        Insert an entry read back from Redis; returns "loaded", "expired",
+        "incomplete" or "skipped". With ``raw`` and a shared tier, the entry
+        goes to the shared tier instead of this worker's L1.
+        """
+        # Skip entries past their TTL
+        if (now - entry.created_at) >= self.max_age_seconds:
+            return "expired"
+        # Skip incomplete answers - don't load them from Redis
+        answer = entry.response.get("answer", "")
+        if _is_incomplete_answer(answer) or _looks_like_degraded_answer_text(answer):
+            logger.info("Skipping incomplete cached answer from Redis: '%.50s...' (ends: '...%.30s')",
+                       entry.question, answer[-30:] if answer else "")
+            return "incomplete"
+        if raw is not None and self._shared is not None:
+            return "loaded" if self._shared.put(entry, raw) else "skipped"
+        # A put() that landed while hydrating is newer than the Redis copy
+        current = self._entries_by_question.get(entry.question)
+        if current is not None and current.created_at >= entry.created_at:
+            return "skipped"
+        if current is None and len(self._entries_by_question) >= self.max_entries:
+            return "skipped"
+        return "loaded" if self._insert(entry) else "skipped"
 
     def _load_from_redis(self) -> None:
-        """Populate in-memory cache from Redis on startup."""
+        """
+        Populate the in-memory cache from Redis.
+
+        Keys are read newest-first in MGET pages of REDIS_LOAD_PAGE_SIZE (one
+        round trip per page instead of one per key); each page is inserted
+        under a single write-lock hold. Dangling index members and incomplete
+        answers are removed in one pipelined batch at the end.
+        """
         if not self._redis:
+            self._hydrated.set()
             return
+        started = time.perf_counter()
+        stats = self._load_stats
+        if self._shared is not None and not self._shared.claim_hydration(SHARED_REHYDRATE_SECONDS):
+            # Another worker on this host has loaded (or is loading) the shared tier
+            stats["state"] = "shared"
+            self._hydrated.set()
+            return
+        stats["state"] = "loading"
+        stale_keys: list = []
+        incomplete_keys: list = []
         try:
-            now = time.time()
             # Fetch all entry keys from the sorted set (score = created_at)
-            keys = self._redis.zrange(self._redis_index_key, 0, -1)
-            loaded = 0
-            skipped_incomplete = 0
-            for key in keys:
-                raw = self._redis.get(key)
-                if raw is None:
-                    # TTL expired in Redis but index wasn't cleaned up
-                    self._redis.zrem(self._redis_index_key, key)
-                    continue
-                entry = self._deserialize_entry(raw)
-                if entry is None:
-                    continue
-                # Skip entries past their TTL
-                if (now - entry.created_at) >= self.ttl_seconds:
-                    continue
-                
-                # Skip incomplete answers - don't load them from Redis
-                answer = entry.response.get("answer", "")
-                if _is_incomplete_answer(answer) or _looks_like_degraded_answer_text(answer):
-                    skipped_incomplete += 1
-                    logger.info("Skipping incomplete cached answer from Redis: '%.50s...' (ends: '...%.30s')", 
-                               entry.question, answer[-30:] if answer else "")
-                    # Clean it from Redis too
-                    try:
-                        self._redis.delete(key)
-                        self._redis.zrem(self._redis_index_key, key)
-                    except Exception:
-                        pass
-                    continue
-                
-                self._entries.append(entry)
-                self._entries_by_question[entry.question] = entry
-                loaded += 1
-            logger.info("Loaded %d entries from Redis cache (skipped %d incomplete)", loaded, skipped_incomplete)
+            keys = self._redis.zrevrange(self._redis_index_key, 0, -1)
+            for offset in range(0, len(keys), REDIS_LOAD_PAGE_SIZE):
+                page = keys[offset:offset + REDIS_LOAD_PAGE_SIZE]
+                raws = self._redis.mget(page)
+                stats["pages"] += 1
+                decoded = []
+                for key, raw in zip(page, raws):
+                    if raw is None:
+                        # TTL expired in Redis but index wasn't cleaned up
+                        stale_keys.append(key)
+                        continue
+                    entry = self._deserialize_entry(raw)
+                    if entry is not None:
+                        decoded.append((key, raw, entry))
+
+                for key, outcome in self._store_loaded_page(decoded, time.time()):
+                    if outcome == "loaded":
+                        stats["loaded"] += 1
+                    elif outcome == "incomplete":
+                        stats["skipped_incomplete"] += 1
+                        incomplete_keys.append(key)
+                if self._shared is not None:
+                    full = self._shared.free_slots() == 0
+                else:
+                    full = len(self._entries_by_question) >= self.max_entries
+                if full:
+                    break
+            stats["state"] = "done"
         except Exception as exc:
+            stats["state"] = "failed"
+            CACHE_REDIS_ERRORS.inc(operation="load")
             logger.warning("Failed to load cache from Redis: %s", exc)
+        finally:
+            stats["stale_keys"] = len(stale_keys)
+            stats["load_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            self._hydrated.set()
 
-    def _persist_to_redis(self, entry: CacheEntry) -> None:
+        if stale_keys or incomplete_keys:
+            try:
+                # Clean them from Redis too, in one round trip
+                pipe = self._redis.pipeline(transaction=False)
+                if incomplete_keys:
+                    pipe.delete(*incomplete_keys)
+                pipe.zrem(self._redis_index_key, *(stale_keys + incomplete_keys))
+                pipe.execute()
+            except Exception as exc:
+                CACHE_REDIS_ERRORS.inc(operation="cleanup")
+                logger.warning("Failed to clean stale Redis cache keys: %s", exc)
+        logger.info(
+            "Loaded %d entries from Redis cache in %.0f ms (%d pages, skipped %d incomplete, %d stale)",
+            stats["loaded"], stats["load_ms"], stats["pages"], stats["skipped_incomplete"], len(stale_keys),
+        )
+
+    def _store_loaded_page(self, decoded: list, now: float) -> list[tuple]:
+        if self._shared is not None:
+            # The shared tier has its own (cross-process) lock
+            return [(key, self._accept_loaded(entry, now, raw)) for key, raw, entry in decoded]
+        with self._lock.write():
+            return [(key, self._accept_loaded(entry, now)) for key, _, entry in decoded]
+
+    def _promote(self, entry: CacheEntry) -> None:
+        """Copy an entry found in the shared tier into this worker's L1."""
+        with self._lock.write():
+            current = self._entries_by_question.get(entry.question)
+            if current is None or current.created_at < entry.created_at:
+                self._insert(entry)
+
+    def _fetch_exact_from_redis(self, question: str) -> CacheEntry | None:
+        """While hydration is still running, fetch one question straight from Redis."""
+        try:
+            raw = self._redis.get(self._entry_redis_key(question))
+        except Exception as exc:
+            CACHE_REDIS_ERRORS.inc(operation="get")
+            logger.warning("Redis cache lookup failed: %s", exc)
+            return None
+        entry = self._deserialize_entry(raw) if raw is not None else None
+        if entry is None or entry.question != question:
+            return None
+        with self._lock.write():
+            if self._accept_loaded(entry, time.time()) != "loaded":
+                return None
+        self._load_stats["lazy_fetches"] += 1
+        return entry
+
+    def wait_for_hydration(self, timeout: float | None = None) -> bool:
+        """Block until the Redis load has finished (or failed); True if it has."""
+        return self._hydrated.wait(timeout)
+
+    def _persist_to_redis(self, entry: CacheEntry, raw: bytes | None = None) -> None:
         """Write a single entry to Redis (write-through)."""
         if not self._redis:
             return
         try:
             key = self._entry_redis_key(entry.question)
-            raw = self._serialize_entry(entry)
-            remaining_ttl = max(1, int(self.ttl_seconds - (time.time() - entry.created_at)))
+            raw = raw if raw is not None else self._serialize_entry(entry)
+            remaining_ttl = max(1, int(self.max_age_seconds - (time.time() - entry.created_at)))
             self._redis.setex(key, remaining_ttl, raw)
             # Track in sorted set so we can efficiently load all entries later
             self._redis.zadd(self._redis_index_key, {key: entry.created_at})
             # Expire the index key to avoid unbounded growth
-            self._redis.expire(self._redis_index_key, self.ttl_seconds + 3600)
+            self._redis.expire(self._redis_index_key, self.max_age_seconds + 3600)
         except Exception as exc:
+            CACHE_REDIS_ERRORS.inc(operation="persist")
             logger.warning("Failed to persist cache entry to Redis: %s", exc)
 
+    # ── Matrix storage (caller holds the write lock) ───────────────────────
+
+    def _insert(self, entry: CacheEntry) -> bool:
+        """Store ``entry`` in a free slot, replacing any entry for the same question."""
+        dim = len(entry.unit)
+        if self._dim is None:
+            self._dim = dim
+        elif dim != self._dim:
+            logger.warning("Cache SKIP: embedding dim %d != cache dim %d for '%.60s'", dim, self._dim, entry.question)
+            return False
+
+        self._apply_pending_hits()
+        existing = self._entries_by_question.get(entry.question)
+        if existing is not None:
+            self._remove(existing)
+        while len(self._entries_by_question) >= self.max_entries:
+            self._evict()
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+        else:
+            slot = len(self._slots)
+            capacity = len(self._matrix) if self._matrix is not None else 0
+            if slot >= capacity:
+                new_capacity = min(max(64, capacity * 2), max(self.max_entries, slot + 1))
+                self._matrix = (
+                    vectors.zeros(new_capacity, dim)
+                    if self._matrix is None
+                    else vectors.grow(self._matrix, new_capacity, dim)
+                )
+            self._slots.append(None)
+
+        self._matrix[slot] = entry.unit
+        self._slots[slot] = entry
+        entry.slot = slot
+        self._entries_by_question[entry.question] = entry
+        CACHE_ENTRIES.set(len(self._entries_by_question))
+        if entry.canonical:
+            self._entries_by_canonical[entry.canonical] = entry
+        self._eviction.on_insert(entry)
+        heapq.heappush(self._expiry, (entry.created_at, next(self._expiry_seq), entry))
+        if len(self._expiry) > 2 * len(self._entries_by_question) + 64:
+            # Drop heap items left behind by replaced/deleted entries
+            self._expiry = [item for item in self._expiry if item[2].slot >= 0]
+            heapq.heapify(self._expiry)
+        return True
+
+    def _remove(self, entry: CacheEntry) -> None:
+        slot = entry.slot
+        if slot < 0 or self._slots[slot] is not entry:
+            return
+        self._matrix[slot] = [0.0] * self._dim  # zero rows can never match
+        self._slots[slot] = None
+        self._free_slots.append(slot)
+        entry.slot = -1
+        self._eviction.on_remove(entry)
+        if self._entries_by_question.get(entry.question) is entry:
+            del self._entries_by_question[entry.question]
+            CACHE_ENTRIES.set(len(self._entries_by_question))
+        if entry.canonical and self._entries_by_canonical.get(entry.canonical) is entry:
+            del self._entries_by_canonical[entry.canonical]
+
+    def _expire(self, now: float) -> None:
+        cutoff = now - self.max_age_seconds
+        while self._expiry and self._expiry[0][0] <= cutoff:
+            entry = heapq.heappop(self._expiry)[2]
+            if entry.slot >= 0:
+                CACHE_REMOVALS.inc(reason="expired")
+            self._remove(entry)
+
+    def _evict(self) -> None:
+        entry = self._eviction.victim()
+        if entry is None:
+            # Defensive: the policy lost track of an entry, fall back to the oldest
+            entry = min(self._entries_by_question.values(), key=lambda e: e.created_at)
+        logger.debug("Cache EVICT (%s): '%.60s' (hits=%d, cost=%.1fs)",
+                     self._eviction.name, entry.question, entry.hit_count, entry.cost)
+        CACHE_REMOVALS.inc(reason="evicted")
+        self._remove(entry)
+
+    @property
+    def max_age_seconds(self) -> int:
+        """Age at which an entry is purged (TTL plus the stale-while-revalidate window)."""
+        return self.ttl_seconds + self.stale_ttl_seconds
+
+    def _serve_stale(self, entry: CacheEntry, cached: dict, now: float) -> None:
+        """Flag a past-TTL answer as stale and start one background refresh for it."""
+        age = now - entry.created_at
+        if age < self.ttl_seconds:
+            return
+        cached["cache_stale"] = True
+        cached["cache_age_seconds"] = int(age)
+        self._stale_served += 1
+        CACHE_STALE_SERVED.inc()
+        if self._refresh_callback is None:
+            return
+        with self._refresh_lock:
+            if entry.question in self._refreshing:
+                return
+            self._refreshing.add(entry.question)
+        logger.info("Cache STALE: serving '%.60s' (age=%ds), refreshing in background", entry.question, age)
+        try:
+            self._refresh_callback(entry.question, entry.response.get("question") or entry.question)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Failed to schedule cache refresh for '%.60s': %s", entry.question, exc)
+            self.refresh_done(entry.question)
+
+    def refresh_done(self, question: str) -> None:
+        """Release the refresh lock taken when a stale ``question`` was served."""
+        with self._refresh_lock:
+            self._refreshing.discard(question)
+
+    def _apply_pending_hits(self) -> None:
+        while True:
+            try:
+                entry = self._pending_hits.popleft()
+            except IndexError:
+                return
+            entry.hit_count += 1
+            if entry.slot >= 0:
+                self._eviction.on_hit(entry)
+
+    def _record_hit(self, entry: CacheEntry) -> int:
+        """Queue a hit without taking the write lock; returns the approximate hit count."""
+        self._pending_hits.append(entry)
+        return entry.hit_count + 1
+
+    def _flush_hits_if_needed(self) -> None:
+        if len(self._pending_hits) >= PENDING_HITS_FLUSH:
+            with self._lock.write():
+                self._apply_pending_hits()
+
+    def _expire_if_due(self, now: float) -> None:
+        # Unlocked peek at the heap top: the common case (nothing expired)
+        # never touches the write lock, and a stale read only delays expiry
+        # to the next call.
+        expiry = self._expiry
+        if expiry and expiry[0][0] <= now - self.max_age_seconds:
+            with self._lock.write():
+                self._expire(now)
+
+    def entries(self) -> list[CacheEntry]:
+        """Snapshot of the live entries (safe to iterate without the lock)."""
+        with self._lock.read():
+            return list(self._entries_by_question.values())
+
+    def _observe_lookup(self, method: str, started: float, entry: CacheEntry | None, outcome: str = "hit") -> None:
+        elapsed = time.perf_counter() - started
+        CACHE_LOOKUP_SECONDS.observe(elapsed, method=method)
+        CACHE_LOOKUPS.inc(method=method, outcome=outcome if entry is not None else "miss")
+        if entry is not None:
+            CACHE_LATENCY_SAVED.inc(max(0.0, entry.cost - elapsed))
+
     def get(self, question: str, embedding: list[float]) -> dict | None:
         """
         Look up a cached answer by embedding similarity.
 
         Returns the cached response dict if a match is found, otherwise None.
         """
+        started = time.perf_counter()
         now = time.time()
+        outcome = "hit"
 
-        with self._lock:
-            # Evict expired entries
-            fresh_entries = [
-                e for e in self._entries if (now - e.created_at) < self.ttl_seconds
-            ]
-            if len(fresh_entries) != len(self._entries):
-                self._entries = fresh_entries
-                self._entries_by_question = {e.question: e for e in self._entries}
+        query = vectors.normalize(embedding)
+
+        # Evict expired entries
+        self._expire_if_due(now)
 
+        with self._lock.read():
             best_match: CacheEntry | None = None
             best_similarity = 0.0
 
-            for entry in self._entries:
-                sim = _cosine_similarity(embedding, entry.embedding)
-                if sim > best_similarity:
-                    best_similarity = sim
-                    best_match = entry
+            if self._entries_by_question and len(query) == self._dim:
+                scores = vectors.matvec(self._matrix[:len(self._slots)], query)
+                best = vectors.argmax(scores)
+                if scores[best] > 0:
+                    best_similarity = float(scores[best])
+                    best_match = self._slots[best]
 
             if best_match and best_similarity >= self.similarity_threshold:
-                best_match.hit_count += 1
-                logger.info(
-                    "Cache HIT: '%.60s' matched '%.60s' (similarity=%.4f, hits=%d)",
-                    question,
-                    best_match.question,
-                    best_similarity,
-                    best_match.hit_count,
-                )
+                hits = self._record_hit(best_match)
                 # Return a copy with cache metadata
                 cached = dict(best_match.response)
-                cached["cached"] = True
-                cached["cache_similarity"] = round(best_similarity, 4)
-                return cached
+            else:
+                cached = None
 
+        if cached is None and self._shared is not None:
+            shared_entry, shared_similarity = self._shared.get_similar(
+                query, self.similarity_threshold, now - self.max_age_seconds
+            )
+            if shared_entry is not None:
+                self._promote(shared_entry)
+                best_match, best_similarity = shared_entry, shared_similarity
+                hits = self._record_hit(shared_entry)
+                cached = dict(shared_entry.response)
+                outcome = "shared_hit"
+
+        if best_similarity > 0:
+            CACHE_SIMILARITY.observe(best_similarity, outcome="miss" if cached is None else "hit")
+        if cached is None:
+            self._observe_lookup("similarity", started, None)
             logger.debug(
                 "Cache MISS: '%.60s' (best_similarity=%.4f)",
                 question,
                 best_similarity,
             )
             return None
+        self._observe_lookup("similarity", started, best_match, outcome)
+
+        logger.info(
+            "Cache HIT: '%.60s' matched '%.60s' (similarity=%.4f, hits=%d)",
+            question,
+            best_match.question,
+            best_similarity,
+            hits,
+        )
+        cached["cached"] = True
+        cached["cache_similarity"] = round(best_similarity, 4)
+        self._serve_stale(best_match, cached, now)
+        self._flush_hits_if_needed()
+        return cached
 
     def get_exact(self, question: str) -> dict | None:
         """Look up a cached answer by exact normalized question match."""
+        started = time.perf_counter()
         now = time.time()
+        outcome = "hit"
+
+        if self._shared is not None and question not in self._entries_by_question:
+            shared_entry = self._shared.get_exact(question, now - self.max_age_seconds)
+            if shared_entry is not None:
+                self._promote(shared_entry)
+                outcome = "shared_hit"
+        if not self._hydrated.is_set() and question not in self._entries_by_question:
+            self._fetch_exact_from_redis(question)
 
-        with self._lock:
+        with self._lock.read():
             entry = self._entries_by_question.get(question)
             if not entry:
+                self._observe_lookup("exact", started, None)
                 return None
-            if (now - entry.created_at) >= self.ttl_seconds:
-                self._entries = [e for e in self._entries if e.question != question]
-                self._entries_by_question.pop(question, None)
-                return None
+            expired = (now - entry.created_at) >= self.max_age_seconds
+            if not expired:
+                hits = self._record_hit(entry)
+                cached = dict(entry.response)
+
+        if expired:
+            with self._lock.write():
+                if entry.slot >= 0:
+                    CACHE_REMOVALS.inc(reason="expired")
+                self._remove(entry)
+            self._observe_lookup("exact", started, None)
+            return None
 
-            entry.hit_count += 1
-            logger.info(
-                "Cache EXACT HIT: '%.60s' (hits=%d)",
-                question,
-                entry.hit_count,
-            )
+        self._observe_lookup("exact", started, entry, outcome)
+        logger.info(
+            "Cache EXACT HIT: '%.60s' (hits=%d)",
+            question,
+            hits,
+        )
+        cached["cached"] = True
+        cached["cache_similarity"] = 1.0
+        cached["cache_match_type"] = "exact"
+        self._serve_stale(entry, cached, now)
+        self._flush_hits_if_needed()
+        return cached
+
+    def get_canonical(self, question: str) -> dict | None:
+        """
+        Look up a cached answer whose question has the same canonical key
+        (see ``canonical_question_key``). Catches rephrasings that miss
+        ``get_exact`` without needing a query embedding.
+        """
+        started = time.perf_counter()
+        key = canonical_question_key(question)
+        if not key:
+            self._observe_lookup("canonical", started, None)
+            return None
+        now = time.time()
+
+        with self._lock.read():
+            entry = self._entries_by_canonical.get(key)
+            if entry is None or (now - entry.created_at) >= self.max_age_seconds:
+                self._observe_lookup("canonical", started, None)
+                return None
+            hits = self._record_hit(entry)
             cached = dict(entry.response)
-            cached["cached"] = True
-            cached["cache_similarity"] = 1.0
-            cached["cache_match_type"] = "exact"
-            return cached
+
+        self._observe_lookup("canonical", started, entry)
+
+        logger.info(
+            "Cache CANONICAL HIT: '%.60s' matched '%.60s' (key='%.60s', hits=%d)",
+            question,
+            entry.question,
+            key,
+            hits,
+        )
+        cached["cached"] = True
+        cached["cache_similarity"] = 1.0
+        cached["cache_match_type"] = "canonical"
+        self._serve_stale(entry, cached, now)
+        self._flush_hits_if_needed()
+        return cached
 
     def put(self, question: str, embedding: list[float], response: dict) -> None:
         """Store an answer in the cache."""
-        with self._lock:
-            # Don't cache error responses
-            if not response.get("answer"):
-                return
-            if (
-                response.get("answer_source") in {"basic_fallback", "no_match"}
-                or response.get("answer_status") in {"generation_failed", "source_moments_only", "needs_refinement"}
-                or _looks_like_degraded_answer_text(str(response.get("answer") or ""))
-            ):
-                logger.info("Cache SKIP: degraded answer for '%.60s'", question)
-                return
+        # Don't cache error responses
+        if not response.get("answer"):
+            return
+        if (
+            response.get("answer_source") in {"basic_fallback", "no_match"}
+            or response.get("answer_status") in {"generation_failed", "source_moments_only", "needs_refinement"}
+            or _looks_like_degraded_answer_text(str(response.get("answer") or ""))
+        ):
+            logger.info("Cache SKIP: degraded answer for '%.60s'", question)
+            CACHE_PUT_SKIPPED.inc(reason="degraded")
+            return
 
-            # Evict oldest if at capacity
-            if len(self._entries) >= self.max_entries:
-                # Remove least recently created entries
-                self._entries.sort(key=lambda e: e.created_at)
-                self._entries = self._entries[-(self.max_entries // 2) :]
-                self._entries_by_question = {e.question: e for e in self._entries}
-
-            entry = CacheEntry(
-                question=question,
-                embedding=embedding,
-                response=response,
-            )
-            self._entries.append(entry)
-            self._entries_by_question[entry.question] = entry
-            logger.info("Cache PUT: '%.60s' (total entries: %d)", question, len(self._entries))
+        # Normalised outside the lock; replaces any entry for the same question
+        # and evicts the oldest entry when at capacity
+        entry = CacheEntry(
+            question=question,
+            embedding=embedding,
+            response=response,
+        )
+        with self._lock.write():
+            if not self._insert(entry):
+                return
+            logger.info("Cache PUT: '%.60s' (total entries: %d)", question, len(self._entries_by_question))
 
-        # Persist outside the lock to avoid blocking cache reads
-        self._persist_to_redis(entry)
+        # Share and persist outside the lock to avoid blocking cache reads
+        if self._shared is None and not self._redis:
+            return
+        raw = self._serialize_entry(entry)
+        if self._shared is not None:
+            self._shared.put(entry, raw)
+        self._persist_to_redis(entry, raw)
 
     def stats(self) -> dict:
         """Return cache statistics."""
-        with self._lock:
-            total_hits = sum(e.hit_count for e in self._entries)
+        with self._lock.write():
+            self._apply_pending_hits()
+            total_hits = sum(e.hit_count for e in self._entries_by_question.values())
             return {
-                "entries": len(self._entries),
+                "entries": len(self._entries_by_question),
+                "canonical_keys": len(self._entries_by_canonical),
                 "max_entries": self.max_entries,
+                "matrix_rows": len(self._matrix) if self._matrix is not None else 0,
+                "free_slots": len(self._free_slots),
                 "total_hits": total_hits,
                 "ttl_seconds": self.ttl_seconds,
+                "stale_ttl_seconds": self.stale_ttl_seconds,
+                "stale_served": self._stale_served,
+                "refreshing": len(self._refreshing),
                 "similarity_threshold": self.similarity_threshold,
                 "namespace": self.namespace,
+                "redis_load": dict(self._load_stats),
+                "serialization": self._serialization_stats(),
+                "eviction": self._eviction.stats(),
+                "shared": self._shared.stats() if self._shared is not None else None,
             }
 
     def clear(self) -> None:
         """Clear all cache entries (in-memory and Redis)."""
-        with self._lock:
-            self._entries.clear()
+        with self._lock.write():
+            self._pending_hits.clear()
+            for entry in self._entries_by_question.values():
+                entry.slot = -1
             self._entries_by_question.clear()
+            CACHE_ENTRIES.set(0)
+            self._entries_by_canonical.clear()
+            self._slots.clear()
+            self._free_slots.clear()
+            self._expiry.clear()
+            self._eviction.clear()
+            self._matrix = None
+            self._dim = None
             logger.info("Cache CLEARED")
+        if self._shared is not None:
+            self._shared.clear()
         if self._redis:
             try:
                 keys = self._redis.zrange(self._redis_index_key, 0, -1)
@@ -384,6 +931,7 @@ class AnswerCache:
                 self._redis.delete(self._redis_index_key)
                 logger.info("Redis cache CLEARED")
             except Exception as exc:
+                CACHE_REDIS_ERRORS.inc(operation="clear")
                 logger.warning("Failed to clear Redis cache: %s", exc)
 
     def delete(self, question: str) -> bool:
@@ -391,15 +939,17 @@ class AnswerCache:
         Delete a specific cache entry by normalized question.
         Returns True if entry was found and deleted, False otherwise.
         """
-        with self._lock:
+        with self._lock.write():
             entry = self._entries_by_question.get(question)
-            if not entry:
-                return False
-            
-            # Remove from in-memory structures
-            self._entries = [e for e in self._entries if e.question != question]
-            self._entries_by_question.pop(question, None)
-            logger.info("Cache DELETE: '%.60s'", question)
+            if entry:
+                # Remove from in-memory structures
+                self._remove(entry)
+        found = entry is not None
+        if self._shared is not None:
+            found = self._shared.delete(question) or found
+        if not found:
+            return False
+        logger.info("Cache DELETE: '%.60s'", question)
         
         # Remove from Redis
         if self._redis:
@@ -409,6 +959,7 @@ class AnswerCache:
                 self._redis.zrem(self._redis_index_key, key)
                 logger.info("Redis cache DELETE: '%.60s'", question)
             except Exception as exc:
+                CACHE_REDIS_ERRORS.inc(operation="delete")
                 logger.warning("Failed to delete from Redis cache: %s", exc)
         
         return True
@@ -596,10 +1147,27 @@ def get_answer_cache() -> AnswerCache:
     global _answer_cache
     if _answer_cache is None:
         from app.core.config import settings
+        shared_store = None
+        if settings.cache_shared_memory_path:
+            from app.qa.shared_cache import open_shared_store
+            shared_store = open_shared_store(
+                f"{settings.cache_shared_memory_path}-{settings.cache_namespace}",
+                capacity=settings.cache_shared_memory_entries,
+                dim=settings.embedding_dim,
+                entry_bytes=settings.cache_shared_entry_bytes,
+            )
+        from app.qa.revalidate import schedule_stale_refresh
         _answer_cache = AnswerCache(
             similarity_threshold=settings.cache_similarity_threshold,
             ttl_seconds=settings.cache_ttl_seconds,
+            stale_ttl_seconds=settings.cache_stale_ttl_seconds,
+            refresh_callback=schedule_stale_refresh,
+            max_entries=settings.cache_l1_max_entries if shared_store is not None else DEFAULT_MAX_ENTRIES,
             redis_url=settings.redis_url,
             namespace=settings.cache_namespace,
+            background_hydration=settings.cache_background_hydration,
+            embedding_dtype=settings.cache_embedding_dtype,
+            eviction_policy=settings.cache_eviction_policy,
+            shared_store=shared_store,
         )
     return _answer_cache
@@ -0,0 +1,127 @@
+"""
+Eviction policies for the answer cache.
+
+A cache miss costs a full OpenAI generation (typically 10-25 s), so when
+AnswerCache is full it should drop the entry that is cheapest to lose, not
+simply the oldest one. Policies keep a lazy min-heap of (priority, seq,
+entry); the entry with the lowest priority is evicted.
+
+- ``gdsf`` (default): GreedyDual-Size-Frequency. Priority is
+  ``clock + frequency × cost / size``, where cost is the recorded
+  generation latency and size is one slot. ``clock`` is raised to each
+  victim's priority (aging), so entries that were popular long ago
+  eventually become evictable.
+- ``lfu``: LFU with the same dynamic aging, ignoring cost.
+- ``oldest``: the previous behaviour (evict the oldest ``created_at``).
+
+Policies only touch the entries they're given; AnswerCache calls them
+with its write lock held.
+"""
+
+import heapq
+import itertools
+
+DEFAULT_REGENERATION_COST_MS = 15000.0  # assumed when an answer has no recorded latency
+
+
+def regeneration_cost(response: dict) -> float:
+    """Estimated cost (seconds) of regenerating ``response`` after a miss."""
+    try:
+        latency_ms = float(response.get("latency_ms") or 0)
+    except (TypeError, ValueError):
+        latency_ms = 0.0
+    if latency_ms <= 0:
+        latency_ms = DEFAULT_REGENERATION_COST_MS
+    return latency_ms / 1000
+
+
+class EvictionPolicy:
+    name = "base"
+    aging = False
+
+    def __init__(self):
+        self._heap: list[tuple[float, int, object]] = []
+        self._seq = itertools.count()
+        self._live = 0
+        self.clock = 0.0
+        self.evictions = 0
+
+    def priority(self, entry) -> float:
+        raise NotImplementedError
+
+    def _push(self, entry) -> None:
+        entry.priority = self.priority(entry)
+        heapq.heappush(self._heap, (entry.priority, next(self._seq), entry))
+        if len(self._heap) > 2 * self._live + 64:
+            # Drop heap items superseded by a later hit or left by removed entries
+            self._heap = [item for item in self._heap if self._is_current(item)]
+            heapq.heapify(self._heap)
+
+    @staticmethod
+    def _is_current(item) -> bool:
+        priority, _, entry = item
+        return entry.slot >= 0 and entry.priority == priority
+
+    def on_insert(self, entry) -> None:
+        self._live += 1
+        self._push(entry)
+
+    def on_hit(self, entry) -> None:
+        pass
+
+    def on_remove(self, entry) -> None:
+        self._live -= 1
+
+    def victim(self):
+        """Pop and return the entry to evict (None if nothing is stored)."""
+        while self._heap:
+            item = heapq.heappop(self._heap)
+            if self._is_current(item):
+                if self.aging:
+                    self.clock = max(self.clock, item[0])
+                self.evictions += 1
+                return item[2]
+        return None
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._live = 0
+        self.clock = 0.0
+
+    def stats(self) -> dict:
+        return {"policy": self.name, "evictions": self.evictions, "clock": round(self.clock, 3)}
+
+
+class OldestFirstPolicy(EvictionPolicy):
+    name = "oldest"
+
+    def priority(self, entry) -> float:
+        return entry.created_at
+
+
+class LFUPolicy(EvictionPolicy):
+    name = "lfu"
+    aging = True
+
+    def priority(self, entry) -> float:
+        return self.clock + entry.hit_count + 1
+
+    def on_hit(self, entry) -> None:
+        self._push(entry)
+
+
+class GDSFPolicy(LFUPolicy):
+    name = "gdsf"
+
+    def priority(self, entry) -> float:
+        return self.clock + (entry.hit_count + 1) * entry.cost
+
+
+EVICTION_POLICIES = {policy.name: policy for policy in (GDSFPolicy, LFUPolicy, OldestFirstPolicy)}
+
+
+def make_eviction_policy(name: str) -> EvictionPolicy:
+    try:
+        return EVICTION_POLICIES[name]()
+    except KeyError:
+        raise ValueError(f"eviction policy must be one of {sorted(EVICTION_POLICIES)}") from None
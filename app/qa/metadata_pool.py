@@ -0,0 +1,118 @@
+"""
+Process-wide pool for answer metadata: follow-up questions and shareable headlines.
+
+Both are extra OpenAI calls made after a fresh answer. They run on one
+bounded pool of ``metadata_workers`` threads, shared by every request,
+instead of a two-thread executor built and torn down per question.
+
+Tasks that wait for a worker count as queued. When the queue is too deep,
+new tasks are shed rather than added to the backlog: headlines past
+``metadata_headline_max_queued``, everything past ``metadata_max_queued``.
+``submit`` returns None for a shed task and the caller uses its local,
+no-OpenAI fallback. Headlines are shed first because the card can take
+one from the answer text.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from app.core import metrics
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+FOLLOW_UPS = "follow_ups"
+HEADLINE = "headline"
+
+# Seconds; under normal load tasks start immediately
+QUEUE_WAIT_BUCKETS = (0.001, 0.005, 0.025, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+QUEUED = metrics.gauge("answer_metadata_queued", "Follow-up/headline tasks waiting for a metadata pool worker")
+QUEUE_WAIT_SECONDS = metrics.histogram(
+    "answer_metadata_queue_wait_seconds",
+    "Time follow-up/headline tasks waited for a metadata pool worker by task (follow_ups, headline)",
+    ("task",),
+    buckets=QUEUE_WAIT_BUCKETS,
+)
+REJECTED = metrics.counter(
+    "answer_metadata_rejected_total",
+    "Follow-up/headline tasks shed because the metadata pool queue was full, by task",
+    ("task",),
+)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"submitted": 0, "rejected": 0, "queued": 0, "peak_queued": 0, "completed": 0, "failed": 0}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.metadata_workers),
+                    thread_name_prefix="answer-metadata",
+                )
+    return _executor
+
+
+def _max_queued(task: str) -> int:
+    if task == HEADLINE:
+        return min(settings.metadata_headline_max_queued, settings.metadata_max_queued)
+    return settings.metadata_max_queued
+
+
+def _dequeue() -> None:
+    with _stats_lock:
+        _stats["queued"] -= 1
+        QUEUED.set(_stats["queued"])
+
+
+def submit(task: str, fn, *args) -> Future | None:
+    """Queue ``fn(*args)`` on the metadata pool, or return None if ``task`` is shed."""
+    with _stats_lock:
+        if _stats["queued"] >= _max_queued(task):
+            _stats["rejected"] += 1
+            shed = True
+        else:
+            _stats["submitted"] += 1
+            _stats["queued"] += 1
+            _stats["peak_queued"] = max(_stats["peak_queued"], _stats["queued"])
+            QUEUED.set(_stats["queued"])
+            shed = False
+    if shed:
+        REJECTED.inc(task=task)
+        logger.warning("Metadata pool queue full; shedding %s generation", task)
+        return None
+
+    future = _get_executor().submit(_run, task, time.perf_counter(), fn, args)
+    # Only a task that never started can be cancelled; it leaves the queue here instead of in _run
+    future.add_done_callback(lambda f: f.cancelled() and _dequeue())
+    return future
+
+
+def _run(task: str, enqueued_at: float, fn, args):
+    _dequeue()
+    QUEUE_WAIT_SECONDS.observe(time.perf_counter() - enqueued_at, task=task)
+    outcome = "completed"
+    try:
+        return fn(*args)
+    except Exception:
+        outcome = "failed"
+        raise
+    finally:
+        with _stats_lock:
+            _stats[outcome] += 1
+
+
+def get_metadata_pool_stats() -> dict:
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["workers"] = settings.metadata_workers
+    stats["max_queued"] = settings.metadata_max_queued
+    stats["headline_max_queued"] = settings.metadata_headline_max_queued
+    return stats
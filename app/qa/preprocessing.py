@@ -7,6 +7,7 @@ Enhances user questions before retrieval to improve search quality:
 - Clarification detection (vague/ambiguous questions)
 - Intent classification
 - Key term extraction
+- Canonical question keys for exact-match caching
 """
 
 import re
@@ -61,6 +62,28 @@ _SYNONYM_GROUPS = {
 }
 
 
+_STOPWORDS = {
+    'what', 'when', 'where', 'which', 'who', 'whom', 'whose', 'why', 'how',
+    'does', 'do', 'did', 'can', 'could', 'would', 'should', 'will', 'won',
+    'about', 'after', 'before', 'from', 'into', 'through', 'during',
+    'with', 'without', 'for', 'of', 'by', 'on', 'at', 'to', 'in',
+    'the', 'a', 'an', 'and', 'or', 'but', 'if', 'because', 'as', 'until',
+    'this', 'that', 'these', 'those', 'then', 'so', 'than', 'such',
+    'even', 'most', 'other', 'some', 'very', 'just', 'help', 'tell', 'talk'
+}
+
+# Stopwords that still change what is being asked ("how" vs "why", "should",
+# "without"), so canonical keys keep them
+_CANONICAL_KEEP = {
+    'what', 'when', 'where', 'which', 'who', 'whom', 'whose', 'why', 'how',
+    'can', 'could', 'would', 'should', 'will', 'won',
+    'after', 'before', 'without', 'or', 'but', 'if', 'until', 'most', 'other',
+}
+# Fillers that only matter to canonical keys ("how do I forgive" == "how to forgive")
+_CANONICAL_FILLER = {'i', 'my', 'am', 'is', 'are', 'please', 'really'}
+_CANONICAL_STOPWORDS = (_STOPWORDS - _CANONICAL_KEEP) | _CANONICAL_FILLER
+
+
 _BRAND_LEAD_PATTERNS = [
     re.compile(r"^\s*what does mirror talk (?:teach|say) about\s+", re.IGNORECASE),
     re.compile(r"^\s*mirror talk (?:teaches|says)\s+", re.IGNORECASE),
@@ -116,6 +139,24 @@ def preprocess_query(question: str) -> ProcessedQuery:
     )
 
 
+def canonical_question_key(question: str) -> str:
+    """
+    Canonical form of a question for exact-match cache lookups.
+
+    Applies the preprocessing steps that don't change meaning (brand lead-in
+    stripping, spelling correction), then lowercases and drops punctuation
+    and filler stopwords: "What does Mirror Talk say about setting boundries
+    with my family?" and "setting boundaries with family" share a key, as do
+    "How do I forgive?" and "how to forgive". Question words, modals and
+    negating words are kept, so "why should I forgive" stays distinct.
+    Returns "" when nothing meaningful is left.
+    """
+    q = _strip_brand_lead(_normalize_query(question))
+    q = _correct_spelling(q).lower()
+    tokens = re.findall(r"[a-z0-9']+", q)
+    return " ".join(t for t in tokens if t not in _CANONICAL_STOPWORDS)
+
+
 def _strip_brand_lead(query: str) -> str:
     """Remove brand-heavy lead-ins so retrieval embeds the actual user intent."""
     for pattern in _BRAND_LEAD_PATTERNS:
@@ -190,19 +231,9 @@ def _extract_key_terms(query: str) -> list[str]:
                 key_terms.append(syn)
     
     # Extract other meaningful words (4+ characters, not stopwords)
-    stopwords = {
-        'what', 'when', 'where', 'which', 'who', 'whom', 'whose', 'why', 'how',
-        'does', 'do', 'did', 'can', 'could', 'would', 'should', 'will', 'won',
-        'about', 'after', 'before', 'from', 'into', 'through', 'during',
-        'with', 'without', 'for', 'of', 'by', 'on', 'at', 'to', 'in',
-        'the', 'a', 'an', 'and', 'or', 'but', 'if', 'because', 'as', 'until',
-        'this', 'that', 'these', 'those', 'then', 'so', 'than', 'such',
-        'even', 'most', 'other', 'some', 'very', 'just', 'help', 'tell', 'talk'
-    }
-    
     words = re.findall(r'\b\w{4,}\b', query_lower)
     for word in words:
-        if word not in stopwords and word not in key_terms:
+        if word not in _STOPWORDS and word not in key_terms:
             # Check if it's a meaningful term (contains vowel, not just numbers)
             if any(v in word for v in 'aeiou') and not word.isdigit():
                 key_terms.append(word)
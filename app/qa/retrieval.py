@@ -1,23 +1,305 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import select
-from pgvector.sqlalchemy import Vector
-import math
+from sqlalchemy import select, extract, literal, union_all
 import logging
 
+import numpy as np
+
 from app.storage.models import Chunk, Episode
 from app.core.config import settings
+from app.core import vectors
 
 logger = logging.getLogger(__name__)
 
 
-def _cosine_sim(a: list[float], b: list[float]) -> float:
-    """Fast cosine similarity between two embedding vectors."""
-    dot = sum(x * y for x, y in zip(a, b))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(x * x for x in b))
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+class EpisodeInfo:
+    """Episode metadata the QA pipeline needs, joined into the retrieval query."""
+
+    __slots__ = ("id", "title", "audio_url", "published_year")
+
+    def __init__(self, id: int, title: str, audio_url: str, published_year: int | None):
+        self.id = id
+        self.title = title
+        self.audio_url = audio_url
+        self.published_year = published_year
+
+
+class RetrievedChunk:
+    """
+    Compact chunk record returned by retrieval.
+
+    Exposes the same attributes as ``Chunk`` that retrieval consumers read
+    (id, episode_id, start_time, end_time, text, embedding) plus the joined
+    ``episode``, without ORM identity-map or tag-column overhead.
+    """
+
+    __slots__ = ("id", "episode_id", "start_time", "end_time", "text", "embedding", "episode")
+
+    def __init__(self, id, episode_id, start_time, end_time, text, embedding, episode: EpisodeInfo):
+        self.id = id
+        self.episode_id = episode_id
+        self.start_time = start_time
+        self.end_time = end_time
+        self.text = text
+        self.embedding = embedding
+        self.episode = episode
+
+
+# Only the columns the QA pipeline reads, with episode metadata joined in so
+# answer_question doesn't need a second query for Episode rows.
+_RETRIEVAL_COLUMNS = (
+    Chunk.id,
+    Chunk.episode_id,
+    Chunk.start_time,
+    Chunk.end_time,
+    Chunk.text,
+    Chunk.embedding,
+    Episode.title,
+    Episode.audio_url,
+    extract("year", Episode.published_at).label("published_year"),
+)
+
+
+def _records_from_rows(rows) -> list[RetrievedChunk]:
+    """Build RetrievedChunk records from projected rows, sharing one EpisodeInfo per episode."""
+    episodes: dict[int, EpisodeInfo] = {}
+    records = []
+    for chunk_id, episode_id, start_time, end_time, text, embedding, title, audio_url, year, *_ in rows:
+        episode = episodes.get(episode_id)
+        if episode is None:
+            episode = EpisodeInfo(episode_id, title, audio_url, int(year) if year is not None else None)
+            episodes[episode_id] = episode
+        records.append(RetrievedChunk(chunk_id, episode_id, start_time, end_time, text, embedding, episode))
+    return records
+
+
+def episode_map_from_chunks(chunks) -> dict[int, EpisodeInfo]:
+    """Episode map for retrieved chunks, built from the joined metadata (no query)."""
+    return {chunk.episode_id: chunk.episode for chunk in chunks}
+
+
+class RetrievalResult:
+    """
+    Answer and citation payloads for one retrieval pass, as the QA service consumes them.
+
+    ``chunk_payloads`` feed answer generation; ``citation_payloads`` (two-tier
+    retrieval only, else None) feed citation selection. Each episode's payload
+    dict is built once and shared by every payload that cites it; pass
+    ``episode_payloads`` from the first pass to the low-match rewrite pass to
+    share them across both. Payload dicts are read-only downstream.
+    """
+
+    __slots__ = ("answer_chunks", "chunk_payloads", "citation_payloads", "episode_payloads")
+
+    def __init__(self, answer_chunks: list[tuple], citation_episodes: list[dict] | None = None,
+                 episode_payloads: dict[int, dict] | None = None):
+        self.answer_chunks = answer_chunks
+        self.episode_payloads = episode_payloads if episode_payloads is not None else {}
+        episode_payload = self._episode_payload
+        self.chunk_payloads = [
+            {
+                "text": chunk.text,
+                "start_time": chunk.start_time,
+                "end_time": chunk.end_time,
+                "episode": episode_payload(chunk.episode),
+                "similarity": similarity,
+            }
+            for chunk, similarity in answer_chunks
+        ]
+        self.citation_payloads = None
+        if citation_episodes is not None:
+            self.citation_payloads = [
+                {
+                    "text": cit["chunk"].text,
+                    "start_time": cit["chunk"].start_time,
+                    "end_time": cit["chunk"].end_time,
+                    "episode": episode_payload(cit["chunk"].episode),
+                    "similarity": cit["similarity"],
+                    "relevance_score": cit["relevance_score"],
+                    "total_relevant_chunks": cit["total_relevant_chunks"],
+                }
+                for cit in citation_episodes
+            ]
+
+    @classmethod
+    def from_chunks(cls, answer_chunks: list[tuple], episode_payloads: dict[int, dict] | None = None):
+        """From ``retrieve_chunks`` output (no citation tier)."""
+        return cls(answer_chunks, None, episode_payloads)
+
+    @classmethod
+    def from_two_tier(cls, result: dict, episode_payloads: dict[int, dict] | None = None):
+        """From a ``retrieve_chunks_two_tier`` result dict."""
+        return cls(result["answer_chunks"], result["citation_episodes"], episode_payloads)
+
+    def _episode_payload(self, episode: EpisodeInfo) -> dict:
+        payload = self.episode_payloads.get(episode.id)
+        if payload is None:
+            payload = self.episode_payloads[episode.id] = {
+                "id": episode.id,
+                "title": episode.title,
+                "audio_url": episode.audio_url or "",
+                "published_year": episode.published_year,
+            }
+        return payload
+
+
+def _mmr_select(candidates: list[tuple], top_k: int, diversity_lambda: float) -> list[tuple]:
+    """
+    Select up to ``top_k`` (chunk, similarity) pairs with MMR, one per episode.
+
+    Candidates must be ordered by relevance (best first). Candidate embeddings
+    are normalised once into a float32 matrix and a running "max similarity to
+    anything selected" vector is updated after every pick, so each round costs
+    a single matrix-vector product instead of a Python loop over all pairs.
+    """
+    if not candidates or top_k <= 0:
+        return []
+
+    # Zero vectors stay zero so their cosine similarity to anything is 0.0
+    matrix = vectors.normalized_matrix([chunk.embedding for chunk, _ in candidates])
+    similarities = np.fromiter((sim for _, sim in candidates), dtype=np.float64, count=len(candidates))
+    episode_ids = [chunk.episode_id for chunk, _ in candidates]
+
+    # Always pick the most relevant chunk first
+    best_chunk, best_similarity = candidates[0]
+    selected = [candidates[0]]
+    seen_episodes = {best_chunk.episode_id}
+    available = np.fromiter(
+        (episode_id not in seen_episodes for episode_id in episode_ids),
+        dtype=bool,
+        count=len(candidates),
+    )
+    max_sim_to_selected = vectors.matvec(matrix, matrix[0])
+
+    logger.info(f"MMR: Selected most relevant - Episode {best_chunk.episode_id} (similarity: {best_similarity:.3f})")
+
+    # For remaining slots, balance relevance with diversity:
+    # mmr = lambda * relevance + (1 - lambda) * (1 - max_sim_to_selected)
+    while len(selected) < top_k:
+        if not available.any():
+            # No more candidates available
+            logger.info(f"MMR: Stopped at {len(selected)} results (no more diverse candidates)")
+            break
+
+        mmr_scores = (diversity_lambda * similarities) + ((1 - diversity_lambda) * (1.0 - max_sim_to_selected))
+        mmr_scores[~available] = -np.inf
+        # argmax returns the first maximum, preserving relevance order on ties
+        best_index = int(np.argmax(mmr_scores))
+        best_mmr_score = float(mmr_scores[best_index])
+        if not best_mmr_score > -1:
+            logger.info(f"MMR: Stopped at {len(selected)} results (no more diverse candidates)")
+            break
+
+        chunk, similarity = candidates[best_index]
+        selected.append(candidates[best_index])
+        seen_episodes.add(chunk.episode_id)
+        # Drop every remaining candidate from the newly covered episode
+        available &= np.fromiter(
+            (episode_id != chunk.episode_id for episode_id in episode_ids),
+            dtype=bool,
+            count=len(candidates),
+        )
+        np.maximum(max_sim_to_selected, vectors.matvec(matrix, matrix[best_index]), out=max_sim_to_selected)
+        logger.info(f"MMR: Selected diverse - Episode {chunk.episode_id} "
+                   f"(similarity: {similarity:.3f}, MMR score: {best_mmr_score:.3f})")
+
+    return selected
+
+
+def _search_pgvector(db: Session, query_embeddings: list[list[float]], limit: int) -> list[list[tuple]]:
+    """
+    Nearest-neighbour search via the pgvector HNSW index.
+
+    Several query vectors are searched in a single round trip: one ordered,
+    limited SELECT per query combined with UNION ALL and tagged with the
+    query's position, so each still uses the HNSW index.
+    """
+    selects = []
+    for query_index, query_embedding in enumerate(query_embeddings):
+        distance = Chunk.embedding.cosine_distance(query_embedding)
+        selects.append(
+            select(*_RETRIEVAL_COLUMNS, distance.label("distance"), literal(query_index).label("query_index"))
+            .join(Episode, Episode.id == Chunk.episode_id)
+            .order_by(distance.asc())
+            .limit(limit)
+        )
+    stmt = selects[0] if len(selects) == 1 else union_all(*selects)
+    rows = db.execute(stmt).all()
+
+    grouped: list[list[tuple]] = [[] for _ in query_embeddings]
+    for record, row in zip(_records_from_rows(rows), rows):
+        grouped[row[-1]].append((record, 1 - float(row[-2])))
+    for results in grouped:
+        # UNION ALL doesn't promise to keep each branch's ordering
+        results.sort(key=lambda pair: pair[1], reverse=True)
+    return grouped
+
+
+def _search_memory_index(db: Session, query_embeddings: list[list[float]], limit: int) -> list[list[tuple]] | None:
+    """
+    Nearest-neighbour search via the in-process chunk index.
+
+    Returns None when the index isn't loaded yet so the caller can fall back
+    to pgvector. Chunk columns for the hits of every query are fetched in one
+    primary-key lookup.
+    """
+    from app.qa.vector_index import get_chunk_index
+
+    index = get_chunk_index()
+    if index.is_stale():
+        index.refresh_in_background()
+    if not index.ready:
+        return None
+
+    hits_per_query = [index.search(query_embedding, limit) for query_embedding in query_embeddings]
+    hit_ids = {chunk_id for hits in hits_per_query for chunk_id, _ in hits}
+    if not hit_ids:
+        return [[] for _ in query_embeddings]
+    stmt = (
+        select(*_RETRIEVAL_COLUMNS)
+        .join(Episode, Episode.id == Chunk.episode_id)
+        .where(Chunk.id.in_(hit_ids))
+    )
+    chunk_by_id = {record.id: record for record in _records_from_rows(db.execute(stmt).all())}
+    return [
+        [
+            (chunk_by_id[chunk_id], similarity)
+            for chunk_id, similarity in hits
+            if chunk_id in chunk_by_id
+        ]
+        for hits in hits_per_query
+    ]
+
+
+def _search_candidates(db: Session, query_embeddings: list[list[float]], limit: int) -> list[list[tuple]]:
+    """Return up to ``limit`` (chunk, similarity) pairs per query from the configured backend, best first."""
+    if settings.retrieval_backend == "memory":
+        try:
+            results = _search_memory_index(db, query_embeddings, limit)
+            if results is not None:
+                return results
+            logger.info("Chunk vector index not ready; using pgvector for this query")
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("In-memory retrieval failed; falling back to pgvector: %s", exc)
+    return _search_pgvector(db, query_embeddings, limit)
+
+
+def _select_diverse(results: list[tuple], diversity_lambda: float) -> list[tuple]:
+    """Apply the similarity threshold and MMR selection to one query's candidates."""
+    # Filter by threshold
+    candidates = [
+        (chunk, similarity) for chunk, similarity in results
+        if similarity >= settings.min_similarity
+    ]
+    
+    if not candidates:
+        logger.warning("No chunks found above similarity threshold")
+        return []
+    
+    selected = _mmr_select(candidates, settings.top_k, diversity_lambda)
+    
+    logger.info(f"MMR: Final selection - {len(selected)} unique episodes from {len(candidates)} candidates")
+    
+    return selected
 
 
 def retrieve_chunks(db: Session, query_embedding: list[float], diversity_lambda: float = None):
@@ -35,89 +317,33 @@ def retrieve_chunks(db: Session, query_embedding: list[float], diversity_lambda:
                          0.7 = 70% relevance, 30% diversity
     
     Returns:
-        List of (chunk, similarity) tuples with diverse episodes
+        List of (RetrievedChunk, similarity) tuples with diverse episodes.
+        Each record carries its episode metadata as ``chunk.episode``.
+    """
+    return retrieve_chunks_multi(db, [query_embedding], diversity_lambda)[0]
+
+
+def retrieve_chunks_multi(db: Session, query_embeddings: list[list[float]], diversity_lambda: float = None):
+    """
+    Retrieve MMR-diversified chunks for several query vectors in one DB round trip.
+
+    Used to fetch the original and low-match rewrite queries together so the
+    confidence comparison happens on results already in memory.
+
+    Returns:
+        One list of (RetrievedChunk, similarity) tuples per query embedding,
+        in the same order as ``query_embeddings``.
     """
     # Use config value if not specified
     if diversity_lambda is None:
         diversity_lambda = settings.diversity_lambda
     # Get more candidates to allow for diversity selection
     # 5x gives us 30 candidates for 6 final results
-    distance = Chunk.embedding.cosine_distance(query_embedding)
-    stmt = (
-        select(Chunk, distance.label("distance"))
-        .order_by(distance.asc())
-        .limit(settings.top_k * 5)  # Increased from 3x to 5x for more diversity
-    )
-    results = db.execute(stmt).all()
-    
-    # Convert to (chunk, similarity) and filter by threshold
-    candidates = []
-    for chunk, dist in results:
-        similarity = 1 - float(dist)
-        if similarity >= settings.min_similarity:
-            candidates.append((chunk, similarity))
-    
-    if not candidates:
-        logger.warning("No chunks found above similarity threshold")
-        return []
-    
-    # MMR Algorithm: Balance relevance and diversity
-    selected = []
-    seen_episodes = set()
-    
-    # Always pick the most relevant chunk first
-    best_chunk, best_similarity = candidates[0]
-    selected.append((best_chunk, best_similarity))
-    seen_episodes.add(best_chunk.episode_id)
-    
-    logger.info(f"MMR: Selected most relevant - Episode {best_chunk.episode_id} (similarity: {best_similarity:.3f})")
-    
-    # For remaining slots, balance relevance with diversity
-    while len(selected) < settings.top_k:
-        best_mmr_score = -1
-        best_candidate = None
-        best_candidate_similarity = 0
-        
-        for chunk, similarity in candidates:
-            # Skip if already from a selected episode
-            if chunk.episode_id in seen_episodes:
-                continue
-            
-            # Real MMR diversity: penalise candidates that are semantically
-            # close to any already-selected chunk (not just a different episode).
-            # diversity_score = 1 - max_cosine_similarity_to_selected_chunks
-            max_sim_to_selected = max(
-                _cosine_sim(chunk.embedding, sel_chunk.embedding)
-                for sel_chunk, _ in selected
-            )
-            diversity_score = 1.0 - max_sim_to_selected
-            
-            # MMR score combines relevance and diversity
-            # Higher lambda = more weight on relevance
-            # Lower lambda = more weight on diversity
-            mmr_score = (diversity_lambda * similarity) + ((1 - diversity_lambda) * diversity_score)
-            
-            if mmr_score > best_mmr_score:
-                best_mmr_score = mmr_score
-                best_candidate = (chunk, similarity)
-                best_candidate_similarity = similarity
-        
-        # If we found a good diverse candidate, add it
-        if best_candidate:
-            selected.append(best_candidate)
-            seen_episodes.add(best_candidate[0].episode_id)
-            logger.info(f"MMR: Selected diverse - Episode {best_candidate[0].episode_id} "
-                       f"(similarity: {best_candidate_similarity:.3f}, MMR score: {best_mmr_score:.3f})")
-        else:
-            # No more candidates available
-            logger.info(f"MMR: Stopped at {len(selected)} results (no more diverse candidates)")
-            break
-    
-    logger.info(f"MMR: Final selection - {len(selected)} unique episodes from {len(candidates)} candidates")
-    
-    return selected
+    results_per_query = _search_candidates(db, query_embeddings, settings.top_k * 5)  # Increased from 3x to 5x for more diversity
+    return [_select_diverse(results, diversity_lambda) for results in results_per_query]
 
 
 def load_episode_map(db: Session, episode_ids: list[int]):
+    """Load full Episode rows by id (scripts/tools; the QA path uses episode_map_from_chunks)."""
     rows = db.execute(select(Episode).where(Episode.id.in_(episode_ids))).scalars().all()
     return {row.id: row for row in rows}
@@ -0,0 +1,89 @@
+"""
+Background refresh of stale answer-cache entries (stale-while-revalidate).
+
+When AnswerCache serves an answer past its TTL (see
+``cache_stale_ttl_seconds``) it calls ``schedule_stale_refresh`` once per
+question; the cache's per-question refresh lock stops later stale hits from
+scheduling it again. The refresh regenerates the answer through the normal
+pipeline with ``bypass_cache=True``, whose final ``cache.put`` replaces the
+stale entry, and then releases the lock.
+
+Refreshes run on a small process-wide pool. At most
+``MAX_PENDING_REFRESHES`` may be queued; beyond that a stale hit is just
+served, and a later hit retries once the queue drains.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MAX_PENDING_REFRESHES = 16
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats = {"scheduled": 0, "dropped": 0, "completed": 0, "failed": 0, "pending": 0, "refresh_ms": 0}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.cache_refresh_workers),
+                    thread_name_prefix="cache-refresh",
+                )
+    return _executor
+
+
+def schedule_stale_refresh(question_key: str, question: str) -> None:
+    """Queue a regeneration of ``question`` (cached under ``question_key``)."""
+    from app.qa.cache import get_answer_cache
+
+    with _stats_lock:
+        if _stats["pending"] >= MAX_PENDING_REFRESHES:
+            _stats["dropped"] += 1
+            dropped = True
+        else:
+            _stats["pending"] += 1
+            _stats["scheduled"] += 1
+            dropped = False
+    if dropped:
+        get_answer_cache().refresh_done(question_key)
+        return
+    _get_executor().submit(_refresh, question_key, question)
+
+
+def _refresh(question_key: str, question: str) -> None:
+    from app.core.db import get_session_local, safe_close_session
+    from app.qa.cache import INTERNAL_USER_IP, get_answer_cache
+    from app.qa.service import answer_question
+
+    started = time.perf_counter()
+    outcome = "completed"
+    db = None
+    try:
+        db = get_session_local()()
+        answer_question(db, question, user_ip=INTERNAL_USER_IP, log_interaction=False, bypass_cache=True)
+        logger.info("Cache REFRESH: regenerated stale answer for '%.60s'", question)
+    except Exception as exc:  # noqa: BLE001
+        outcome = "failed"
+        logger.warning("Cache REFRESH failed for '%.60s': %s", question, exc)
+    finally:
+        safe_close_session(db, context="cache_stale_refresh")
+        get_answer_cache().refresh_done(question_key)
+        with _stats_lock:
+            _stats["pending"] -= 1
+            _stats[outcome] += 1
+            _stats["refresh_ms"] += int((time.perf_counter() - started) * 1000)
+
+
+def get_stale_refresh_stats() -> dict:
+    with _stats_lock:
+        return dict(_stats)
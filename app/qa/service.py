@@ -1,28 +1,52 @@
 import gc
 import time
 import logging
-import concurrent.futures
+import contextlib
 from sqlalchemy.orm import Session
 
 from app.indexing.embeddings import embed_text
-from app.qa.retrieval import retrieve_chunks, load_episode_map
+from app.qa.retrieval import RetrievalResult, retrieve_chunks, retrieve_chunks_multi
 from app.qa.smart_citations import (
     retrieve_chunks_two_tier,
+    retrieve_chunks_two_tier_multi,
     select_citation_segments,
 )
-from app.qa.answer import compose_answer, sanitize_shareable_headline
-from app.qa.cache import get_answer_cache, normalize_question, _is_incomplete_answer
+from app.qa.answer import compose_answer_steps, run_answer_steps, sanitize_shareable_headline
+from app.qa.cache import CACHE_PUT_SKIPPED, get_answer_cache, normalize_question, _is_incomplete_answer
 from app.storage.repository import log_qa
 
 # Quality and reliability imports
 from app.qa.quality import validate_answer_quality, should_retry_generation
 from app.qa.resilience import CircuitBreakerOpenError, is_transient_error
 from app.qa.preprocessing import preprocess_query, optimize_for_retrieval, build_low_match_rewrite
+from app.qa.speculative import get_low_match_predictor, start_speculative_rewrite, record_missed_rewrite
 from app.qa.citation_validation import ensure_citation_quality
+from app.qa.singleflight import FlightIdle, get_singleflight
+from app.qa import metadata_pool
+from app.core import metrics, openai_clients
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+ANSWER_REQUESTS = metrics.counter(
+    "answer_requests_total",
+    "Answered questions by flow (ask, stream) and source "
+    "(exact_cache, canonical_cache, similarity_cache, coalesced, generated)",
+    ("flow", "source"),
+)
+CACHE_REJECTED = metrics.counter(
+    "answer_cache_rejected_total", "Cache hits ignored because the cached answer was degraded", ("method",)
+)
+ANSWER_METADATA = metrics.counter(
+    "answer_metadata_total",
+    "Follow-up questions and headlines of generated answers by field and source "
+    "(structured: returned by the answer call, separate: its own OpenAI call, shed: local fallback under load)",
+    ("field", "source"),
+)
+
+_METADATA_LOG_LABELS = {"follow_up_questions": "Follow-up", "shareable_headline": "Headline"}
+_METADATA_POOL_TASKS = {"follow_up_questions": metadata_pool.FOLLOW_UPS, "shareable_headline": metadata_pool.HEADLINE}
+
 
 def _looks_like_basic_fallback_answer(answer: str) -> bool:
     text = (answer or "").strip().lower()
@@ -68,9 +92,64 @@ def _log_phase_timings(flow: str, question: str, timings_ms: dict[str, int], ext
     }
     if extra:
         payload.update(extra)
+    # OpenAI connection setup paid (and saved by keep-alive) during this request
+    payload.update(openai_clients.connection_timings())
     logger.info("QA phase timings: %s", payload)
 
 
+def _start_answer_metadata(question: str, answer: str, chunks: list[dict], ready: dict, flow: str):
+    """
+    Start follow-up and headline generation for a fresh answer; returns a function collecting both.
+
+    Fields the structured answer call already produced (``ready``) are used
+    as they are. The others run as separate OpenAI calls on the shared
+    metadata pool so they overlap citation selection and logging; if the
+    pool sheds them under load, local fallbacks are used instead.
+    """
+    from app.qa.answer import (
+        _fallback_follow_up_questions,
+        _fallback_shareable_headline,
+        generate_follow_up_questions,
+        generate_shareable_headline,
+    )
+
+    generators = {
+        "follow_up_questions": generate_follow_up_questions,
+        "shareable_headline": generate_shareable_headline,
+    }
+    fallbacks = {
+        "follow_up_questions": lambda: _fallback_follow_up_questions(question, chunks),
+        "shareable_headline": lambda: _fallback_shareable_headline(question, answer),
+    }
+    metadata = {}
+    futures = {}
+    for field, generate in generators.items():
+        if ready.get(field):
+            metadata[field] = ready[field]
+            source = "structured"
+        else:
+            future = metadata_pool.submit(_METADATA_POOL_TASKS[field], generate, question, answer, chunks)
+            if future is None:
+                metadata[field] = fallbacks[field]()
+                source = "shed"
+            else:
+                futures[field] = future
+                source = "separate"
+        ANSWER_METADATA.inc(field=field, source=source)
+
+    def collect() -> dict:
+        for field, future in futures.items():
+            try:
+                metadata[field] = future.result(timeout=15)
+            except Exception as exc:
+                future.cancel()  # frees its queue slot if it never started
+                logger.warning("%s generation failed in %s: %s", _METADATA_LOG_LABELS[field], flow, exc)
+                metadata[field] = [] if field == "follow_up_questions" else ""
+        return metadata
+
+    return collect
+
+
 def _retrieval_confidence(payloads: list[dict]) -> float:
     """Estimate retrieval confidence from top chunk similarities."""
     if not payloads:
@@ -93,6 +172,100 @@ def _should_retry_retrieval_with_rewrite(payloads: list[dict]) -> bool:
     )
 
 
+def _low_match_rewrite_query(processed_query, retrieval_query: str) -> str | None:
+    """Second-pass retrieval query for weak matches, or None if it adds nothing."""
+    rewritten_query = build_low_match_rewrite(processed_query)
+    if rewritten_query and rewritten_query.lower() != retrieval_query.lower():
+        return rewritten_query
+    return None
+
+
+def _batched_rewrite_embedding(rewritten_query: str | None):
+    """
+    In batched mode, embed the low-match rewrite so it is searched together with the original query.
+
+    Called only once the answer cache has missed and this request is going
+    to retrieve, so cache hits and single-flight followers never pay for
+    it. In the other modes the rewrite is embedded on demand (None).
+    """
+    if rewritten_query and settings.low_match_rewrite_mode == "batched":
+        return embed_text(rewritten_query)
+    return None
+
+
+def _start_speculative_rewrite(processed_query, norm_q: str, rewritten_query: str | None, two_tier: bool):
+    """In speculative mode, start the rewrite retrieval now if the question is predicted to be low-match."""
+    if not rewritten_query or settings.low_match_rewrite_mode != "speculative":
+        return None
+    if not get_low_match_predictor().predict(processed_query, norm_q):
+        return None
+    logger.info("Starting speculative low-match rewrite for question='%.80s'", norm_q)
+    return start_speculative_rewrite(rewritten_query, two_tier=two_tier)
+
+
+def _settle_speculative_rewrite(speculative_rewrite, processed_query, norm_q: str, rewritten_query: str | None, weak_primary: bool):
+    """Feed the primary outcome back to the predictor and cancel speculation that isn't needed."""
+    if not rewritten_query or settings.low_match_rewrite_mode != "speculative":
+        return
+    get_low_match_predictor().record(processed_query, norm_q, needed_rewrite=weak_primary)
+    if speculative_rewrite is None:
+        if weak_primary:
+            record_missed_rewrite()
+    elif not weak_primary:
+        speculative_rewrite.cancel()
+
+
+def _retrieve_for_answer(
+    db: Session,
+    *,
+    question: str,
+    norm_q: str,
+    processed_query,
+    retrieval_query: str,
+    rewritten_query: str | None,
+    query_embedding: list[float],
+    rewrite_embedding: list[float] | None,
+    speculative_rewrite,
+    two_tier: bool,
+) -> tuple[RetrievalResult, bool, str]:
+    """
+    Retrieve payloads for answer generation (and, with ``two_tier``, citations),
+    retrying with the low-match rewrite when the first pass is weak.
+
+    Shared by the stream and non-stream flows. Returns
+    (result, rewrite_applied, retrieval_query_used).
+    """
+    if two_tier:
+        retrieve_one, retrieve_many, build = (
+            retrieve_chunks_two_tier, retrieve_chunks_two_tier_multi, RetrievalResult.from_two_tier
+        )
+    else:
+        retrieve_one, retrieve_many, build = retrieve_chunks, retrieve_chunks_multi, RetrievalResult.from_chunks
+
+    if rewrite_embedding is not None:
+        retrieved, rewritten_retrieved = retrieve_many(db, [query_embedding, rewrite_embedding])
+    else:
+        retrieved, rewritten_retrieved = retrieve_one(db, query_embedding), None
+    result = build(retrieved)
+
+    weak_primary = _should_retry_retrieval_with_rewrite(result.chunk_payloads)
+    _settle_speculative_rewrite(speculative_rewrite, processed_query, norm_q, rewritten_query, weak_primary)
+    if not (weak_primary and rewritten_query):
+        return result, False, retrieval_query
+    try:
+        if rewritten_retrieved is None and speculative_rewrite is not None:
+            rewritten_retrieved = speculative_rewrite.result()
+        if rewritten_retrieved is None:
+            rewritten_retrieved = retrieve_one(db, embed_text(rewritten_query))
+        rewritten = build(rewritten_retrieved, result.episode_payloads)
+        if _retrieval_confidence(rewritten.chunk_payloads) > _retrieval_confidence(result.chunk_payloads):
+            logger.info("Applied low-match retrieval rewrite for question='%.80s'", question)
+            return rewritten, True, rewritten_query
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Low-match rewrite retrieval failed; continuing with original retrieval: %s", exc)
+    return result, False, retrieval_query
+
+
 def _generate_answer_with_quality_checks(
     question: str,
     chunks: list[dict],
@@ -101,6 +274,9 @@ def _generate_answer_with_quality_checks(
 ) -> dict:
     """
     Generate answer with quality validation and retry logic.
+
+    A generator: the model calls are yielded as ``AnswerCall`` steps for
+    the caller to perform (``run_answer_steps`` or the async /ask driver).
     
     This wraps compose_answer with:
     - Quality scoring and validation
@@ -128,7 +304,7 @@ def _generate_answer_with_quality_checks(
             logger.info("Answer generation attempt %d/%d", attempt + 1, max_retries)
             
             # Generate answer (with circuit breaker protection handled by compose_answer)
-            response = compose_answer(
+            response = yield from compose_answer_steps(
                 question,
                 chunks,
                 citation_override=citation_override,
@@ -326,6 +502,17 @@ def _select_citations_with_fresh_session(
         safe_close_session(refine_db, context=context)
 
 
+def _join_in_flight_answer(norm_q: str, query_embedding: list[float], cleanup: contextlib.ExitStack, stream: bool = False):
+    """(flight, leading) for this question; a leader's flight is released when ``cleanup`` closes."""
+    if not settings.singleflight_enabled:
+        return None, True
+    flights = get_singleflight()
+    flight, leading = flights.join(norm_q, query_embedding, stream=stream)
+    if leading and flight is not None:
+        cleanup.callback(flights.release, flight)
+    return flight, leading
+
+
 def answer_question(
     db: Session,
     question: str,
@@ -341,7 +528,26 @@ def answer_question(
       Phase 1 — Retrieval (DB-heavy): session open
       Phase 2 — Answer generation (OpenAI): session CLOSED to avoid idle-in-transaction timeout
       Phase 3 — Logging: fresh session
+
+    Concurrent requests for the same question share one generation (see
+    app.qa.singleflight); ``cleanup`` closes the flight this request leads.
     """
+    with contextlib.ExitStack() as cleanup, openai_clients.track_connections():
+        return run_answer_steps(
+            _answer_question(db, question, user_ip, use_smart_citations, log_interaction, bypass_cache, cleanup)
+        )
+
+
+def _answer_question(
+    db: Session,
+    question: str,
+    user_ip: str,
+    use_smart_citations: bool,
+    log_interaction: bool,
+    bypass_cache: bool,
+    cleanup: contextlib.ExitStack,
+    generate_async: bool = False,
+):
     from app.core.db import safe_close_session
 
     start_time = time.time()
@@ -353,11 +559,12 @@ def answer_question(
     cache = get_answer_cache()
     norm_q = normalize_question(question)
     if not bypass_cache:
-        exact_cached_response = cache.get_exact(norm_q)
+        exact_cached_response = cache.get_exact(norm_q) or cache.get_canonical(norm_q)
         if exact_cached_response:
             exact_cached_response = _ensure_answer_status_fields(exact_cached_response)
             if _is_degraded_cached_answer(exact_cached_response):
                 logger.info("Ignoring degraded exact cache entry for '%.80s'; regenerating answer", question)
+                CACHE_REJECTED.inc(method=exact_cached_response.get("cache_match_type", "exact"))
             else:
                 latency_ms = int((time.time() - start_time) * 1000)
                 exact_citations = exact_cached_response.get("citations", [])
@@ -375,6 +582,7 @@ def answer_question(
                 exact_cached_response["latency_ms"] = latency_ms
                 exact_cached_response["qa_log_id"] = qa_log_id
                 exact_cached_response["question"] = question
+                ANSWER_REQUESTS.inc(flow="ask", source=f"{exact_cached_response.get('cache_match_type', 'exact')}_cache")
                 return exact_cached_response
 
     embed_started_at = time.perf_counter()
@@ -395,6 +603,12 @@ def answer_question(
     if retrieval_query != question:
         logger.info("Using expanded query for retrieval: '%s'", retrieval_query[:100])
     
+    # In batched mode the low-match rewrite is searched together with the
+    # original query after a cache miss, so a weak first pass costs no extra
+    # search. In speculative mode it only runs (in parallel) for predicted
+    # low-match questions.
+    rewritten_query = _low_match_rewrite_query(processed_query, retrieval_query)
+    speculative_rewrite = _start_speculative_rewrite(processed_query, norm_q, rewritten_query, two_tier=use_smart_citations)
     query_embedding = embed_text(retrieval_query)
     embed_ms = int((time.perf_counter() - embed_started_at) * 1000)
 
@@ -405,7 +619,10 @@ def answer_question(
             cached_response = _ensure_answer_status_fields(cached_response)
             if _is_degraded_cached_answer(cached_response):
                 logger.info("Ignoring degraded similarity cache entry for '%.80s'; regenerating answer", question)
+                CACHE_REJECTED.inc(method="similarity")
             else:
+                if speculative_rewrite is not None:
+                    speculative_rewrite.cancel()
                 latency_ms = int((time.time() - start_time) * 1000)
                 # Log the cached response too
                 cached_citations = cached_response.get("citations", [])
@@ -423,171 +640,66 @@ def answer_question(
                 cached_response["latency_ms"] = latency_ms
                 cached_response["qa_log_id"] = qa_log_id
                 cached_response["question"] = question
+                ANSWER_REQUESTS.inc(flow="ask", source="similarity_cache")
                 return cached_response
 
+    # ── Single-flight: share an identical question's in-flight generation ──
+    flight, leading = (
+        _join_in_flight_answer(norm_q, query_embedding, cleanup)
+        if use_smart_citations and not bypass_cache
+        else (None, True)
+    )
+    if not leading:
+        safe_close_session(db, context="qa_coalesced_wait")
+        if generate_async:
+            # The event loop awaits the leader (FlightIdle) instead of a thread blocking on it
+            shared_response = yield from get_singleflight().wait_idle(flight, settings.singleflight_wait_seconds)
+        else:
+            shared_response = get_singleflight().wait(flight, settings.singleflight_wait_seconds)
+        if shared_response is not None:
+            if speculative_rewrite is not None:
+                speculative_rewrite.cancel()
+            latency_ms = int((time.time() - start_time) * 1000)
+            shared_citations = shared_response.get("citations", [])
+            shared_response["qa_log_id"] = _log_qa_with_fresh_session(
+                question=question,
+                answer=shared_response["answer"],
+                episode_ids=[c["episode_id"] for c in shared_citations],
+                latency_ms=latency_ms,
+                user_ip=user_ip,
+                is_cached=True,
+                is_answered=len(shared_citations) > 0,
+                log_interaction=log_interaction,
+                context="qa_coalesced_logging",
+            )
+            shared_response["latency_ms"] = latency_ms
+            shared_response["question"] = question
+            shared_response["coalesced"] = True
+            ANSWER_REQUESTS.inc(flow="ask", source="coalesced")
+            return shared_response
+        logger.info("In-flight answer for '%.80s' was not shared; generating it here", question)
+        flight = None
+
+    rewrite_started_at = time.perf_counter()
+    rewrite_embedding = _batched_rewrite_embedding(rewritten_query)
+    embed_ms += int((time.perf_counter() - rewrite_started_at) * 1000)
+
     # ── Phase 1: DB-heavy retrieval — keep session open ──
     retrieval_started_at = time.perf_counter()
-    retrieval_rewrite_applied = False
-    retrieval_query_used = retrieval_query
-
-    if use_smart_citations:
-        retrieval_result = retrieve_chunks_two_tier(db, query_embedding)
-        answer_chunks = retrieval_result['answer_chunks']
-        citation_episodes = retrieval_result['citation_episodes']
-        
-        all_episode_ids = list({chunk.episode_id for chunk, _ in answer_chunks})
-        episode_map = load_episode_map(db, all_episode_ids)
-        
-        chunk_payloads = []
-        for chunk, similarity in answer_chunks:
-            episode = episode_map.get(chunk.episode_id)
-            if not episode:
-                continue
-            chunk_payloads.append({
-                "text": chunk.text,
-                "start_time": chunk.start_time,
-                "end_time": chunk.end_time,
-                "episode": {
-                    "id": episode.id,
-                    "title": episode.title,
-                    "audio_url": episode.audio_url or "",
-                    "published_year": episode.published_at.year if episode.published_at else None,
-                },
-                "similarity": similarity,
-            })
-        
-        citation_payloads = []
-        for cit in citation_episodes:
-            episode = episode_map.get(cit['episode_id'])
-            if not episode:
-                continue
-            citation_payloads.append({
-                "text": cit['chunk'].text,
-                "start_time": cit['chunk'].start_time,
-                "end_time": cit['chunk'].end_time,
-                "episode": {
-                    "id": episode.id,
-                    "title": episode.title,
-                    "audio_url": episode.audio_url or "",
-                },
-                "similarity": cit['similarity'],
-                "relevance_score": cit['relevance_score'],
-                "total_relevant_chunks": cit['total_relevant_chunks'],
-            })
-
-        if _should_retry_retrieval_with_rewrite(chunk_payloads):
-            rewritten_query = build_low_match_rewrite(processed_query)
-            if rewritten_query and rewritten_query.lower() != retrieval_query.lower():
-                try:
-                    rewrite_embedding = embed_text(rewritten_query)
-                    rewritten_result = retrieve_chunks_two_tier(db, rewrite_embedding)
-                    rewritten_answer_chunks = rewritten_result['answer_chunks']
-                    rewritten_citation_episodes = rewritten_result['citation_episodes']
-
-                    rewritten_episode_ids = list({chunk.episode_id for chunk, _ in rewritten_answer_chunks})
-                    rewritten_episode_map = load_episode_map(db, rewritten_episode_ids)
-
-                    rewritten_chunk_payloads = []
-                    for chunk, similarity in rewritten_answer_chunks:
-                        episode = rewritten_episode_map.get(chunk.episode_id)
-                        if not episode:
-                            continue
-                        rewritten_chunk_payloads.append({
-                            "text": chunk.text,
-                            "start_time": chunk.start_time,
-                            "end_time": chunk.end_time,
-                            "episode": {
-                                "id": episode.id,
-                                "title": episode.title,
-                                "audio_url": episode.audio_url or "",
-                                "published_year": episode.published_at.year if episode.published_at else None,
-                            },
-                            "similarity": similarity,
-                        })
-
-                    rewritten_citation_payloads = []
-                    for cit in rewritten_citation_episodes:
-                        episode = rewritten_episode_map.get(cit['episode_id'])
-                        if not episode:
-                            continue
-                        rewritten_citation_payloads.append({
-                            "text": cit['chunk'].text,
-                            "start_time": cit['chunk'].start_time,
-                            "end_time": cit['chunk'].end_time,
-                            "episode": {
-                                "id": episode.id,
-                                "title": episode.title,
-                                "audio_url": episode.audio_url or "",
-                            },
-                            "similarity": cit['similarity'],
-                            "relevance_score": cit['relevance_score'],
-                            "total_relevant_chunks": cit['total_relevant_chunks'],
-                        })
-
-                    if _retrieval_confidence(rewritten_chunk_payloads) > _retrieval_confidence(chunk_payloads):
-                        chunk_payloads = rewritten_chunk_payloads
-                        citation_payloads = rewritten_citation_payloads
-                        retrieval_rewrite_applied = True
-                        retrieval_query_used = rewritten_query
-                        logger.info("Applied low-match retrieval rewrite for question='%.80s'", question)
-                except Exception as exc:  # noqa: BLE001
-                    logger.warning("Low-match rewrite retrieval failed; continuing with original retrieval: %s", exc)
-    else:
-        retrieved = retrieve_chunks(db, query_embedding)
-        episode_ids = list({chunk.episode_id for chunk, _ in retrieved})
-        episode_map = load_episode_map(db, episode_ids)
-        
-        chunk_payloads = []
-        for chunk, similarity in retrieved:
-            episode = episode_map.get(chunk.episode_id)
-            if not episode:
-                continue
-            chunk_payloads.append({
-                "text": chunk.text,
-                "start_time": chunk.start_time,
-                "end_time": chunk.end_time,
-                "episode": {
-                    "id": episode.id,
-                    "title": episode.title,
-                    "audio_url": episode.audio_url or "",
-                },
-                "similarity": similarity,
-            })
-        citation_payloads = None
-
-        if _should_retry_retrieval_with_rewrite(chunk_payloads):
-            rewritten_query = build_low_match_rewrite(processed_query)
-            if rewritten_query and rewritten_query.lower() != retrieval_query.lower():
-                try:
-                    rewrite_embedding = embed_text(rewritten_query)
-                    rewritten_retrieved = retrieve_chunks(db, rewrite_embedding)
-                    rewritten_episode_ids = list({chunk.episode_id for chunk, _ in rewritten_retrieved})
-                    rewritten_episode_map = load_episode_map(db, rewritten_episode_ids)
-
-                    rewritten_chunk_payloads = []
-                    for chunk, similarity in rewritten_retrieved:
-                        episode = rewritten_episode_map.get(chunk.episode_id)
-                        if not episode:
-                            continue
-                        rewritten_chunk_payloads.append({
-                            "text": chunk.text,
-                            "start_time": chunk.start_time,
-                            "end_time": chunk.end_time,
-                            "episode": {
-                                "id": episode.id,
-                                "title": episode.title,
-                                "audio_url": episode.audio_url or "",
-                            },
-                            "similarity": similarity,
-                        })
-
-                    if _retrieval_confidence(rewritten_chunk_payloads) > _retrieval_confidence(chunk_payloads):
-                        chunk_payloads = rewritten_chunk_payloads
-                        retrieval_rewrite_applied = True
-                        retrieval_query_used = rewritten_query
-                        logger.info("Applied low-match retrieval rewrite for question='%.80s'", question)
-                except Exception as exc:  # noqa: BLE001
-                    logger.warning("Low-match rewrite retrieval failed; continuing with original retrieval: %s", exc)
+    retrieval, retrieval_rewrite_applied, retrieval_query_used = _retrieve_for_answer(
+        db,
+        question=question,
+        norm_q=norm_q,
+        processed_query=processed_query,
+        retrieval_query=retrieval_query,
+        rewritten_query=rewritten_query,
+        query_embedding=query_embedding,
+        rewrite_embedding=rewrite_embedding,
+        speculative_rewrite=speculative_rewrite,
+        two_tier=use_smart_citations,
+    )
+    chunk_payloads = retrieval.chunk_payloads
+    citation_payloads = retrieval.citation_payloads
     retrieval_ms = int((time.perf_counter() - retrieval_started_at) * 1000)
 
     # ── Release DB session before long OpenAI call ──
@@ -599,7 +711,7 @@ def answer_question(
     answer_started_at = time.perf_counter()
     
     # Use quality-checked answer generation with retries
-    response = _generate_answer_with_quality_checks(
+    response = yield from _generate_answer_with_quality_checks(
         question,
         chunk_payloads,
         citation_override=citation_payloads if use_smart_citations else None,
@@ -627,20 +739,14 @@ def answer_question(
 
     # Follow-up and headline generation are useful but not part of the core answer itself.
     # Run them in parallel with citation refinement and logging so the non-stream
-    # endpoint does not pay the full extra OpenAI roundtrip serially.
-    from app.qa.answer import generate_follow_up_questions, generate_shareable_headline
-    metadata_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
-    follow_up_future = metadata_executor.submit(
-        generate_follow_up_questions,
-        question,
-        response["answer"],
-        citation_payloads if citation_payloads is not None else chunk_payloads,
-    )
-    headline_future = metadata_executor.submit(
-        generate_shareable_headline,
+    # endpoint does not pay the full extra OpenAI roundtrip serially (or skip
+    # them when the structured answer call already returned them).
+    collect_metadata = _start_answer_metadata(
         question,
         response["answer"],
         citation_payloads if citation_payloads is not None else chunk_payloads,
+        response,
+        "non-stream flow",
     )
 
     citation_ms = 0
@@ -689,24 +795,14 @@ def answer_question(
             "citations": len(response["citations"]),
             "cached": False,
             "retrieval_rewrite_applied": retrieval_rewrite_applied,
+            "retrieval_rewrite_prefetched": rewrite_embedding is not None,
+            "retrieval_rewrite_speculative": speculative_rewrite is not None,
             "retrieval_query_used_preview": retrieval_query_used[:80],
         },
     )
 
     # Collect follow-up questions and shareable headline from parallel tasks
-    try:
-        response["follow_up_questions"] = follow_up_future.result(timeout=15)
-    except Exception as exc:
-        logger.warning("Follow-up generation failed in non-stream flow: %s", exc)
-        response["follow_up_questions"] = []
-    
-    try:
-        response["shareable_headline"] = headline_future.result(timeout=15)
-    except Exception as exc:
-        logger.warning("Headline generation failed in non-stream flow: %s", exc)
-        response["shareable_headline"] = ""
-    finally:
-        metadata_executor.shutdown(wait=False)
+    response.update(collect_metadata())
 
     # Cache this response for future similar questions
     result = {
@@ -725,11 +821,17 @@ def answer_question(
     
     if _is_degraded_cached_answer(result):
         logger.info("Skipping cache PUT for degraded answer to '%.80s'", question)
+        CACHE_PUT_SKIPPED.inc(reason="degraded")
     elif _is_incomplete_answer(result.get("answer", "")):
         logger.warning("Skipping cache PUT for incomplete answer to '%.80s' (answer ends: '...%.50s')",
                       question, result.get("answer", "")[-50:])
+        CACHE_PUT_SKIPPED.inc(reason="incomplete")
     else:
         cache.put(norm_q, query_embedding, result)
+    if flight is not None:
+        get_singleflight().complete(flight, result)
+
+    ANSWER_REQUESTS.inc(flow="ask", source="generated")
 
     # Explicit garbage collection to free up memory
     gc.collect()
@@ -751,10 +853,170 @@ def answer_question_stream(
       - {"type": "citations", "citations": [...]} at the end
       - {"type": "follow_up", "questions": [...]} at the end
       - {"type": "done", "qa_log_id": ..., "latency_ms": ...} final event
+      - {"type": "restart"} discard the answer text received so far (a
+        coalesced leader failed part-way; this request answers it itself)
     
     DB session is used only for retrieval and logging — released before
     the long-running OpenAI streaming to prevent idle-in-transaction timeouts.
+
+    Concurrent requests for the same question (without conversation context)
+    share one generation: followers replay the leader's events, with SSE
+    comment heartbeats while they wait.
+    """
+    with contextlib.ExitStack() as cleanup:
+        yield from _answer_question_stream(db, question, user_ip, context, log_interaction, bypass_cache, cleanup)
+
+
+class _AnswerStream:
+    """Answer generation handed to ``answer_question_stream_async``'s event loop."""
+
+    __slots__ = ("question", "chunks", "context", "event", "metadata")
+
+    def __init__(self, question: str, chunks: list[dict], context: list[dict], event, metadata: dict | None):
+        self.question = question
+        self.chunks = chunks
+        self.context = context
+        self.event = event  # text chunk -> SSE event (published to followers)
+        self.metadata = metadata  # filled with the structured metadata trailer, if requested
+
+
+_STREAM_DONE = object()
+
+
+def _advance_stream(steps, value=None, error: Exception | None = None):
+    """Resume the sync stream pipeline; ``_STREAM_DONE`` once it has finished."""
+    try:
+        return steps.throw(error) if error is not None else steps.send(value)
+    except StopIteration:
+        return _STREAM_DONE
+
+
+def _answer_stream_steps(db, question, user_ip, context, log_interaction, bypass_cache):
+    with contextlib.ExitStack() as cleanup:
+        yield from _answer_question_stream(
+            db, question, user_ip, context, log_interaction, bypass_cache, cleanup, generate_async=True
+        )
+
+
+def _answer_steps(db, question, user_ip, use_smart_citations, log_interaction, bypass_cache):
+    with contextlib.ExitStack() as cleanup:
+        return (yield from _answer_question(
+            db, question, user_ip, use_smart_citations, log_interaction, bypass_cache, cleanup, generate_async=True
+        ))
+
+
+def _advance_answer(steps, value=None, error: Exception | None = None):
+    """Resume the sync /ask pipeline; (True, response) once it has finished, else (False, step)."""
+    try:
+        return False, steps.throw(error) if error is not None else steps.send(value)
+    except StopIteration as finished:
+        return True, finished.value
+
+
+async def answer_question_async(
+    db: Session,
+    question: str,
+    user_ip: str,
+    use_smart_citations: bool = True,
+    log_interaction: bool = True,
+    bypass_cache: bool = False,
+) -> dict:
     """
+    ``answer_question`` for async handlers.
+
+    Like ``answer_question_stream_async``, the blocking phases run step by
+    step on the /ask thread limiter, while the answer call is awaited on
+    ``AsyncOpenAI`` and single-flight waits on the event loop. A question
+    holds no thread while the model is writing.
+    """
+    import anyio
+    from app.core.concurrency import run_sync
+    from app.qa.answer import generate_answer_async
+
+    openai_clients.start_tracking_connections()
+    steps = _answer_steps(db, question, user_ip, use_smart_citations, log_interaction, bypass_cache)
+    value, error = None, None
+    finished = False
+    try:
+        while True:
+            finished, step = await run_sync(_advance_answer, steps, value, error)
+            value, error = None, None
+            if finished:
+                return step
+            if isinstance(step, FlightIdle):
+                await step.wait()
+                continue
+            try:
+                value = await generate_answer_async(step.question, step.chunks)
+            except Exception as exc:  # noqa: BLE001 - handed back to the step that asked
+                error = exc
+    finally:
+        if not finished:
+            # Closing runs the pipeline's cleanup (single-flight release), also on disconnect
+            with anyio.CancelScope(shield=True):
+                await run_sync(steps.close)
+
+
+async def answer_question_stream_async(
+    db: Session,
+    question: str,
+    user_ip: str,
+    context: list[dict] | None = None,
+    log_interaction: bool = True,
+    bypass_cache: bool = False,
+):
+    """
+    Async generator with the same SSE events as ``answer_question_stream``.
+
+    The blocking phases run step by step on the /ask thread limiter; the
+    answer itself streams from ``AsyncOpenAI`` on the event loop, so an
+    in-flight question holds no thread while the model is writing.
+    """
+    import anyio
+    from app.core.concurrency import run_sync
+    from app.qa.answer import generate_intelligent_answer_stream_async
+
+    openai_clients.start_tracking_connections()  # the pipeline's worker threads share this task's context
+    steps = _answer_stream_steps(db, question, user_ip, context, log_interaction, bypass_cache)
+    value, error = None, None
+    try:
+        while True:
+            step = await run_sync(_advance_stream, steps, value, error)
+            value, error = None, None
+            if step is _STREAM_DONE:
+                break
+            if isinstance(step, FlightIdle):
+                await step.wait()  # a follower waiting for its leader holds no thread
+                continue
+            if not isinstance(step, _AnswerStream):
+                yield step
+                continue
+            full_answer = ""
+            try:
+                async for text_chunk in generate_intelligent_answer_stream_async(
+                    step.question, step.chunks, context=step.context, metadata=step.metadata
+                ):
+                    full_answer += text_chunk
+                    yield step.event(text_chunk)
+                value = full_answer
+            except Exception as exc:  # noqa: BLE001 - the pipeline falls back to a degraded answer
+                error = exc
+    finally:
+        # Closing runs the pipeline's cleanup (single-flight release), also on disconnect
+        with anyio.CancelScope(shield=True):
+            await run_sync(steps.close)
+
+
+def _answer_question_stream(
+    db: Session,
+    question: str,
+    user_ip: str,
+    context: list[dict] | None,
+    log_interaction: bool,
+    bypass_cache: bool,
+    cleanup: contextlib.ExitStack,
+    generate_async: bool = False,
+):
     import json
     from app.core.db import safe_close_session
 
@@ -771,11 +1033,12 @@ def answer_question_stream(
     # Check cache first (normalize for better matching)
     cache = get_answer_cache()
     norm_q = normalize_question(question)
-    exact_cached_response = cache.get_exact(norm_q) if not bypass_cache else None
+    exact_cached_response = (cache.get_exact(norm_q) or cache.get_canonical(norm_q)) if not bypass_cache else None
     if exact_cached_response:
         exact_cached_response = _ensure_answer_status_fields(exact_cached_response)
         if _is_degraded_cached_answer(exact_cached_response):
             logger.info("Ignoring degraded stream exact cache entry for '%.80s'; regenerating answer", question)
+            CACHE_REJECTED.inc(method=exact_cached_response.get("cache_match_type", "exact"))
         else:
             latency_ms = int((time.time() - start_time) * 1000)
             _exact_citations = exact_cached_response.get("citations", [])
@@ -800,6 +1063,7 @@ def answer_question_stream(
             yield f"data: {json.dumps({'type': 'follow_up', 'questions': exact_cached_response.get('follow_up_questions', [])})}\n\n"
             yield f"data: {json.dumps({'type': 'headline', 'text': cached_headline})}\n\n"
             yield f"data: {json.dumps({'type': 'done', 'qa_log_id': qa_log_id, 'latency_ms': latency_ms, 'cached': True, 'answer_source': exact_cached_response.get('answer_source', 'openai'), 'answer_status': exact_cached_response.get('answer_status', 'generated'), 'fallback_reason': exact_cached_response.get('fallback_reason')})}\n\n"
+            ANSWER_REQUESTS.inc(flow="stream", source=f"{exact_cached_response.get('cache_match_type', 'exact')}_cache")
             return
 
     embed_started_at = time.perf_counter()
@@ -811,6 +1075,8 @@ def answer_question_stream(
     if processed_query.key_terms:
         logger.info("Stream query key terms: %s", processed_query.key_terms)
     
+    rewritten_query = _low_match_rewrite_query(processed_query, retrieval_query)
+    speculative_rewrite = _start_speculative_rewrite(processed_query, norm_q, rewritten_query, two_tier=True)
     query_embedding = embed_text(retrieval_query)
     embed_ms = int((time.perf_counter() - embed_started_at) * 1000)
 
@@ -819,7 +1085,10 @@ def answer_question_stream(
         cached_response = _ensure_answer_status_fields(cached_response)
         if _is_degraded_cached_answer(cached_response):
             logger.info("Ignoring degraded stream similarity cache entry for '%.80s'; regenerating answer", question)
+            CACHE_REJECTED.inc(method="similarity")
         else:
+            if speculative_rewrite is not None:
+                speculative_rewrite.cancel()
             latency_ms = int((time.time() - start_time) * 1000)
             _cached_citations = cached_response.get("citations", [])
             qa_log_id = _log_qa_with_fresh_session(
@@ -844,105 +1113,96 @@ def answer_question_stream(
             yield f"data: {json.dumps({'type': 'follow_up', 'questions': cached_response.get('follow_up_questions', [])})}\n\n"
             yield f"data: {json.dumps({'type': 'headline', 'text': cached_headline})}\n\n"
             yield f"data: {json.dumps({'type': 'done', 'qa_log_id': qa_log_id, 'latency_ms': latency_ms, 'cached': True, 'answer_source': cached_response.get('answer_source', 'openai'), 'answer_status': cached_response.get('answer_status', 'generated'), 'fallback_reason': cached_response.get('fallback_reason')})}\n\n"
+            ANSWER_REQUESTS.inc(flow="stream", source="similarity_cache")
             return
 
+    # ── Single-flight: replay an identical question's in-flight stream ──
+    flight, leading = (
+        _join_in_flight_answer(norm_q, query_embedding, cleanup, stream=True)
+        if not bypass_cache and not context
+        else (None, True)
+    )
+    if not leading:
+        safe_close_session(db, context="qa_stream_coalesced_wait")
+        replayed = 0
+        # On the async pipeline the event loop awaits quiet spells (FlightIdle)
+        following = get_singleflight().follow(
+            flight, settings.singleflight_wait_seconds, blocking=not generate_async
+        )
+        while True:
+            try:
+                event = next(following)
+            except StopIteration as finished:
+                shared_response = finished.value
+                break
+            if isinstance(event, FlightIdle):
+                yield event
+                continue
+            if event is None:
+                yield ": waiting for in-flight answer\n\n"
+                continue
+            replayed += 1
+            yield event
+        if shared_response is not None:
+            if speculative_rewrite is not None:
+                speculative_rewrite.cancel()
+            latency_ms = int((time.time() - start_time) * 1000)
+            shared_citations = shared_response.get("citations", [])
+            qa_log_id = _log_qa_with_fresh_session(
+                question=question,
+                answer=shared_response["answer"],
+                episode_ids=[c["episode_id"] for c in shared_citations],
+                latency_ms=latency_ms,
+                user_ip=user_ip,
+                is_cached=True,
+                is_answered=len(shared_citations) > 0,
+                log_interaction=log_interaction,
+                context="qa_stream_coalesced_logging",
+            )
+            if not replayed:
+                # The leader was a non-streaming request: send its answer whole
+                yield f"data: {json.dumps({'type': 'chunk', 'text': shared_response['answer']})}\n\n"
+                yield f"data: {json.dumps({'type': 'citations', 'citations': shared_citations})}\n\n"
+                yield f"data: {json.dumps({'type': 'follow_up', 'questions': shared_response.get('follow_up_questions', [])})}\n\n"
+                yield f"data: {json.dumps({'type': 'headline', 'text': shared_response.get('shareable_headline', '')})}\n\n"
+            yield f"data: {json.dumps({'type': 'done', 'qa_log_id': qa_log_id, 'latency_ms': latency_ms, 'coalesced': True, 'answer_source': shared_response.get('answer_source', 'openai'), 'answer_status': shared_response.get('answer_status', 'generated'), 'fallback_reason': shared_response.get('fallback_reason')})}\n\n"
+            ANSWER_REQUESTS.inc(flow="stream", source="coalesced")
+            return
+        if replayed:
+            # The leader stopped part-way through its answer: the client drops what it has so far
+            yield f"data: {json.dumps({'type': 'restart'})}\n\n"
+        logger.info("In-flight stream for '%.80s' was not shared; generating it here", question)
+        flight = None
+
+    def _fan_out(event: str) -> str:
+        """Publish a content event to requests following this one."""
+        if flight is not None:
+            get_singleflight().publish(flight, event)
+        return event
+
+    def _chunk_event(text_chunk: str) -> str:
+        return _fan_out(f"data: {json.dumps({'type': 'chunk', 'text': text_chunk})}\n\n")
+
+    rewrite_started_at = time.perf_counter()
+    rewrite_embedding = _batched_rewrite_embedding(rewritten_query)
+    embed_ms += int((time.perf_counter() - rewrite_started_at) * 1000)
+
     # ── Phase 1: DB-heavy work (retrieval) — keep session open ──
     retrieval_started_at = time.perf_counter()
-    retrieval_rewrite_applied = False
-    retrieval_query_used = retrieval_query
-    retrieval_result = retrieve_chunks_two_tier(db, query_embedding)
-    answer_chunks = retrieval_result['answer_chunks']
-    citation_episodes = retrieval_result['citation_episodes']
-
-    all_episode_ids = list({chunk.episode_id for chunk, _ in answer_chunks})
-    episode_map = load_episode_map(db, all_episode_ids)
-
-    chunk_payloads = []
-    for chunk, similarity in answer_chunks:
-        episode = episode_map.get(chunk.episode_id)
-        if not episode:
-            continue
-        chunk_payloads.append({
-            "text": chunk.text,
-            "start_time": chunk.start_time,
-            "end_time": chunk.end_time,
-            "episode": {
-                "id": episode.id,
-                "title": episode.title,
-                "audio_url": episode.audio_url or "",
-                "published_year": episode.published_at.year if episode.published_at else None,
-            },
-            "similarity": similarity,
-        })
-
-    citation_payloads = []
-    for cit in citation_episodes:
-        episode = episode_map.get(cit['episode_id'])
-        if not episode:
-            continue
-        citation_payloads.append({
-            "text": cit['chunk'].text,
-            "start_time": cit['chunk'].start_time,
-            "end_time": cit['chunk'].end_time,
-            "episode": {"id": episode.id, "title": episode.title, "audio_url": episode.audio_url or "", "published_year": episode.published_at.year if episode.published_at else None},
-            "similarity": cit['similarity'],
-            "relevance_score": cit['relevance_score'],
-            "total_relevant_chunks": cit['total_relevant_chunks'],
-        })
-
-    if _should_retry_retrieval_with_rewrite(chunk_payloads):
-        rewritten_query = build_low_match_rewrite(processed_query)
-        if rewritten_query and rewritten_query.lower() != retrieval_query.lower():
-            try:
-                rewrite_embedding = embed_text(rewritten_query)
-                rewritten_result = retrieve_chunks_two_tier(db, rewrite_embedding)
-                rewritten_answer_chunks = rewritten_result['answer_chunks']
-                rewritten_citation_episodes = rewritten_result['citation_episodes']
-
-                rewritten_episode_ids = list({chunk.episode_id for chunk, _ in rewritten_answer_chunks})
-                rewritten_episode_map = load_episode_map(db, rewritten_episode_ids)
-
-                rewritten_chunk_payloads = []
-                for chunk, similarity in rewritten_answer_chunks:
-                    episode = rewritten_episode_map.get(chunk.episode_id)
-                    if not episode:
-                        continue
-                    rewritten_chunk_payloads.append({
-                        "text": chunk.text,
-                        "start_time": chunk.start_time,
-                        "end_time": chunk.end_time,
-                        "episode": {
-                            "id": episode.id,
-                            "title": episode.title,
-                            "audio_url": episode.audio_url or "",
-                            "published_year": episode.published_at.year if episode.published_at else None,
-                        },
-                        "similarity": similarity,
-                    })
-
-                rewritten_citation_payloads = []
-                for cit in rewritten_citation_episodes:
-                    episode = rewritten_episode_map.get(cit['episode_id'])
-                    if not episode:
-                        continue
-                    rewritten_citation_payloads.append({
-                        "text": cit['chunk'].text,
-                        "start_time": cit['chunk'].start_time,
-                        "end_time": cit['chunk'].end_time,
-                        "episode": {"id": episode.id, "title": episode.title, "audio_url": episode.audio_url or "", "published_year": episode.published_at.year if episode.published_at else None},
-                        "similarity": cit['similarity'],
-                        "relevance_score": cit['relevance_score'],
-                        "total_relevant_chunks": cit['total_relevant_chunks'],
-                    })
-
-                if _retrieval_confidence(rewritten_chunk_payloads) > _retrieval_confidence(chunk_payloads):
-                    chunk_payloads = rewritten_chunk_payloads
-                    citation_payloads = rewritten_citation_payloads
-                    retrieval_rewrite_applied = True
-                    retrieval_query_used = rewritten_query
-                    logger.info("Applied low-match retrieval rewrite for stream question='%.80s'", question)
-            except Exception as exc:  # noqa: BLE001
-                logger.warning("Low-match stream rewrite retrieval failed; continuing with original retrieval: %s", exc)
+    retrieval, retrieval_rewrite_applied, retrieval_query_used = _retrieve_for_answer(
+        db,
+        question=question,
+        norm_q=norm_q,
+        processed_query=processed_query,
+        retrieval_query=retrieval_query,
+        rewritten_query=rewritten_query,
+        query_embedding=query_embedding,
+        rewrite_embedding=rewrite_embedding,
+        speculative_rewrite=speculative_rewrite,
+        two_tier=True,
+    )
+    chunk_payloads = retrieval.chunk_payloads
+    citation_payloads = retrieval.citation_payloads
     retrieval_ms = int((time.perf_counter() - retrieval_started_at) * 1000)
 
     # ── Release the original DB session before the long streaming phase ──
@@ -952,6 +1212,8 @@ def answer_question_stream(
     # ── Phase 2: OpenAI streaming — no DB needed ──
     from app.qa.answer import generate_intelligent_answer_stream, _generate_degraded_answer
     full_answer = ""
+    # Structured mode: the model appends follow-ups and a headline after the answer
+    answer_metadata = {} if settings.answer_structured_generation else None
     answer_source = "openai"
     answer_status = "generated"
     fallback_reason = None
@@ -959,26 +1221,31 @@ def answer_question_stream(
     stream_answer_started_at = time.perf_counter()
     if settings.answer_generation_provider == "openai":
         try:
-            for text_chunk in generate_intelligent_answer_stream(question, ranked[:6], context=context or []):
-                full_answer += text_chunk
-                yield f"data: {json.dumps({'type': 'chunk', 'text': text_chunk})}\n\n"
+            if generate_async:
+                full_answer = yield _AnswerStream(question, ranked[:6], context or [], _chunk_event, answer_metadata)
+            else:
+                for text_chunk in generate_intelligent_answer_stream(
+                    question, ranked[:6], context=context or [], metadata=answer_metadata
+                ):
+                    full_answer += text_chunk
+                    yield _chunk_event(text_chunk)
         except Exception as e:
             logger.error("Streaming answer generation failed: %s", e, exc_info=True)
             full_answer = _generate_degraded_answer(question)
             answer_source = "basic_fallback"
             answer_status = "generation_failed"
             fallback_reason = type(e).__name__
-            yield f"data: {json.dumps({'type': 'chunk', 'text': full_answer})}\n\n"
+            yield _fan_out(f"data: {json.dumps({'type': 'chunk', 'text': full_answer})}\n\n")
     else:
         full_answer = _generate_degraded_answer(question)
         answer_source = "basic_fallback"
         answer_status = "generation_failed"
         fallback_reason = "provider_disabled"
-        yield f"data: {json.dumps({'type': 'chunk', 'text': full_answer})}\n\n"
+        yield _fan_out(f"data: {json.dumps({'type': 'chunk', 'text': full_answer})}\n\n")
     answer_ms = int((time.perf_counter() - stream_answer_started_at) * 1000)
 
     # ── Send citations immediately — no extra latency ──
-    from app.qa.answer import _build_citations, generate_follow_up_questions, generate_shareable_headline
+    from app.qa.answer import _build_citations, structured_answer_metadata
 
     citation_started_at = time.perf_counter()
     refined_citation_chunks = (
@@ -996,17 +1263,18 @@ def answer_question_stream(
     # ── Start follow-up and headline generation in background threads ──
     # These run concurrently while we yield citations and log to the DB,
     # saving ~1–3 s that would otherwise be blocking OpenAI calls after
-    # the user has already seen the full answer and citations.
+    # the user has already seen the full answer and citations. Whatever the
+    # structured answer's metadata trailer provided needs no call at all.
     _follow_up_ctx = citation_payloads or chunk_payloads
-    _metadata_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
-    follow_up_future = _metadata_executor.submit(
-        generate_follow_up_questions, question, full_answer, _follow_up_ctx
-    )
-    headline_future = _metadata_executor.submit(
-        generate_shareable_headline, question, full_answer, _follow_up_ctx
+    collect_metadata = _start_answer_metadata(
+        question,
+        full_answer,
+        _follow_up_ctx,
+        structured_answer_metadata(full_answer, answer_metadata) if answer_source == "openai" else {},
+        "stream",
     )
 
-    yield f"data: {json.dumps({'type': 'citations', 'citations': citations})}\n\n"
+    yield _fan_out(f"data: {json.dumps({'type': 'citations', 'citations': citations})}\n\n")
 
     # ── Phase 3: Log result with a fresh DB session ──
     latency_ms = int((time.time() - start_time) * 1000)
@@ -1038,42 +1306,21 @@ def answer_question_stream(
             "citations": len(citations),
             "cached": False,
             "retrieval_rewrite_applied": retrieval_rewrite_applied,
+            "retrieval_rewrite_prefetched": rewrite_embedding is not None,
+            "retrieval_rewrite_speculative": speculative_rewrite is not None,
             "retrieval_query_used_preview": retrieval_query_used[:80],
         },
     )
 
     # ── Collect metadata (background threads should be done by now) ──
     # Important: Get headline BEFORE sending done event so frontend can use it immediately
-    try:
-        follow_ups = follow_up_future.result(timeout=15)
-    except Exception as e:
-        logger.warning("Follow-up generation failed in stream: %s", e)
-        follow_ups = []
-    
-    try:
-        shareable_headline = headline_future.result(timeout=15)
-    except Exception as e:
-        logger.warning("Headline generation failed in stream: %s", e)
-        shareable_headline = ""
-    finally:
-        _metadata_executor.shutdown(wait=False)
+    metadata = collect_metadata()
+    follow_ups = metadata["follow_up_questions"]
+    shareable_headline = metadata["shareable_headline"]
 
     # ── Send metadata before "done" so they're available for card generation ──
-    yield f"data: {json.dumps({'type': 'follow_up', 'questions': follow_ups})}\n\n"
-    yield f"data: {json.dumps({'type': 'headline', 'text': shareable_headline})}\n\n"
-
-    # ── Mark the answer complete AFTER metadata is ready ──
-    # This ensures the frontend has all data it needs for card generation
-    done_payload = {
-        "type": "done",
-        "qa_log_id": qa_log_id,
-        "latency_ms": latency_ms,
-        "answer_source": answer_source,
-        "answer_status": answer_status,
-    }
-    if fallback_reason:
-        done_payload["fallback_reason"] = fallback_reason
-    yield f"data: {json.dumps(done_payload)}\n\n"
+    yield _fan_out(f"data: {json.dumps({'type': 'follow_up', 'questions': follow_ups})}\n\n")
+    yield _fan_out(f"data: {json.dumps({'type': 'headline', 'text': shareable_headline})}\n\n")
 
     # Cache for next time (normalized question for better hit rate)
     cache_payload = {
@@ -1089,11 +1336,32 @@ def answer_question_stream(
     }
     if fallback_reason:
         cache_payload["fallback_reason"] = fallback_reason
+    # Every event is published by now; finish the followers before our own
+    # client can disconnect after "done"
+    if flight is not None:
+        get_singleflight().complete(flight, cache_payload)
+
+    # ── Mark the answer complete AFTER metadata is ready ──
+    # This ensures the frontend has all data it needs for card generation
+    done_payload = {
+        "type": "done",
+        "qa_log_id": qa_log_id,
+        "latency_ms": latency_ms,
+        "answer_source": answer_source,
+        "answer_status": answer_status,
+    }
+    if fallback_reason:
+        done_payload["fallback_reason"] = fallback_reason
+    yield f"data: {json.dumps(done_payload)}\n\n"
+    ANSWER_REQUESTS.inc(flow="stream", source="generated")
+
     if _is_degraded_cached_answer(cache_payload):
         logger.info("Skipping cache PUT for degraded streaming answer to '%.80s'", question)
+        CACHE_PUT_SKIPPED.inc(reason="degraded")
     elif _is_incomplete_answer(full_answer):
         logger.warning("Skipping cache PUT for incomplete streaming answer to '%.80s' (answer ends: '...%.50s')",
                       question, full_answer[-50:] if full_answer else "")
+        CACHE_PUT_SKIPPED.inc(reason="incomplete")
     else:
         cache.put(norm_q, query_embedding, cache_payload)
 
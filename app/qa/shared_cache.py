@@ -0,0 +1,290 @@
+"""
+Shared-memory answer cache tier for multi-worker deployments.
+
+With ``uvicorn --workers N`` every worker process has its own AnswerCache,
+so a hit in one worker is a miss in the next and each worker pays its own
+Redis warm load. SharedAnswerStore is a fixed-size, file-backed mmap (put it
+on /dev/shm) that every worker on the host maps:
+
+    header | slot table | embedding matrix | payload slots
+
+- header: magic, layout, and when the tier was last hydrated from Redis;
+- slot table: per slot a sequence counter, question key (first 8 bytes of
+  SHA-256), created_at, regeneration cost and payload length;
+- embedding matrix: one normalised float32 row per slot, scored with one
+  matvec per lookup (zero rows never match);
+- payload slots: the entry in the Redis binary format (see
+  ``app.qa.cache.encode_entry``), at most ``entry_bytes`` each.
+
+Writers serialise on ``flock`` of ``<path>.lock``. Readers take no lock:
+each slot has a seqlock counter (odd while a write is in progress). A reader
+re-checks the counter after copying the payload and re-scores the decoded
+embedding, so a torn read becomes a miss, never a wrong answer.
+
+When full, the oldest entry is overwritten. Each worker's AnswerCache keeps
+a small private L1 in front of this tier, and its own eviction policy
+governs that L1.
+
+Needs NumPy and POSIX ``fcntl``. ``open_shared_store`` returns None (and
+logs why) when either is missing or the file can't be mapped.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from contextlib import contextmanager
+
+from app.qa.cache import decode_entry
+
+logger = logging.getLogger(__name__)
+
+STORE_MAGIC = b"AMTS"
+STORE_VERSION = 1
+_HEADER = struct.Struct("<4sIIIIdQ")  # magic, version, capacity, dim, entry_bytes, hydrated_at, writes
+_HEADER_BYTES = 64
+_SLOT = struct.Struct("<QQddI4x")  # seq, key, created_at, cost, length
+_ALIGN = 64
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def question_key(question: str) -> int:
+    """Stable 64-bit key for a normalised question (never 0, which marks an empty slot)."""
+    return int.from_bytes(hashlib.sha256(question.encode("utf-8")).digest()[:8], "little") | 1
+
+
+class SharedAnswerStore:
+    def __init__(self, path: str, capacity: int, dim: int, entry_bytes: int):
+        import fcntl
+        import numpy as np
+
+        self._fcntl = fcntl
+        self._np = np
+        self.path = path
+        self.capacity = capacity
+        self.dim = dim
+        self.entry_bytes = entry_bytes
+        self._table_offset = _HEADER_BYTES
+        self._matrix_offset = _align(self._table_offset + capacity * _SLOT.size)
+        self._payload_offset = _align(self._matrix_offset + capacity * dim * 4)
+        self.size = self._payload_offset + capacity * entry_bytes
+        self._local_lock = threading.Lock()  # flock is per open file, not per thread
+        self.hits = 0
+        self.misses = 0
+        self.puts = 0
+        self.skipped_oversize = 0
+
+        self._lock_fd = os.open(f"{path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        with self._exclusive():
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            if not self._layout_matches(fd):
+                # Workers still mapping an old layout keep their (now unlinked)
+                # file; never truncate a file someone else may have mapped.
+                os.close(fd)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                fd = os.open(tmp_path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o600)
+                os.ftruncate(fd, self.size)
+                os.pwrite(fd, _HEADER.pack(STORE_MAGIC, STORE_VERSION, capacity, dim, entry_bytes, 0.0, 0), 0)
+                os.replace(tmp_path, path)
+            self._fd = fd
+            self._map()
+
+    # ── Layout ─────────────────────────────────────────────────────────────
+
+    def _layout_matches(self, fd: int) -> bool:
+        if os.fstat(fd).st_size != self.size:
+            return False
+        header = os.pread(fd, _HEADER.size, 0)
+        magic, version, capacity, dim, entry_bytes, _, _ = _HEADER.unpack(header)
+        return (magic, version, capacity, dim, entry_bytes) == (
+            STORE_MAGIC, STORE_VERSION, self.capacity, self.dim, self.entry_bytes
+        )
+
+    def _map(self) -> None:
+        np = self._np
+        self._mm = mmap.mmap(self._fd, self.size)
+        slot_dtype = np.dtype({
+            "names": ["seq", "key", "created_at", "cost", "length"],
+            "formats": ["<u8", "<u8", "<f8", "<f8", "<u4"],
+            "offsets": [0, 8, 16, 24, 32],
+            "itemsize": _SLOT.size,
+        })
+        self._table = np.frombuffer(self._mm, dtype=slot_dtype, count=self.capacity, offset=self._table_offset)
+        self._matrix = np.frombuffer(
+            self._mm, dtype="<f4", count=self.capacity * self.dim, offset=self._matrix_offset
+        ).reshape(self.capacity, self.dim)
+
+    @contextmanager
+    def _exclusive(self):
+        with self._local_lock:
+            self._fcntl.flock(self._lock_fd, self._fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                self._fcntl.flock(self._lock_fd, self._fcntl.LOCK_UN)
+
+    # ── Reads (lock-free) ──────────────────────────────────────────────────
+
+    def _read_slot(self, slot: int, min_created_at: float):
+        """Copy a slot's payload under its seqlock; None if empty, expired or torn."""
+        table = self._table
+        seq = int(table["seq"][slot])
+        if seq & 1:
+            return None
+        length = int(table["length"][slot])
+        created_at = float(table["created_at"][slot])
+        if not length or created_at <= min_created_at:
+            return None
+        start = self._payload_offset + slot * self.entry_bytes
+        raw = self._mm[start:start + length]
+        if int(table["seq"][slot]) != seq:
+            return None
+        try:
+            return decode_entry(raw)
+        except Exception:  # noqa: BLE001 - torn or foreign payload reads as a miss
+            return None
+
+    def get_exact(self, question: str, min_created_at: float):
+        np = self._np
+        for slot in np.flatnonzero(self._table["key"] == question_key(question)):
+            entry = self._read_slot(int(slot), min_created_at)
+            if entry is not None and entry.question == question:
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def get_similar(self, query, threshold: float, min_created_at: float):
+        """Best entry with cosine ≥ threshold against ``query`` (unit float32); (entry, score) or (None, 0)."""
+        np = self._np
+        if len(query) != self.dim:
+            return None, 0.0
+        scores = self._matrix @ query
+        table = self._table
+        # Only live rows compete, so an expired entry can't hide a fresh match
+        live = (table["length"] > 0) & (table["created_at"] > min_created_at) & ((table["seq"] & 1) == 0)
+        candidates = np.flatnonzero(live & (scores >= threshold))
+        for slot in candidates[np.argsort(-scores[candidates], kind="stable")]:
+            entry = self._read_slot(int(slot), min_created_at)
+            if entry is None:
+                continue  # torn by a concurrent write: try the next-best row
+            # Re-score the decoded copy: the matrix row may have changed mid-read
+            score = float(np.dot(entry.unit, query))
+            if score >= threshold:
+                self.hits += 1
+                return entry, score
+        self.misses += 1
+        return None, 0.0
+
+    # ── Writes (under flock) ───────────────────────────────────────────────
+
+    def _write_slot(self, slot: int, key: int, created_at: float, cost: float, unit, raw: bytes) -> None:
+        table = self._table
+        seq = int(table["seq"][slot])
+        table["seq"][slot] = seq + 1  # odd: write in progress
+        self._matrix[slot] = unit if unit is not None else 0.0
+        start = self._payload_offset + slot * self.entry_bytes
+        self._mm[start:start + len(raw)] = raw
+        table["key"][slot] = key
+        table["created_at"][slot] = created_at
+        table["cost"][slot] = cost
+        table["length"][slot] = len(raw)
+        table["seq"][slot] = seq + 2
+
+    def put(self, entry, raw: bytes) -> bool:
+        """Store ``entry`` (already encoded as ``raw``); False if it doesn't fit a slot."""
+        if len(raw) > self.entry_bytes:
+            self.skipped_oversize += 1
+            return False
+        if len(entry.unit) != self.dim:
+            return False
+        np = self._np
+        key = question_key(entry.question)
+        with self._exclusive():
+            table = self._table
+            same = np.flatnonzero(table["key"] == key)
+            if len(same):
+                slot = int(same[0])
+                if table["created_at"][slot] > entry.created_at:
+                    return True  # a newer answer is already shared
+            else:
+                empty = np.flatnonzero(table["key"] == 0)
+                slot = int(empty[0]) if len(empty) else int(np.argmin(table["created_at"]))
+            self._write_slot(slot, key, entry.created_at, entry.cost, entry.unit, raw)
+            self._bump_writes()
+        self.puts += 1
+        return True
+
+    def delete(self, question: str) -> bool:
+        np = self._np
+        with self._exclusive():
+            slots = np.flatnonzero(self._table["key"] == question_key(question))
+            for slot in slots:
+                self._write_slot(int(slot), 0, 0.0, 0.0, None, b"")
+            self._bump_writes()
+        return bool(len(slots))
+
+    def clear(self) -> None:
+        with self._exclusive():
+            for slot in self._np.flatnonzero(self._table["key"] != 0):
+                self._write_slot(int(slot), 0, 0.0, 0.0, None, b"")
+            self._set_hydrated_at(0.0)
+
+    def _bump_writes(self) -> None:
+        header = list(_HEADER.unpack_from(self._mm, 0))
+        header[6] += 1
+        _HEADER.pack_into(self._mm, 0, *header)
+
+    def _set_hydrated_at(self, value: float) -> None:
+        header = list(_HEADER.unpack_from(self._mm, 0))
+        header[5] = value
+        _HEADER.pack_into(self._mm, 0, *header)
+
+    def claim_hydration(self, max_age_seconds: float) -> bool:
+        """
+        True for the one worker that should load Redis into this tier.
+
+        Later workers (and restarts within ``max_age_seconds``) see the
+        recorded hydration time and skip their own Redis load.
+        """
+        with self._exclusive():
+            hydrated_at = _HEADER.unpack_from(self._mm, 0)[5]
+            now = time.time()
+            if hydrated_at and now - hydrated_at < max_age_seconds:
+                return False
+            self._set_hydrated_at(now)
+            return True
+
+    def free_slots(self) -> int:
+        return int((self._table["key"] == 0).sum())
+
+    def stats(self) -> dict:
+        return {
+            "path": self.path,
+            "capacity": self.capacity,
+            "entries": self.capacity - self.free_slots(),
+            "entry_bytes": self.entry_bytes,
+            "mapped_mb": round(self.size / 1024 / 1024, 1),
+            "writes": _HEADER.unpack_from(self._mm, 0)[6],
+            "hits": self.hits,
+            "misses": self.misses,
+            "puts": self.puts,
+            "skipped_oversize": self.skipped_oversize,
+        }
+
+
+def open_shared_store(path: str, capacity: int, dim: int, entry_bytes: int) -> SharedAnswerStore | None:
+    """Map (creating if needed) the shared tier at ``path``; None if it can't be used here."""
+    try:
+        return SharedAnswerStore(path, capacity, dim, entry_bytes)
+    except ImportError as exc:
+        logger.warning("Shared answer cache disabled (%s) — per-worker cache only", exc)
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Shared answer cache unavailable at %s (%s) — per-worker cache only", path, exc)
+    return None
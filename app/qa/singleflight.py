@@ -0,0 +1,304 @@
+"""
+Single-flight coalescing of concurrent identical questions.
+
+Right after a QOTD push (or an ``autoask`` deep link) many people ask the
+same question within seconds. The answer cache is only filled once the
+first generation finishes, so every one of those requests used to miss it
+and run its own retrieval and OpenAI generation.
+
+``SingleFlight`` lets the first request lead and the rest follow. A request
+joins an in-flight generation when its normalised question matches, or when
+its query embedding is within the cache similarity threshold of the
+leader's (the same test a cache hit would pass once the leader is done).
+Streaming followers replay the leader's SSE events as they are published;
+non-streaming followers wait for the final response. Each follower still
+logs its own interaction.
+
+If the leader fails or its client disconnects, the flight ends without a
+result and followers generate the answer themselves. A streaming follower
+that already replayed part of the leader's answer first sends a
+``restart`` event so its client discards the partial text.
+
+Followers on the async pipelines (``/ask`` and ``/ask/stream``) hold no
+thread while they wait: ``wait_idle`` and ``follow(..., blocking=False)``
+yield a ``FlightIdle``, which the event loop awaits (``FlightIdle.wait``)
+until the leader publishes, finishes or the wait times out. The sync
+pipelines (cache prewarm, revalidation, scripts) block on the flight's
+condition instead. At most ``max_waiters`` non-streaming followers wait at
+a time; the rest generate independently.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+
+import anyio
+
+from app.core import metrics, vectors
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEDUPLICATED = metrics.counter(
+    "answer_singleflight_deduplicated_total",
+    "Requests that joined an in-flight generation instead of starting one, by mode and match",
+    ("mode", "match"),
+)
+
+
+class _Flight:
+    __slots__ = ("key", "unit", "events", "result", "finished", "followers", "changed", "async_waiters")
+
+    def __init__(self, key: str, unit):
+        self.key = key
+        self.unit = unit
+        self.events: list[str] = []
+        self.result: dict | None = None
+        self.finished = False
+        self.followers = 0
+        self.changed = threading.Condition()
+        self.async_waiters: list[tuple[asyncio.AbstractEventLoop, anyio.Event]] = []
+
+    def notify(self) -> None:
+        """Wake every follower; call with ``changed`` held. Safe from any thread."""
+        self.changed.notify_all()
+        for loop, event in self.async_waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:  # that follower's event loop has closed
+                pass
+        self.async_waiters.clear()
+
+
+class FlightIdle:
+    """Yielded by ``SingleFlight.follow(..., blocking=False)`` while the leader has nothing new."""
+
+    __slots__ = ("flight", "seen", "timeout")
+
+    def __init__(self, flight: _Flight, seen: int, timeout: float):
+        self.flight = flight
+        self.seen = seen
+        self.timeout = timeout
+
+    async def wait(self) -> None:
+        """Wait, without holding a thread, for a new event, the flight to end, or ``timeout``."""
+        flight = self.flight
+        event = anyio.Event()
+        waiter = (asyncio.get_running_loop(), event)
+        with flight.changed:
+            if len(flight.events) > self.seen or flight.finished:
+                return
+            flight.async_waiters.append(waiter)
+        try:
+            with anyio.move_on_after(self.timeout):
+                await event.wait()
+        finally:
+            with flight.changed:
+                if waiter in flight.async_waiters:
+                    flight.async_waiters.remove(waiter)
+
+
+class SingleFlight:
+    """Coalesce concurrent generations of the same (or a near-identical) question."""
+
+    def __init__(self, similarity_threshold: float = 0.89, max_waiters: int = 16, poll_seconds: float = 1.0):
+        self.similarity_threshold = similarity_threshold
+        self.max_waiters = max(0, max_waiters)
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        self._waiting = 0
+        self.leaders = 0
+        self.followers = 0
+        self.followers_by_embedding = 0
+        self.stream_followers = 0
+        self.shared = 0
+        self.unshared = 0
+        self.over_capacity = 0
+        self.largest_flight = 0
+
+    def _similar(self, unit) -> _Flight | None:
+        best, best_score = None, self.similarity_threshold
+        for flight in self._flights.values():
+            score = vectors.dot(flight.unit, unit)
+            if score >= best_score:
+                best, best_score = flight, score
+        return best
+
+    def join(self, key: str, embedding: list[float], stream: bool = False) -> tuple[_Flight | None, bool]:
+        """
+        Join the in-flight generation for ``key`` / ``embedding``, or start one.
+
+        Returns ``(flight, True)`` for a new leader, which must call
+        ``release`` when it is done (and ``complete`` once its answer is
+        cached), and ``(flight, False)`` for a follower. ``(None, True)``
+        means generate without coalescing: too many followers are blocked.
+        """
+        unit = vectors.normalize(embedding)
+        with self._lock:
+            flight = self._flights.get(key)
+            by_embedding = flight is None
+            if flight is None:
+                flight = self._similar(unit)
+            if flight is None:
+                flight = self._flights[key] = _Flight(key, unit)
+                self.leaders += 1
+                return flight, True
+            if not stream and self._waiting >= self.max_waiters:
+                self.over_capacity += 1
+                return None, True
+            if not stream:
+                self._waiting += 1
+            flight.followers += 1
+            self.followers += 1
+            self.followers_by_embedding += by_embedding
+            self.stream_followers += stream
+            self.largest_flight = max(self.largest_flight, flight.followers + 1)
+        DEDUPLICATED.inc(mode="stream" if stream else "ask", match="embedding" if by_embedding else "question")
+        logger.info("Single-flight: '%.60s' joined the in-flight answer for '%.60s'", key, flight.key)
+        return flight, False
+
+    def publish(self, flight: _Flight, event: str) -> None:
+        """Fan one of the leader's stream events out to its followers."""
+        with flight.changed:
+            flight.events.append(event)
+            flight.notify()
+
+    def complete(self, flight: _Flight, result: dict) -> None:
+        """Hand the leader's final response to its followers and close the flight."""
+        self._finish(flight, result)
+
+    def release(self, flight: _Flight) -> None:
+        """Close the flight if ``complete`` never ran (the leader failed or was abandoned)."""
+        self._finish(flight, None)
+
+    def _finish(self, flight: _Flight, result: dict | None) -> None:
+        with self._lock:
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+        with flight.changed:
+            if flight.finished:
+                return
+            flight.result = result
+            flight.finished = True
+            flight.notify()
+        if result is None and flight.followers:
+            logger.warning("Single-flight: leader for '%.60s' ended without an answer; %d followers will generate",
+                           flight.key, flight.followers)
+
+    def _count(self, result: dict | None) -> None:
+        with self._lock:
+            if result is None:
+                self.unshared += 1
+            else:
+                self.shared += 1
+
+    def wait(self, flight: _Flight, timeout: float) -> dict | None:
+        """Block until the leader finishes; a copy of its response, or None to generate here."""
+        deadline = time.monotonic() + timeout
+        try:
+            with flight.changed:
+                while not flight.finished:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    flight.changed.wait(remaining)
+                result = flight.result
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        self._count(result)
+        return dict(result) if result is not None else None
+
+    def wait_idle(self, flight: _Flight, timeout: float):
+        """
+        ``wait`` for the async pipeline: a generator that never blocks.
+
+        It yields a ``FlightIdle`` for the caller to await until the leader
+        finishes or ``timeout`` passes, and returns what ``wait`` would.
+        """
+        deadline = time.monotonic() + timeout
+        result = None
+        try:
+            while True:
+                with flight.changed:
+                    finished, result, seen = flight.finished, flight.result, len(flight.events)
+                remaining = deadline - time.monotonic()
+                if finished or remaining <= 0:
+                    break
+                yield FlightIdle(flight, seen, remaining)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        self._count(result)
+        return dict(result) if result is not None else None
+
+    def follow(self, flight: _Flight, timeout: float, blocking: bool = True):
+        """
+        Yield the leader's stream events as they are published (None while idle).
+
+        With ``blocking=False`` the generator never waits itself: when there
+        is nothing new it yields a ``FlightIdle`` for the caller to await,
+        then None if that wait also brought nothing. The generator's return
+        value is a copy of the leader's final response, or None if it failed
+        or ``timeout`` passed first.
+        """
+        deadline = time.monotonic() + timeout
+        sent = 0
+        idled = False
+        while True:
+            with flight.changed:
+                if blocking and sent == len(flight.events) and not flight.finished:
+                    flight.changed.wait(max(0.0, min(self.poll_seconds, deadline - time.monotonic())))
+                pending = flight.events[sent:]
+                finished = flight.finished
+                result = flight.result
+            sent += len(pending)
+            if pending:
+                idled = False
+                yield from pending
+            elif finished:
+                break
+            elif time.monotonic() >= deadline:
+                result = None
+                break
+            elif not blocking and not idled:
+                idled = True
+                yield FlightIdle(flight, sent, max(0.0, min(self.poll_seconds, deadline - time.monotonic())))
+            else:
+                idled = False
+                yield None
+        self._count(result)
+        return dict(result) if result is not None else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "in_flight": len(self._flights),
+                "waiting": self._waiting,
+                "leaders": self.leaders,
+                "deduplicated": self.followers,
+                "deduplicated_by_embedding": self.followers_by_embedding,
+                "stream_followers": self.stream_followers,
+                "shared": self.shared,
+                "unshared": self.unshared,
+                "over_capacity": self.over_capacity,
+                "largest_flight": self.largest_flight,
+                "max_waiters": self.max_waiters,
+            }
+
+
+# Global singleton
+_singleflight: SingleFlight | None = None
+
+
+def get_singleflight() -> SingleFlight:
+    """Get the process-wide single-flight group for answer generation."""
+    global _singleflight
+    if _singleflight is None:
+        _singleflight = SingleFlight(
+            similarity_threshold=settings.cache_similarity_threshold,
+            max_waiters=settings.singleflight_max_waiters,
+        )
+    return _singleflight
@@ -1547,12 +1547,31 @@ def retrieve_chunks_two_tier(
     Returns:
         dict with 'answer_chunks' (all relevant) and 'citation_episodes' (top episodes)
     """
-    from app.qa.retrieval import retrieve_chunks
-    
+    return retrieve_chunks_two_tier_multi(db, [query_embedding], diversity_lambda)[0]
+
+
+def retrieve_chunks_two_tier_multi(
+    db: Session,
+    query_embeddings: list[list[float]],
+    diversity_lambda: float = None
+) -> list[dict]:
+    """
+    Two-tier retrieval for several query vectors with a single DB round trip.
+
+    Returns one ``retrieve_chunks_two_tier``-shaped dict per query embedding,
+    in the same order.
+    """
+    from app.qa.retrieval import retrieve_chunks_multi
+
     # Get diverse chunks for answer generation (uses MMR)
     # This ensures comprehensive coverage for the answer
-    answer_chunks = retrieve_chunks(db, query_embedding, diversity_lambda)
-    
+    return [
+        _two_tier_result(answer_chunks)
+        for answer_chunks in retrieve_chunks_multi(db, query_embeddings, diversity_lambda)
+    ]
+
+
+def _two_tier_result(answer_chunks: list[tuple]) -> dict:
     # Now select top episodes for citations based on pure relevance
     # We want the MOST relevant episodes, not necessarily diverse ones
     citation_episodes = select_top_episodes_for_citation(
@@ -0,0 +1,279 @@
+"""
+Speculative low-match rewrite retrieval.
+
+In ``low_match_rewrite_mode=speculative`` the rewrite query is not searched
+for every question (batched) or only after a weak first pass (sequential).
+Instead a cheap predictor scores each question from its ``ProcessedQuery``
+signals plus a learned history of questions that came back weak, and only
+predicted low-match questions get the rewrite embed + retrieval started in a
+background thread, in parallel with the primary retrieval.
+
+If the primary retrieval turns out strong the speculative work is cancelled
+(or, if it is already running, its result is discarded). Counters for saved
+versus wasted work are exposed via ``get_speculative_rewrite_stats``.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Per-term rewrite rates are only trusted after this many observations
+_MIN_TERM_OBSERVATIONS = 3
+
+
+class LowMatchPredictor:
+    """
+    Scores how likely a question is to need the low-match rewrite.
+
+    Combines static signals (vague query, few key terms, no clear intent) with
+    what has been observed: exact questions that needed a rewrite before, and
+    a per-key-term rate of weak first passes.
+    """
+
+    def __init__(self, max_entries: int | None = None):
+        self.max_entries = max_entries or settings.speculative_rewrite_history_size
+        self._lock = threading.Lock()
+        self._weak_questions: OrderedDict[str, None] = OrderedDict()
+        self._term_counts: OrderedDict[str, list[int]] = OrderedDict()  # term -> [weak, total]
+
+    def _remember_question(self, norm_q: str) -> None:
+        self._weak_questions[norm_q] = None
+        self._weak_questions.move_to_end(norm_q)
+        while len(self._weak_questions) > self.max_entries:
+            self._weak_questions.popitem(last=False)
+
+    def _count_terms(self, key_terms: list[str], weak: bool) -> None:
+        for term in set(key_terms):
+            counts = self._term_counts.get(term)
+            if counts is None:
+                counts = self._term_counts[term] = [0, 0]
+            else:
+                self._term_counts.move_to_end(term)
+            counts[0] += int(weak)
+            counts[1] += 1
+        while len(self._term_counts) > self.max_entries:
+            self._term_counts.popitem(last=False)
+
+    def load_history(self, questions: list[str]) -> int:
+        """Seed the history with known weak-match questions (e.g. from qa_logs)."""
+        from app.qa.cache import normalize_question
+        from app.qa.preprocessing import preprocess_query
+
+        with self._lock:
+            for question in questions:
+                self._remember_question(normalize_question(question))
+                self._count_terms(preprocess_query(question).key_terms, weak=True)
+        return len(questions)
+
+    def record(self, processed_query, norm_q: str, needed_rewrite: bool) -> None:
+        """Learn from the primary retrieval outcome of a question."""
+        with self._lock:
+            if needed_rewrite:
+                self._remember_question(norm_q)
+            else:
+                self._weak_questions.pop(norm_q, None)
+            self._count_terms(processed_query.key_terms, needed_rewrite)
+
+    def score(self, processed_query, norm_q: str) -> float:
+        """Return a 0..1 low-match score for the question."""
+        with self._lock:
+            if norm_q in self._weak_questions:
+                return 1.0
+            rates = [
+                weak / total
+                for weak, total in (self._term_counts.get(term, (0, 0)) for term in processed_query.key_terms)
+                if total >= _MIN_TERM_OBSERVATIONS
+            ]
+
+        score = 0.0
+        if not processed_query.is_clear:
+            score += 0.4
+        if len(processed_query.key_terms) <= 1:
+            score += 0.25
+        if processed_query.intent == "general":
+            score += 0.1
+        if rates:
+            score += 0.5 * (sum(rates) / len(rates))
+        return min(score, 1.0)
+
+    def predict(self, processed_query, norm_q: str) -> bool:
+        return self.score(processed_query, norm_q) >= settings.speculative_rewrite_threshold
+
+
+class _SpeculationStats:
+    """Thread-safe counters for speculative rewrite outcomes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts = {
+            "started": 0,
+            "used": 0,  # primary was weak and the speculative result was ready to use
+            "cancelled": 0,  # primary was strong before the work started
+            "wasted": 0,  # primary was strong but the work had already run
+            "failed": 0,
+            "missed": 0,  # primary was weak but the question wasn't predicted
+            "saved_ms": 0,
+            "wasted_ms": 0,
+        }
+
+    def add(self, key: str, ms: int = 0) -> None:
+        with self._lock:
+            self.counts[key] += 1
+            if ms and key in ("used", "wasted"):
+                self.counts["saved_ms" if key == "used" else "wasted_ms"] += ms
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = dict(self.counts)
+        settled = counts["used"] + counts["cancelled"] + counts["wasted"]
+        weak = counts["used"] + counts["missed"]
+        counts["precision"] = round(counts["used"] / settled, 3) if settled else None
+        counts["recall"] = round(counts["used"] / weak, 3) if weak else None
+        return counts
+
+
+_stats = _SpeculationStats()
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max(1, settings.speculative_rewrite_workers),
+                    thread_name_prefix="speculative-rewrite",
+                )
+    return _executor
+
+
+class SpeculativeRewrite:
+    """
+    Handle for one in-flight speculative rewrite retrieval.
+
+    ``work`` receives a cancellation event and returns the retrieval result;
+    it should check the event between its embed and retrieval steps.
+    """
+
+    def __init__(self, work):
+        self._cancelled = threading.Event()
+        self._settled = False
+        self.work_ms: int | None = None
+        self._future = _get_executor().submit(self._run, work)
+        _stats.add("started")
+
+    def _run(self, work):
+        started = time.perf_counter()
+        try:
+            return work(self._cancelled)
+        finally:
+            self.work_ms = int((time.perf_counter() - started) * 1000)
+
+    def result(self, timeout: float = 10.0):
+        """
+        Wait for the speculative result. Returns None on failure or timeout so
+        the caller falls back to a sequential rewrite retrieval.
+        """
+        if self._settled:
+            return None
+        self._settled = True
+        waited_from = time.perf_counter()
+        try:
+            result = self._future.result(timeout=timeout)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Speculative rewrite retrieval failed; retrying sequentially: %s", exc)
+            _stats.add("failed")
+            return None
+        waited_ms = int((time.perf_counter() - waited_from) * 1000)
+        # Work that overlapped with the primary retrieval is latency saved
+        _stats.add("used", max(0, (self.work_ms or 0) - waited_ms))
+        return result
+
+    def cancel(self) -> None:
+        """Primary retrieval was strong (or a cache hit) — drop the speculative work."""
+        if self._settled:
+            return
+        self._settled = True
+        self._cancelled.set()
+        if self._future.cancel():
+            _stats.add("cancelled")
+            return
+        self._future.add_done_callback(lambda _: _stats.add("wasted", self.work_ms or 0))
+
+
+def start_speculative_rewrite(rewritten_query: str, two_tier: bool) -> SpeculativeRewrite:
+    """Embed and retrieve ``rewritten_query`` in the background with its own DB session."""
+
+    def _work(cancelled: threading.Event):
+        from app.core.db import get_session_local, safe_close_session
+        from app.indexing.embeddings import embed_text
+        from app.qa.retrieval import retrieve_chunks
+        from app.qa.smart_citations import retrieve_chunks_two_tier
+
+        embedding = embed_text(rewritten_query)
+        if cancelled.is_set():
+            return None
+        db = get_session_local()()
+        try:
+            if two_tier:
+                return retrieve_chunks_two_tier(db, embedding)
+            return retrieve_chunks(db, embedding)
+        finally:
+            safe_close_session(db, context="speculative_rewrite_retrieval")
+
+    return SpeculativeRewrite(_work)
+
+
+def record_missed_rewrite() -> None:
+    """A weak primary retrieval that wasn't predicted (rewrite ran sequentially)."""
+    _stats.add("missed")
+
+
+def get_speculative_rewrite_stats() -> dict:
+    return _stats.snapshot()
+
+
+# Global singleton
+_predictor: LowMatchPredictor | None = None
+
+
+def get_low_match_predictor() -> LowMatchPredictor:
+    """Get the process-wide low-match predictor singleton."""
+    global _predictor
+    if _predictor is None:
+        _predictor = LowMatchPredictor()
+    return _predictor
+
+
+def warm_low_match_history() -> None:
+    """Seed the predictor from weak-match analytics at startup (speculative mode only)."""
+    if settings.low_match_rewrite_mode != "speculative":
+        return
+
+    from app.core.db import get_session_local, safe_close_session
+    from app.qa.cache import get_top_weak_match_questions
+
+    db = get_session_local()()
+    try:
+        questions = get_top_weak_match_questions(
+            db,
+            limit=settings.speculative_rewrite_history_size,
+            lookback_days=settings.weak_match_prewarm_lookback_days,
+        )
+        get_low_match_predictor().load_history(questions)
+        logger.info("Low-match predictor seeded with %d weak-match questions", len(questions))
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Low-match history load failed; predicting from query signals only: %s", exc)
+    finally:
+        safe_close_session(db, context="low_match_history_warmup")
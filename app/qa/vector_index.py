@@ -0,0 +1,213 @@
+"""
+In-process vector index over chunk embeddings.
+
+Alternative to the pgvector HNSW round trip for the candidate search in
+``retrieve_chunks``. The corpus is small enough (~45K × 384 float32 ≈ 70 MB)
+to keep every chunk embedding in a single pre-normalised matrix, so an exact
+brute-force search is one matrix-vector product plus a partial sort.
+
+Enable with ``RETRIEVAL_BACKEND=memory``. The index is loaded in the background
+at startup and, once it is older than ``retrieval_index_refresh_seconds``,
+picks up chunks appended by ingestion (new ids) or reloads fully if rows were
+deleted. Chunks carry no modification timestamp, so embeddings rewritten in
+place (``scripts/reembed_chunks.py``, an embedding model switch) are not
+noticed by that refresh: reload the index with
+``POST /admin/retrieval-index/reload`` or by restarting the API. Until it is
+ready, or if anything goes wrong, retrieval falls back to pgvector.
+"""
+
+import logging
+import threading
+import time
+
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app.core import vectors
+from app.core.config import settings
+from app.storage.models import Chunk
+
+logger = logging.getLogger(__name__)
+
+_LOAD_BATCH_SIZE = 2000
+
+
+class ChunkVectorIndex:
+    """
+    Memory-resident exact cosine index of (chunk id, embedding).
+
+    Readers never take a lock: the arrays are published together as one
+    immutable tuple and swapped atomically when a load/refresh completes.
+    Loads and refreshes serialise on ``_write_lock``, which they hold for the
+    whole DB read, so the request path must never take it; it only touches
+    ``_refresh_lock`` to start a background refresh.
+    """
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self._snapshot = (np.empty(0, dtype=np.int64), np.empty((0, dim), dtype=np.float32))
+        self._write_lock = threading.RLock()
+        self._refresh_lock = threading.Lock()  # guards _refreshing only
+        self._refreshing = False
+        self.loaded_at: float | None = None
+        self.last_load_ms: int | None = None
+
+    # ── Loading ────────────────────────────────────────────────────────────
+
+    @property
+    def ready(self) -> bool:
+        return self.loaded_at is not None
+
+    @property
+    def size(self) -> int:
+        return len(self._snapshot[0])
+
+    def _read_rows(self, db: Session, after_id: int) -> tuple[np.ndarray, np.ndarray]:
+        ids: list[int] = []
+        embeddings: list = []
+        stmt = (
+            select(Chunk.id, Chunk.embedding)
+            .where(Chunk.id > after_id, Chunk.embedding.is_not(None))
+            .order_by(Chunk.id)
+            .execution_options(yield_per=_LOAD_BATCH_SIZE)
+        )
+        for chunk_id, embedding in db.execute(stmt):
+            ids.append(chunk_id)
+            embeddings.append(embedding)
+
+        matrix = (
+            vectors.normalized_matrix(embeddings, dim=self.dim)
+            if embeddings
+            else vectors.empty_matrix(self.dim)
+        )
+        return np.asarray(ids, dtype=np.int64), matrix
+
+    def load(self, db: Session) -> int:
+        """Full (re)load of every chunk embedding. Returns the number of rows indexed."""
+        with self._write_lock:
+            started = time.perf_counter()
+            self._snapshot = self._read_rows(db, after_id=0)
+            self.loaded_at = time.time()
+            self.last_load_ms = int((time.perf_counter() - started) * 1000)
+        logger.info("Chunk vector index loaded: %d chunks in %d ms", self.size, self.last_load_ms)
+        return self.size
+
+    def refresh(self, db: Session) -> int:
+        """
+        Incrementally index chunks added since the last load.
+
+        Chunks are only ever appended by ingestion, so new rows are those with
+        an id above the current maximum. If rows were deleted (or the index was
+        never loaded) a full reload is done instead. Embeddings updated in
+        place are not detected; call ``load`` for those. Returns rows added.
+        """
+        with self._write_lock:
+            if not self.ready:
+                return self.load(db)
+
+            ids, matrix = self._snapshot
+            max_id = int(ids[-1]) if len(ids) else 0
+            indexed_count = db.scalar(
+                select(func.count(Chunk.id)).where(Chunk.id <= max_id, Chunk.embedding.is_not(None))
+            )
+            if indexed_count != len(ids):
+                logger.info(
+                    "Chunk vector index out of sync (%s rows ≤ id %d, %d indexed) — reloading",
+                    indexed_count, max_id, len(ids),
+                )
+                return self.load(db)
+
+            new_ids, new_matrix = self._read_rows(db, after_id=max_id)
+            if len(new_ids):
+                self._snapshot = (np.concatenate([ids, new_ids]), np.vstack([matrix, new_matrix]))
+            self.loaded_at = time.time()
+        if len(new_ids):
+            logger.info("Chunk vector index refreshed: +%d chunks (total %d)", len(new_ids), self.size)
+        return len(new_ids)
+
+    def is_stale(self) -> bool:
+        if not self.ready:
+            return True
+        return (time.time() - self.loaded_at) >= settings.retrieval_index_refresh_seconds
+
+    def refresh_in_background(self, full: bool = False) -> bool:
+        """
+        Kick off a refresh (or, with ``full``, a complete reload) with a fresh
+        DB session, at most one at a time. Returns False if one is already running.
+        """
+        with self._refresh_lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+
+        def _run():
+            from app.core.db import get_session_local, safe_close_session
+
+            db = get_session_local()()
+            try:
+                if full:
+                    self.load(db)
+                else:
+                    self.refresh(db)
+            except Exception as exc:
+                logger.warning("Chunk vector index refresh failed: %s", exc)
+            finally:
+                safe_close_session(db, context="chunk_index_refresh")
+                with self._refresh_lock:
+                    self._refreshing = False
+
+        threading.Thread(target=_run, name="chunk-index-refresh", daemon=True).start()
+        return True
+
+    # ── Search ─────────────────────────────────────────────────────────────
+
+    def search(self, query_embedding, limit: int) -> list[tuple[int, float]]:
+        """Return up to ``limit`` (chunk_id, cosine_similarity) pairs, best first."""
+        ids, matrix = self._snapshot
+        if not len(ids) or limit <= 0:
+            return []
+
+        query = vectors.normalize(query_embedding)
+        if not query.any():
+            return []
+        scores = vectors.matvec(matrix, query)
+        return [(int(ids[i]), float(scores[i])) for i in vectors.top_k(scores, limit)]
+
+    def stats(self) -> dict:
+        return {
+            "backend": "memory",
+            "ready": self.ready,
+            "chunks": self.size,
+            "memory_mb": round(self._snapshot[1].nbytes / (1024 * 1024), 1),
+            "last_load_ms": self.last_load_ms,
+            "age_seconds": int(time.time() - self.loaded_at) if self.loaded_at else None,
+        }
+
+
+# Global singleton
+_chunk_index: ChunkVectorIndex | None = None
+
+
+def get_chunk_index() -> ChunkVectorIndex:
+    """Get the process-wide chunk vector index singleton."""
+    global _chunk_index
+    if _chunk_index is None:
+        _chunk_index = ChunkVectorIndex(dim=settings.embedding_dim)
+    return _chunk_index
+
+
+def warm_chunk_index() -> None:
+    """Load the index at startup when the memory backend is selected."""
+    if settings.retrieval_backend != "memory":
+        return
+
+    from app.core.db import get_session_local, safe_close_session
+
+    db = get_session_local()()
+    try:
+        get_chunk_index().load(db)
+    except Exception as exc:
+        logger.warning("Chunk vector index warm-up failed; using pgvector until it loads: %s", exc)
+    finally:
+        safe_close_session(db, context="chunk_index_warmup")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Measure how many more requests the canonical cache key serves without embedding.
+
+Replays qa_logs questions in created_at order. For each request it checks
+whether the same normalize_question() key (AnswerCache.get_exact) or the same
+canonical_question_key() (AnswerCache.get_canonical) was asked within the
+cache TTL. Either hit skips the embedding API call and the similarity scan.
+It also prints the canonical keys that merged the most distinct phrasings,
+so false merges can be reviewed.
+
+This assumes every earlier answer was cacheable, so it is an upper bound
+for both keys. The difference between the two is what the canonical index
+adds.
+
+Run: python scripts/analyze_canonical_cache_keys.py [--days 90] [--ttl-hours 168] [--examples 15]
+     python scripts/analyze_canonical_cache_keys.py --file questions.txt   # one question per line, no TTL
+"""
+
+import argparse
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.qa.cache import normalize_question
+from app.qa.preprocessing import canonical_question_key
+
+
+def load_qa_logs(days: int) -> list[tuple[str, float]]:
+    from sqlalchemy import create_engine, text
+
+    from app.core.config import settings
+    from scripts.analytics_queries import INTERNAL_USER_IP, PLACEHOLDER_QUESTION_SQL
+
+    engine = create_engine(str(settings.database_url))
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+    with engine.connect() as db:
+        rows = db.execute(text(f"""
+            SELECT question, EXTRACT(EPOCH FROM created_at)
+            FROM qa_logs
+            WHERE created_at >= :cutoff
+              AND COALESCE(user_ip, '') != :internal_user_ip
+            {PLACEHOLDER_QUESTION_SQL}
+            ORDER BY created_at
+        """), {"cutoff": cutoff, "internal_user_ip": INTERNAL_USER_IP}).fetchall()
+    return [(str(question), float(ts)) for question, ts in rows]
+
+
+def load_file(path: str) -> list[tuple[str, float]]:
+    with open(path, encoding="utf-8") as fh:
+        return [(line.strip(), 0.0) for line in fh if line.strip()]
+
+
+def replay(requests: list[tuple[str, float]], ttl_seconds: float):
+    exact_seen: dict[str, float] = {}
+    canonical_seen: dict[str, float] = {}
+    variants: dict[str, set[str]] = defaultdict(set)
+    exact_hits = canonical_hits = 0
+    for question, ts in requests:
+        norm_q = normalize_question(question)
+        key = canonical_question_key(norm_q)
+        variants[key].add(norm_q)
+        if norm_q in exact_seen and ts - exact_seen[norm_q] < ttl_seconds:
+            exact_hits += 1
+        elif key and key in canonical_seen and ts - canonical_seen[key] < ttl_seconds:
+            canonical_hits += 1
+        else:
+            # A miss is answered and cached under both keys
+            exact_seen[norm_q] = ts
+            if key:
+                canonical_seen[key] = ts
+    return exact_hits, canonical_hits, variants
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--ttl-hours", type=float, default=168, help="answer cache TTL (CACHE_TTL_SECONDS)")
+    parser.add_argument("--file", help="replay questions from a text file instead of qa_logs")
+    parser.add_argument("--examples", type=int, default=15)
+    args = parser.parse_args()
+
+    requests = load_file(args.file) if args.file else load_qa_logs(args.days)
+    if not requests:
+        print("No questions to replay.")
+        return
+    ttl_seconds = float("inf") if args.file else args.ttl_hours * 3600
+
+    exact_hits, canonical_hits, variants = replay(requests, ttl_seconds)
+    total = len(requests)
+    print("=" * 72)
+    print(f"Canonical cache keys ({total} requests, {len(variants)} canonical keys)")
+    print("=" * 72)
+    print(f"  exact key hits (today)         {exact_hits:7d}  ({exact_hits / total:6.1%})")
+    print(f"  extra canonical hits           {canonical_hits:7d}  ({canonical_hits / total:6.1%})")
+    print(f"  served without embedding call  {exact_hits + canonical_hits:7d}  "
+          f"({(exact_hits + canonical_hits) / total:6.1%})")
+
+    merged = sorted(((k, v) for k, v in variants.items() if len(v) > 1), key=lambda kv: -len(kv[1]))
+    if merged and args.examples:
+        print("\n  Most-merged canonical keys (review for false merges):")
+        for key, phrasings in merged[:args.examples]:
+            print(f"    '{key}'  ← {len(phrasings)} phrasings")
+            for phrasing in sorted(phrasings)[:4]:
+                print(f"        {phrasing}")
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    main()
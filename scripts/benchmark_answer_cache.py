@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark AnswerCache similarity lookups against the old linear Python scan.
+
+Fills an in-memory AnswerCache (no Redis) with N synthetic 384-dim entries
+and times get() for hits (a perturbed copy of a cached question) and misses
+(a random vector). The legacy column is the old implementation: a
+pure-Python cosine over every entry, recomputing norms each time. It is only
+timed for a few lookups at large N because it is slow.
+
+Run: python scripts/benchmark_answer_cache.py [--sizes 1000 10000] [--lookups 500]
+"""
+
+import argparse
+import math
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.qa.cache import AnswerCache
+
+DIM = 384
+
+
+def legacy_cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = math.sqrt(sum(x * x for x in a))
+    norm_b = math.sqrt(sum(x * x for x in b))
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+def legacy_lookup(embeddings, query):
+    best, best_sim = None, 0.0
+    for i, embedding in enumerate(embeddings):
+        sim = legacy_cosine(query, embedding)
+        if sim > best_sim:
+            best, best_sim = i, sim
+    return best
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def timed(fn, calls) -> list[float]:
+    samples = []
+    for args in calls:
+        started = time.perf_counter()
+        fn(*args)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--lookups", type=int, default=500)
+    parser.add_argument("--legacy-lookups", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    print("=" * 72)
+    print(f"AnswerCache lookup benchmark ({DIM} dims, {args.lookups} lookups per size)")
+    print("=" * 72)
+
+    for size in args.sizes:
+        embeddings = [[rng.gauss(0, 1) for _ in range(DIM)] for _ in range(size)]
+        cache = AnswerCache(ttl_seconds=3600, max_entries=size, similarity_threshold=0.9)
+        started = time.perf_counter()
+        for i, embedding in enumerate(embeddings):
+            cache.put(f"question {i}", embedding, {"answer": f"answer {i}", "citations": []})
+        fill_ms = (time.perf_counter() - started) * 1000
+
+        hits = []
+        for _ in range(args.lookups):
+            target = embeddings[rng.randrange(size)]
+            hits.append(("hit", [x + rng.gauss(0, 0.05) for x in target]))
+        misses = [("miss", [rng.gauss(0, 1) for _ in range(DIM)]) for _ in range(args.lookups)]
+
+        hit_ms = timed(cache.get, hits)
+        miss_ms = timed(cache.get, misses)
+        legacy_ms = timed(lambda q: legacy_lookup(embeddings, q), [(q,) for _, q in hits[: args.legacy_lookups]])
+        hit_rate = sum(cache.get("hit", q) is not None for _, q in hits) / len(hits)
+
+        print(f"  {size:>6} entries (fill {fill_ms:6.0f} ms, hit rate {hit_rate:.0%})")
+        print(f"    matrix hit   p50={percentile(hit_ms, 50):7.3f} ms  p99={percentile(hit_ms, 99):7.3f} ms")
+        print(f"    matrix miss  p50={percentile(miss_ms, 50):7.3f} ms  p99={percentile(miss_ms, 99):7.3f} ms")
+        print(f"    legacy scan  mean={statistics.mean(legacy_ms):7.1f} ms")
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    main()
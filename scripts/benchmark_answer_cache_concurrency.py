@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Multi-threaded stress benchmark for AnswerCache lookups.
+
+Fills an in-memory AnswerCache (no Redis) with N synthetic 384-dim entries.
+Then, for each thread count, reader threads call get() / get_exact() in a
+loop for a fixed duration while one writer thread keeps put()-ing new
+answers, the way /ask traffic interleaves lookups with fresh answers.
+
+The "serialized" column wraps every call in one global mutex, which is how
+the cache behaved before it had a readers-writer lock. The "rwlock" column
+calls the cache directly, so reads overlap (NumPy's matvec releases the GIL).
+
+Run: python scripts/benchmark_answer_cache_concurrency.py [--entries 2000] [--threads 1 8 32]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.qa.cache import AnswerCache
+
+DIM = 384
+
+
+def fill(size: int, rng: random.Random) -> tuple[AnswerCache, list[list[float]]]:
+    cache = AnswerCache(ttl_seconds=3600, max_entries=size, similarity_threshold=0.9)
+    embeddings = [[rng.gauss(0, 1) for _ in range(DIM)] for _ in range(size)]
+    for i, embedding in enumerate(embeddings):
+        cache.put(f"question {i}", embedding, {"answer": f"answer {i}", "citations": []})
+    return cache, embeddings
+
+
+def run(cache: AnswerCache, queries, threads: int, seconds: float, puts_per_s: float, mutex):
+    stop = threading.Event()
+    counts = [0] * threads
+    writes = [0]
+
+    def guarded(fn, *args):
+        if mutex is None:
+            return fn(*args)
+        with mutex:
+            return fn(*args)
+
+    def reader(idx: int):
+        i = idx
+        while not stop.is_set():
+            kind, question, embedding = queries[i % len(queries)]
+            if kind == "exact":
+                guarded(cache.get_exact, question)
+            else:
+                guarded(cache.get, question, embedding)
+            counts[idx] += 1
+            i += threads
+
+    def writer():
+        rng = random.Random(11)
+        interval = 1.0 / puts_per_s if puts_per_s > 0 else None
+        while interval and not stop.wait(interval):
+            embedding = [rng.gauss(0, 1) for _ in range(DIM)]
+            guarded(cache.put, f"fresh {writes[0]}", embedding, {"answer": "fresh", "citations": []})
+            writes[0] += 1
+
+    workers = [threading.Thread(target=reader, args=(i,)) for i in range(threads)]
+    workers.append(threading.Thread(target=writer))
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    return sum(counts) / elapsed, writes[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--puts-per-s", type=float, default=50, help="writer rate during the run")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    cache, embeddings = fill(args.entries, rng)
+    queries = []
+    for i in range(512):
+        target = rng.randrange(args.entries)
+        if i % 4 == 0:
+            queries.append(("exact", f"question {target}", None))
+        else:
+            queries.append(("similar", "q", [x + rng.gauss(0, 0.05) for x in embeddings[target]]))
+
+    print("=" * 72)
+    print(f"AnswerCache concurrency ({args.entries} entries, {args.seconds:g}s per run, "
+          f"{args.puts_per_s:g} puts/s)")
+    print("=" * 72)
+    print(f"  {'threads':>7}  {'serialized':>14}  {'rwlock':>14}  {'speedup':>7}")
+    for threads in args.threads:
+        serialized, _ = run(cache, queries, threads, args.seconds, args.puts_per_s, threading.Lock())
+        concurrent, _ = run(cache, queries, threads, args.seconds, args.puts_per_s, None)
+        print(f"  {threads:>7}  {serialized:>10.0f} /s  {concurrent:>10.0f} /s  {concurrent / serialized:>6.2f}x")
+    print(f"\n  total hits recorded: {cache.stats()['total_hits']}")
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    main()
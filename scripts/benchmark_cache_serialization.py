@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Size and time the Redis answer-cache entry formats.
+
+Builds synthetic entries shaped like real ones (a 384-dim embedding, a
+~1.5 KB answer, five citations) and compares the legacy JSON format with the
+binary v1 format (float32 and float16 embeddings, zlib-compressed response).
+Reports bytes per entry, serialize/deserialize time, the projected Redis
+memory for --entries cached answers, and how far float16 moves cosine scores.
+
+Run: python scripts/benchmark_cache_serialization.py [--samples 500] [--entries 5000]
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import vectors
+from app.qa.cache import CacheEntry, decode_entry, encode_entry
+
+DIM = 384
+WORDS = "grief healing boundaries courage patience forgiveness trust family rest listen".split()
+
+
+def legacy_encode(entry: CacheEntry) -> bytes:
+    return json.dumps({
+        "question": entry.question,
+        "embedding": entry.embedding,
+        "response": entry.response,
+        "created_at": entry.created_at,
+        "hit_count": entry.hit_count,
+    }).encode()
+
+
+def make_entry(rng: random.Random, i: int) -> CacheEntry:
+    answer = " ".join(rng.choice(WORDS) for _ in range(220)) + "."
+    citations = [
+        {
+            "episode_id": rng.randrange(1, 400),
+            "episode_title": f"Episode {rng.randrange(1, 400)}: on {rng.choice(WORDS)}",
+            "audio_url": f"https://example.com/audio/{rng.randrange(10**6)}.mp3",
+            "timestamp_start_seconds": rng.randrange(3000),
+            "timestamp_end_seconds": rng.randrange(3000, 3600),
+            "text": " ".join(rng.choice(WORDS) for _ in range(30)),
+        }
+        for _ in range(5)
+    ]
+    return CacheEntry(
+        question=f"how do i practice {rng.choice(WORDS)} {i}",
+        embedding=[rng.gauss(0, 0.05) for _ in range(DIM)],
+        response={"question": "?", "answer": answer, "citations": citations, "follow_up_questions": []},
+        created_at=time.time(),
+    )
+
+
+def bench(entries, encode, decode):
+    started = time.perf_counter()
+    raws = [encode(entry) for entry in entries]
+    encode_ms = (time.perf_counter() - started) * 1000 / len(entries)
+    started = time.perf_counter()
+    decoded = [decode(raw) for raw in raws]
+    decode_ms = (time.perf_counter() - started) * 1000 / len(entries)
+    return statistics.mean(len(raw) for raw in raws), encode_ms, decode_ms, decoded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--samples", type=int, default=500)
+    parser.add_argument("--entries", type=int, default=5000, help="cache size to project Redis memory for")
+    args = parser.parse_args()
+
+    rng = random.Random(9)
+    entries = [make_entry(rng, i) for i in range(args.samples)]
+
+    print("=" * 72)
+    print(f"Answer cache entry formats ({args.samples} samples, {DIM}-dim embeddings)")
+    print("=" * 72)
+    print(f"  {'format':<16} {'bytes':>7} {'ser ms':>8} {'deser ms':>9} {'MB @ ' + str(args.entries):>12}")
+
+    formats = [
+        ("legacy json", legacy_encode, decode_entry),
+        ("v1 float32", lambda e: encode_entry(e, "float32"), decode_entry),
+        ("v1 float16", lambda e: encode_entry(e, "float16"), decode_entry),
+    ]
+    for label, encode, decode in formats:
+        size, encode_ms, decode_ms, decoded = bench(entries, encode, decode)
+        print(f"  {label:<16} {size:7.0f} {encode_ms:8.3f} {decode_ms:9.3f} "
+              f"{size * args.entries / 1024 / 1024:12.1f}")
+        if label == "v1 float16":
+            drift = [
+                abs(vectors.cosine_similarity(b.embedding, c.embedding)
+                    - vectors.cosine_similarity(a.embedding, c.embedding))
+                for a, b, c in zip(entries, decoded, entries[1:] + entries[:1])
+            ]
+            print(f"\n  float16 cosine drift: max={max(drift):.2e} (cache threshold granularity is 1e-2)")
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    main()
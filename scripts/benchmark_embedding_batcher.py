@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Simulate a push-driven /ask spike against the embedding micro-batcher.
+
+N threads embed one question each at (almost) the same moment. The fake
+provider sleeps for a fixed round-trip time, and a semaphore caps the
+number of requests in flight, the way an HTTP connection pool or an API
+rate limit would. The script reports API calls and p50/p99 caller latency,
+with and without batching.
+
+Run: python scripts/benchmark_embedding_batcher.py [--callers 60] [--rtt-ms 150]
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.indexing.embedding_batcher import EmbeddingBatcher
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def make_provider(rtt_ms: float, max_in_flight: int, calls: list):
+    slots = threading.Semaphore(max_in_flight)
+
+    def embed(texts):
+        with slots:
+            calls.append(len(texts))
+            time.sleep(rtt_ms / 1000)
+            return [[0.0] * 384 for _ in texts]
+
+    return embed
+
+
+def run(callers: int, embed_one, stagger_ms: float) -> list[float]:
+    latencies = [0.0] * callers
+
+    def call(i):
+        time.sleep(i * stagger_ms / 1000)
+        started = time.perf_counter()
+        embed_one([f"question {i}"])
+        latencies[i] = (time.perf_counter() - started) * 1000
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(callers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--callers", type=int, default=60)
+    parser.add_argument("--rtt-ms", type=float, default=150)
+    parser.add_argument("--max-in-flight", type=int, default=8, help="provider concurrency cap")
+    parser.add_argument("--stagger-ms", type=float, default=0.5, help="delay between caller arrivals")
+    parser.add_argument("--window-ms", type=float, default=5)
+    parser.add_argument("--max-batch", type=int, default=64)
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print(f"Embedding spike: {args.callers} callers, {args.rtt_ms:.0f} ms RTT, "
+          f"{args.max_in_flight} requests in flight max")
+    print("=" * 72)
+
+    for label, window in (("direct", None), (f"batched {args.window_ms:g}ms", args.window_ms)):
+        calls: list[int] = []
+        provider = make_provider(args.rtt_ms, args.max_in_flight, calls)
+        embed_one = provider if window is None else EmbeddingBatcher(provider, window, args.max_batch).embed
+        latencies = run(args.callers, embed_one, args.stagger_ms)
+        print(f"  {label:<14} api_calls={len(calls):4d}  p50={percentile(latencies, 50):7.1f} ms  "
+              f"p99={percentile(latencies, 99):7.1f} ms")
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark the "local" hashed embedding provider on a chunk-sized corpus.
+
+Compares the old per-text loop (SHA-256 per token occurrence, one Python
+list per text) with the batched implementation (memoised token buckets and
+one count matrix for the whole batch), and checks that both produce
+identical vectors.
+
+Run: python scripts/benchmark_hashed_embeddings.py [--chunks 2000] [--words 220]
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import vectors
+from app.indexing import embeddings
+
+
+def legacy_hashed_embedding(text: str, dim: int) -> list[float]:
+    tokens = [t for t in text.lower().split() if t.isalpha()]
+    if not tokens:
+        return [0.0] * dim
+    vec = [0.0] * dim
+    for token in tokens:
+        h = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        vec[int(h[:8], 16) % dim] += 1.0
+    return vectors.to_list(vectors.normalize(vec))
+
+
+def make_corpus(chunks: int, words: int, vocabulary: int = 6000, seed: int = 3) -> list[str]:
+    rng = random.Random(seed)
+    vocab = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randrange(3, 10)))
+             for _ in range(vocabulary)]
+    # Zipf-ish word frequencies, like real transcripts
+    weights = [1 / (rank + 1) for rank in range(vocabulary)]
+    return [" ".join(rng.choices(vocab, weights, k=words)) for _ in range(chunks)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=220, help="words per chunk (~1400 chars)")
+    parser.add_argument("--dim", type=int, default=384)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.chunks, args.words)
+    print("=" * 72)
+    print(f"Hashed embeddings: {args.chunks} chunks × {args.words} words, {args.dim} dims")
+    print("=" * 72)
+
+    started = time.perf_counter()
+    legacy = [legacy_hashed_embedding(text, args.dim) for text in corpus]
+    legacy_s = time.perf_counter() - started
+
+    embeddings._token_buckets.clear()
+    started = time.perf_counter()
+    batched = embeddings._hashed_embeddings(corpus, args.dim)
+    cold_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    embeddings._hashed_embeddings(corpus, args.dim)
+    warm_s = time.perf_counter() - started
+
+    print(f"  legacy per-text     {legacy_s * 1000:8.0f} ms  ({args.chunks / legacy_s:8.0f} chunks/s)")
+    print(f"  batched (cold)      {cold_s * 1000:8.0f} ms  ({args.chunks / cold_s:8.0f} chunks/s)")
+    print(f"  batched (warm)      {warm_s * 1000:8.0f} ms  ({args.chunks / warm_s:8.0f} chunks/s)")
+    print(f"  identical vectors:  {'yes' if legacy == batched else 'NO'}")
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    main()
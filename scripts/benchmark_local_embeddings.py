@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Compare local embedding providers: PyTorch sentence-transformers vs. ONNX int8.
+
+For each provider this reports model load time, single-query latency
+(p50/p99, what /ask pays per question) and batch throughput. It also
+reports the cosine agreement between the quantized vectors and the PyTorch
+ones, to show how far the quantized vectors drift.
+
+Needs sentence-transformers[onnx] >= 3.2 (pip install ".[onnx]"). Model
+files are downloaded on first run.
+
+Run: python scripts/benchmark_local_embeddings.py [--queries 200] [--threads 2]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import vectors
+from app.core.config import settings
+from app.indexing import embeddings
+
+QUESTIONS = [
+    "How do I set boundaries with my family?",
+    "What does healing from grief look like?",
+    "How can I stop people pleasing?",
+    "Why do I feel anxious when things are going well?",
+    "How do I forgive someone who never apologized?",
+]
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def bench(provider: str, queries: int, batch: int):
+    settings.embedding_provider = provider
+    embeddings._embedding_model = None
+    started = time.perf_counter()
+    embeddings.warm_embedding_model()
+    load_ms = (time.perf_counter() - started) * 1000
+
+    latencies = []
+    for i in range(queries):
+        started = time.perf_counter()
+        embeddings.embed_text(QUESTIONS[i % len(QUESTIONS)] + f" ({i})", use_cache=False)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    texts = [QUESTIONS[i % len(QUESTIONS)] + f" [{i}]" for i in range(batch)]
+    started = time.perf_counter()
+    embeddings.embed_text_batch(texts, use_cache=False)
+    throughput = batch / (time.perf_counter() - started)
+
+    print(
+        f"  {provider:<22} load={load_ms:7.0f} ms  p50={percentile(latencies, 50):6.2f} ms  "
+        f"p99={percentile(latencies, 99):6.2f} ms  mean={statistics.mean(latencies):6.2f} ms  "
+        f"batch={throughput:7.0f} texts/s"
+    )
+    return embeddings.embed_text_batch(QUESTIONS, use_cache=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--batch", type=int, default=256)
+    parser.add_argument("--threads", type=int, default=settings.onnx_embedding_threads)
+    args = parser.parse_args()
+
+    settings.onnx_embedding_threads = args.threads
+    print("=" * 72)
+    print(f"Local embedding providers ({args.queries} single queries, batch of {args.batch}, "
+          f"onnx threads={args.threads})")
+    print("=" * 72)
+
+    torch_vectors = bench("sentence_transformers", args.queries, args.batch)
+    onnx_vectors = bench("onnx", args.queries, args.batch)
+    agreement = [vectors.cosine_similarity(a, b) for a, b in zip(torch_vectors, onnx_vectors)]
+    print(f"\n  int8 vs fp32 cosine agreement: min={min(agreement):.4f} mean={statistics.mean(agreement):.4f}")
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: pure-Python MMR vs. the vectorised MMR in app.qa.retrieval.
+
+Uses synthetic 384-dim candidates (no database needed) and checks that both
+implementations pick the same chunks before timing them.
+
+Run: python scripts/benchmark_mmr.py [--repeat 20]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.qa.retrieval import _mmr_select
+
+
+def _cosine_sim(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = math.sqrt(sum(x * x for x in a))
+    norm_b = math.sqrt(sum(x * x for x in b))
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+def legacy_mmr_select(candidates, top_k, diversity_lambda):
+    """The pre-vectorisation MMR loop from retrieve_chunks."""
+    selected = [candidates[0]]
+    seen_episodes = {candidates[0][0].episode_id}
+    while len(selected) < top_k:
+        best_mmr_score = -1
+        best_candidate = None
+        for chunk, similarity in candidates:
+            if chunk.episode_id in seen_episodes:
+                continue
+            max_sim_to_selected = max(
+                _cosine_sim(chunk.embedding, sel_chunk.embedding) for sel_chunk, _ in selected
+            )
+            mmr_score = (diversity_lambda * similarity) + ((1 - diversity_lambda) * (1.0 - max_sim_to_selected))
+            if mmr_score > best_mmr_score:
+                best_mmr_score = mmr_score
+                best_candidate = (chunk, similarity)
+        if not best_candidate:
+            break
+        selected.append(best_candidate)
+        seen_episodes.add(best_candidate[0].episode_id)
+    return selected
+
+
+def make_candidates(count: int, dim: int = 384, seed: int = 42):
+    rng = random.Random(seed)
+    episodes = max(8, count // 3)
+    candidates = []
+    for i in range(count):
+        chunk = SimpleNamespace(
+            id=i,
+            episode_id=rng.randrange(episodes),
+            embedding=[rng.gauss(0, 1) for _ in range(dim)],
+        )
+        candidates.append((chunk, 0.95 - (i / count) * 0.6))
+    return candidates
+
+
+def time_ms(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--top-k", type=int, default=6)
+    parser.add_argument("--lambda", dest="diversity_lambda", type=float, default=0.7)
+    args = parser.parse_args()
+
+    print("=" * 72)
+    print("MMR selection benchmark (top_k=%d, lambda=%.2f)" % (args.top_k, args.diversity_lambda))
+    print("=" * 72)
+    print(f"{'candidates':>10}  {'legacy ms':>10}  {'numpy ms':>10}  {'speedup':>8}  same")
+
+    for count in (30, 150, 600):
+        candidates = make_candidates(count)
+        legacy = [c.id for c, _ in legacy_mmr_select(candidates, args.top_k, args.diversity_lambda)]
+        vectorised = [c.id for c, _ in _mmr_select(candidates, args.top_k, args.diversity_lambda)]
+
+        legacy_ms = time_ms(lambda: legacy_mmr_select(candidates, args.top_k, args.diversity_lambda), args.repeat)
+        numpy_ms = time_ms(lambda: _mmr_select(candidates, args.top_k, args.diversity_lambda), args.repeat)
+        print(
+            f"{count:>10}  {legacy_ms:>10.3f}  {numpy_ms:>10.3f}  "
+            f"{legacy_ms / max(numpy_ms, 1e-9):>7.1f}x  {'yes' if legacy == vectorised else 'NO'}"
+        )
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    main()
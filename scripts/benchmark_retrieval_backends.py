@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Benchmark retrieval candidate search: in-process index vs. pgvector.
+
+Builds a synthetic corpus (default 50K chunks × 384 dims) and reports p50/p99
+latency for the top_k * 5 candidate search each backend performs per /ask.
+
+The memory backend always runs. The pgvector backend only runs when a
+database URL is given: the script creates a throwaway `bench_chunks` table
+with an HNSW index (same parameters as production), times the queries and
+drops the table again.
+
+Run:
+  python scripts/benchmark_retrieval_backends.py
+  python scripts/benchmark_retrieval_backends.py --database-url postgresql+psycopg://...
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.qa.vector_index import ChunkVectorIndex
+
+
+class _RowsSession:
+    """Minimal stand-in for a Session so ChunkVectorIndex.load can be reused."""
+
+    def __init__(self, rows):
+        self._rows = rows
+
+    def execute(self, stmt):
+        return self._rows
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name: str, samples: list[float]):
+    print(
+        f"  {name:<10} p50={percentile(samples, 50):7.2f} ms  "
+        f"p99={percentile(samples, 99):7.2f} ms  mean={statistics.mean(samples):7.2f} ms"
+    )
+
+
+def bench_memory(corpus: np.ndarray, queries: np.ndarray, limit: int) -> list[float]:
+    rows = [(i + 1, corpus[i]) for i in range(len(corpus))]
+    index = ChunkVectorIndex(dim=corpus.shape[1])
+    started = time.perf_counter()
+    index.load(_RowsSession(rows))
+    print(f"  memory index load: {(time.perf_counter() - started) * 1000:.0f} ms, "
+          f"{index.stats()['memory_mb']} MB")
+
+    samples = []
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query, limit)
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def bench_pgvector(database_url: str, corpus: np.ndarray, queries: np.ndarray, limit: int) -> list[float]:
+    from sqlalchemy import create_engine, text
+    from pgvector.psycopg import register_vector
+
+    engine = create_engine(database_url)
+    dim = corpus.shape[1]
+    with engine.connect() as conn:
+        register_vector(conn.connection.driver_connection)
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        conn.execute(text("DROP TABLE IF EXISTS bench_chunks"))
+        conn.execute(text(f"CREATE UNLOGGED TABLE bench_chunks (id serial PRIMARY KEY, episode_id int, embedding vector({dim}))"))
+        raw = conn.connection.driver_connection
+        with raw.cursor().copy("COPY bench_chunks (episode_id, embedding) FROM STDIN") as copy:
+            for i, vector in enumerate(corpus):
+                copy.write_row((i // 40, vector))
+        conn.execute(text(
+            "CREATE INDEX ON bench_chunks USING hnsw (embedding vector_cosine_ops) "
+            "WITH (m = 16, ef_construction = 64)"
+        ))
+        conn.commit()
+
+        try:
+            samples = []
+            for query in queries:
+                started = time.perf_counter()
+                conn.execute(
+                    text(
+                        "SELECT id, embedding <=> :q AS distance FROM bench_chunks "
+                        "ORDER BY embedding <=> :q LIMIT :lim"
+                    ),
+                    {"q": query, "lim": limit},
+                ).all()
+                samples.append((time.perf_counter() - started) * 1000)
+            return samples
+        finally:
+            conn.execute(text("DROP TABLE IF EXISTS bench_chunks"))
+            conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=50_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=30, help="candidates per query (top_k * 5)")
+    parser.add_argument("--database-url", default=os.getenv("BENCH_DATABASE_URL"))
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(7)
+    corpus = rng.standard_normal((args.chunks, args.dim), dtype=np.float32)
+    queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+
+    print("=" * 72)
+    print(f"Retrieval backend benchmark: {args.chunks} chunks × {args.dim} dims, "
+          f"{args.queries} queries, limit {args.limit}")
+    print("=" * 72)
+
+    report("memory", bench_memory(corpus, queries, args.limit))
+
+    if args.database_url:
+        report("pgvector", bench_pgvector(args.database_url, corpus, queries, args.limit))
+    else:
+        print("  pgvector   skipped (pass --database-url or set BENCH_DATABASE_URL)")
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Time the Python overhead of turning retrieval results into QA payloads.
+
+Builds synthetic two-tier retrieval results (--chunks answer chunks over a
+handful of episodes, citation episodes picked by
+select_top_episodes_for_citation) and compares, per request:
+
+- legacy: the per-flow loops the QA service used before RetrievalResult
+  (an episode map, then one loop for answer payloads and one for citations,
+  repeated with a fresh map for the low-match rewrite pass);
+- RetrievalResult: one pass per retrieval, episode payloads built once and
+  shared with the rewrite pass.
+
+Run: python scripts/benchmark_retrieval_payloads.py [--chunks 6] [--requests 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.qa.retrieval import EpisodeInfo, RetrievalResult, RetrievedChunk, episode_map_from_chunks
+from app.qa.smart_citations import select_top_episodes_for_citation
+
+
+def legacy_payloads(answer_chunks, citation_episodes):
+    episode_map = episode_map_from_chunks(chunk for chunk, _ in answer_chunks)
+    chunk_payloads = []
+    for chunk, similarity in answer_chunks:
+        episode = episode_map.get(chunk.episode_id)
+        if not episode:
+            continue
+        chunk_payloads.append({
+            "text": chunk.text,
+            "start_time": chunk.start_time,
+            "end_time": chunk.end_time,
+            "episode": {
+                "id": episode.id,
+                "title": episode.title,
+                "audio_url": episode.audio_url or "",
+                "published_year": episode.published_year,
+            },
+            "similarity": similarity,
+        })
+    citation_payloads = []
+    for cit in citation_episodes:
+        episode = episode_map.get(cit["episode_id"])
+        if not episode:
+            continue
+        citation_payloads.append({
+            "text": cit["chunk"].text,
+            "start_time": cit["chunk"].start_time,
+            "end_time": cit["chunk"].end_time,
+            "episode": {"id": episode.id, "title": episode.title, "audio_url": episode.audio_url or ""},
+            "similarity": cit["similarity"],
+            "relevance_score": cit["relevance_score"],
+            "total_relevant_chunks": cit["total_relevant_chunks"],
+        })
+    return chunk_payloads, citation_payloads
+
+
+def make_result(rng: random.Random, chunks: int, episodes: dict[int, EpisodeInfo]) -> dict:
+    answer_chunks = []
+    for i in range(chunks):
+        episode = episodes[rng.randrange(len(episodes))]
+        record = RetrievedChunk(i, episode.id, i * 30.0, i * 30.0 + 30.0, "reflection " * 80, None, episode)
+        answer_chunks.append((record, rng.uniform(0.3, 0.8)))
+    answer_chunks.sort(key=lambda pair: pair[1], reverse=True)
+    return {
+        "answer_chunks": answer_chunks,
+        "citation_episodes": select_top_episodes_for_citation(answer_chunks, max_episodes=5),
+    }
+
+
+def per_request_us(fn, requests: int) -> float:
+    started = time.perf_counter()
+    for _ in range(requests):
+        fn()
+    return (time.perf_counter() - started) * 1e6 / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=6, help="answer chunks per retrieval (settings.top_k)")
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(21)
+    episodes = {i: EpisodeInfo(i, f"Episode {i}", f"https://example.com/{i}.mp3", 2020 + i % 5) for i in range(8)}
+    original = make_result(rng, args.chunks, episodes)
+    rewrite = make_result(rng, args.chunks, episodes)
+
+    def legacy_with_rewrite():
+        legacy_payloads(original["answer_chunks"], original["citation_episodes"])
+        legacy_payloads(rewrite["answer_chunks"], rewrite["citation_episodes"])
+
+    def unified_with_rewrite():
+        first = RetrievalResult.from_two_tier(original)
+        RetrievalResult.from_two_tier(rewrite, first.episode_payloads)
+
+    print("=" * 72)
+    print(f"Retrieval → payload overhead ({args.chunks} answer chunks, {args.requests} requests)")
+    print("=" * 72)
+    cases = [
+        ("one pass", lambda: legacy_payloads(original["answer_chunks"], original["citation_episodes"]),
+         lambda: RetrievalResult.from_two_tier(original)),
+        ("with rewrite pass", legacy_with_rewrite, unified_with_rewrite),
+    ]
+    for label, legacy, unified in cases:
+        legacy_us = per_request_us(legacy, args.requests)
+        unified_us = per_request_us(unified, args.requests)
+        print(f"  {label:<18} legacy={legacy_us:6.2f} µs  RetrievalResult={unified_us:6.2f} µs  "
+              f"({legacy_us / unified_us:4.2f}x)")
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    main()
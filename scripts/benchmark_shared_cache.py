@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Compare per-worker answer caches with the shared-memory tier across processes.
+
+Starts N worker processes, as ``uvicorn --workers N`` would, and deals a
+synthetic question stream to them round-robin (a load balancer's view). In
+"private" mode each worker has its own 500-entry AnswerCache. In "shared"
+mode each worker has a 128-entry L1 in front of one mmap'd
+SharedAnswerStore. The script reports the combined hit rate and the workers'
+total PSS (proportional set size, which splits shared pages fairly between
+processes).
+
+Linux only (reads /proc/self/smaps_rollup for PSS).
+
+Run: python scripts/benchmark_shared_cache.py [--workers 4] [--requests 20000]
+"""
+
+import argparse
+import hashlib
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.qa.cache import AnswerCache, normalize_question
+from app.qa.shared_cache import SharedAnswerStore
+from scripts.simulate_cache_eviction import synthetic_workload
+
+DIM = 384
+
+
+def embed(question: str) -> list[float]:
+    rng = random.Random(hashlib.sha256(question.encode()).digest())
+    return [rng.gauss(0, 1) for _ in range(DIM)]
+
+
+def pss_kb() -> int:
+    with open("/proc/self/smaps_rollup") as fh:
+        for line in fh:
+            if line.startswith("Pss:"):
+                return int(line.split()[1])
+    return 0
+
+
+def worker(index: int, workers: int, requests: int, shared_path: str | None, results) -> None:
+    import logging
+
+    logging.disable(logging.INFO)
+    if shared_path:
+        cache = AnswerCache(
+            ttl_seconds=10**9,
+            max_entries=128,
+            shared_store=SharedAnswerStore(shared_path, capacity=2000, dim=DIM, entry_bytes=16384),
+        )
+    else:
+        cache = AnswerCache(ttl_seconds=10**9, max_entries=500)
+
+    workload = synthetic_workload(requests)
+    rng = random.Random(index)
+    answer_words = "grief healing boundaries courage patience forgiveness trust".split()
+    hits = 0
+    served = 0
+    for i in range(index, len(workload), workers):
+        question = normalize_question(workload[i][0])
+        embedding = embed(question)
+        served += 1
+        if cache.get_exact(question) is not None or cache.get(question, embedding) is not None:
+            hits += 1
+            continue
+        answer = " ".join(rng.choice(answer_words) for _ in range(220)) + "."
+        cache.put(question, embedding, {"answer": answer, "citations": [], "latency_ms": workload[i][1]})
+    results.put((hits, served, pss_kb()))
+
+
+def run(workers: int, requests: int, shared_path: str | None) -> tuple[float, float]:
+    results = multiprocessing.Queue()
+    procs = [
+        multiprocessing.Process(target=worker, args=(i, workers, requests, shared_path, results))
+        for i in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    collected = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    hits = sum(c[0] for c in collected)
+    served = sum(c[1] for c in collected)
+    return hits / served, sum(c[2] for c in collected) / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    shm_dir = "/dev/shm" if os.path.isdir("/dev/shm") else None
+    print("=" * 72)
+    print(f"Answer cache across {args.workers} worker processes ({args.requests} requests)")
+    print("=" * 72)
+    with tempfile.TemporaryDirectory(dir=shm_dir) as tmp:
+        for label, path in (("private 500/worker", None), ("shared 2000 + L1 128", os.path.join(tmp, "tier"))):
+            hit_rate, pss_mb = run(args.workers, args.requests, path)
+            print(f"  {label:<22} hit rate={hit_rate:6.1%}  total PSS={pss_mb:7.1f} MB")
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    main()
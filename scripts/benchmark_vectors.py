@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Benchmark the shared vector helpers (app.core.vectors) at each call site.
+
+For every call site the legacy pure-Python code is timed against the
+NumPy-backed app.core.vectors path:
+
+  cache      AnswerCache.get similarity scan (100 / 1000 entries)
+  hashed     hashed-provider embedding normalisation
+  index      in-process chunk index top-k search (5000 chunks)
+  mmr        MMR candidate matrix + first similarity row (150 candidates)
+
+Synthetic 384-dim data; no database or API keys needed.
+
+Run: python scripts/benchmark_vectors.py [--repeat 20]
+"""
+
+import argparse
+import heapq
+import math
+import os
+import random
+import sys
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core import vectors
+
+DIM = 384
+
+
+def legacy_cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = math.sqrt(sum(x * x for x in a))
+    norm_b = math.sqrt(sum(x * x for x in b))
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+def legacy_normalize(vec):
+    norm = math.sqrt(sum(v * v for v in vec))
+    if norm == 0:
+        return vec
+    return [v / norm for v in vec]
+
+
+def random_rows(rng, count):
+    return [[rng.gauss(0, 1) for _ in range(DIM)] for _ in range(count)]
+
+
+def time_ms(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def run_case(name: str, legacy, build_new, repeat: int):
+    """``build_new`` prepares the data and returns the timed app.core.vectors callable."""
+    legacy_ms = time_ms(legacy, repeat)
+    numpy_ms = time_ms(build_new(), repeat)
+    print(
+        f"  {name:<22} legacy={legacy_ms:9.3f} ms  numpy={numpy_ms:8.3f} ms  "
+        f"speedup={legacy_ms / max(numpy_ms, 1e-9):6.1f}x"
+    )
+
+
+def bench_cache(rng, repeat):
+    for count in (100, 1000):
+        rows = random_rows(rng, count)
+        query = rows[count // 2]
+
+        def legacy():
+            return max(legacy_cosine(query, row) for row in rows)
+
+        def build_new():
+            units = [vectors.normalize(row) for row in rows]  # done once on write
+            return lambda: vectors.top_k(vectors.matvec(vectors.stack(units), vectors.normalize(query)), 1)
+
+        run_case(f"cache scan ({count})", legacy, build_new, repeat)
+
+
+def bench_hashed(rng, repeat):
+    vec = [float(rng.randrange(3)) for _ in range(DIM)]
+    run_case(
+        "hashed normalise",
+        lambda: legacy_normalize(vec),
+        lambda: (lambda: vectors.to_list(vectors.normalize(vec))),
+        repeat * 50,
+    )
+
+
+def bench_index(rng, repeat, chunks=5000):
+    rows = random_rows(rng, chunks)
+    query = rows[0]
+    normalized_rows = [legacy_normalize(row) for row in rows]
+
+    def legacy():
+        unit = legacy_normalize(query)
+        scores = [sum(x * y for x, y in zip(row, unit)) for row in normalized_rows]
+        return heapq.nlargest(30, range(len(scores)), key=scores.__getitem__)
+
+    def build_new():
+        matrix = vectors.normalized_matrix(rows)
+        return lambda: vectors.top_k(vectors.matvec(matrix, vectors.normalize(query)), 30)
+
+    run_case(f"index top-30 ({chunks})", legacy, build_new, max(1, repeat // 4))
+
+
+def bench_mmr(rng, repeat, count=150):
+    rows = random_rows(rng, count)
+
+    def legacy():
+        return [legacy_cosine(rows[0], row) for row in rows]
+
+    def build_new():
+        return lambda: vectors.matvec(vectors.normalized_matrix(rows), vectors.normalize(rows[0]))
+
+    run_case(f"mmr first row ({count})", legacy, build_new, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    print("=" * 72)
+    print(f"Vector helper benchmark ({DIM} dims, repeat={args.repeat})")
+    print("=" * 72)
+    bench_cache(rng, args.repeat)
+    bench_hashed(rng, args.repeat)
+    bench_index(rng, args.repeat)
+    bench_mmr(rng, args.repeat)
+    print("\nFull MMR selection timings: python scripts/benchmark_mmr.py")
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    main()
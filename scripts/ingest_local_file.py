@@ -176,7 +176,7 @@ def main():
         
         # Batch embed all chunks
         chunk_texts = [c["text"] for c in tagged_chunks]
-        embeddings = embed_text_batch(chunk_texts)
+        embeddings = embed_text_batch(chunk_texts, use_cache=False)
         logger.info(f"✅ Generated {len(embeddings)} embeddings")
     
     except Exception as e:
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Load test: concurrent in-flight /ask/stream questions per worker, sync vs async.
+
+Fires --requests concurrent streaming questions at one in-process app (one
+uvicorn worker's worth of event loop and threadpool) through httpx's ASGI
+transport. OpenAI is replaced by a fake model that waits --model-seconds
+per answer, spread over a few phrases, so the run measures only how many
+answers a worker can keep open at once. Cache, embedding, retrieval and
+logging are stubbed to a few milliseconds of blocking work each.
+
+- sync: the previous handler shape, a ``def`` route returning
+  ``answer_question_stream``. Starlette runs the route and every ``next()``
+  of the generator on its default threadpool (40 threads), and the model
+  wait happens inside ``next()``.
+- async: the current ``async def`` /ask/stream route. Blocking phases run on
+  the ``ask_sync_threads`` limiter and the model is awaited on the loop.
+
+"peak model waits" is the most answers being written at the same moment.
+Both runs include the pipeline's per-request gc.collect() (~30 ms of CPU
+with the app loaded), which is most of the async wall time past
+--model-seconds.
+
+Run: python scripts/load_test_ask_concurrency.py [--requests 200] [--model-seconds 2]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+
+from app.api.main import app
+from app.core.config import settings
+from app.core.db import get_db
+from app.qa import answer, service
+
+PHRASES = 8
+BLOCKING_PHASE_SECONDS = 0.005
+
+
+class _Gauge:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def __exit__(self, *exc):
+        with self.lock:
+            self.current -= 1
+
+
+class _Session:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _MissingCache:
+    def get_exact(self, question):
+        return None
+
+    def get_canonical(self, question):
+        return None
+
+    def get(self, question, embedding):
+        time.sleep(BLOCKING_PHASE_SECONDS)
+        return None
+
+    def put(self, question, embedding, payload):
+        pass
+
+
+def stub_pipeline(model_seconds: float, gauge: _Gauge):
+    chunk = {"text": "Grief softens.", "episode": {"id": 1, "title": "Ep 1", "audio_url": ""}, "similarity": 0.8}
+    phrase_seconds = model_seconds / PHRASES
+
+    def blocking(result):
+        def phase(*args, **kwargs):
+            time.sleep(BLOCKING_PHASE_SECONDS)
+            return result
+        return phase
+
+    def sync_model(question, chunks, context=None, metadata=None):
+        for _ in range(PHRASES):
+            with gauge:
+                time.sleep(phrase_seconds)
+            yield "A grounded phrase. "
+
+    async def async_model(question, chunks, context=None, metadata=None):
+        for _ in range(PHRASES):
+            with gauge:
+                await asyncio.sleep(phrase_seconds)
+            yield "A grounded phrase. "
+
+    service.get_answer_cache = lambda: _MissingCache()
+    service.embed_text = blocking([1.0, 0.0])
+    service._retrieve_for_answer = blocking((SimpleNamespace(chunk_payloads=[chunk], citation_payloads=[]), False, "q"))
+    service._log_qa_with_fresh_session = blocking(1)
+    answer.generate_follow_up_questions = lambda *args: []
+    answer.generate_shareable_headline = lambda *args: ""
+    answer.generate_intelligent_answer_stream = sync_model
+    answer.generate_intelligent_answer_stream_async = async_model
+
+
+def sync_app() -> FastAPI:
+    legacy = FastAPI()
+
+    @legacy.post("/ask/stream")
+    def ask_stream(payload: dict):
+        return StreamingResponse(
+            service.answer_question_stream(_Session(), payload["question"], user_ip="load-test"),
+            media_type="text/event-stream",
+        )
+
+    return legacy
+
+
+async def fire(target: FastAPI, requests: int) -> dict:
+    transport = httpx.ASGITransport(app=target)
+    latencies = []
+    failures = 0
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://worker", timeout=None) as client:
+        async def one(i: int):
+            nonlocal failures
+            started = time.perf_counter()
+            response = await client.post("/ask/stream", json={"question": f"How do I handle change, part {i}?"})
+            if response.status_code != 200 or '"type": "done"' not in response.text:
+                failures += 1
+            latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(requests)))
+        wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "wall": wall,
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "failures": failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200, help="concurrent streaming questions")
+    parser.add_argument("--model-seconds", type=float, default=2.0, help="fake OpenAI time per answer")
+    args = parser.parse_args()
+
+    settings.rate_limit_per_minute = settings.rate_limit_per_day = args.requests * 10
+    settings.singleflight_enabled = False
+    settings.ask_max_in_flight = max(settings.ask_max_in_flight, args.requests)
+    app.dependency_overrides[get_db] = _Session
+
+    print("=" * 72)
+    print(f"/ask/stream, one worker: {args.requests} concurrent questions, "
+          f"{args.model_seconds:.1f}s per answer")
+    print("=" * 72)
+    for label, target in (("sync handler", sync_app()), ("async handler", app)):
+        gauge = _Gauge()
+        stub_pipeline(args.model_seconds, gauge)
+        result = asyncio.run(fire(target, args.requests))
+        print(f"  {label:<14} peak model waits={gauge.peak:4d}  wall={result['wall']:6.2f}s  "
+              f"p50={result['p50']:6.2f}s  p95={result['p95']:6.2f}s  failures={result['failures']}")
+
+
+if __name__ == "__main__":
+    import logging
+
+    logging.disable(logging.INFO)
+    main()
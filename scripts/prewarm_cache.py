@@ -56,16 +56,15 @@ def clean_incomplete_cached_answers():
     
     incomplete_count = 0
     
-    with cache._lock:
-        entries_to_delete = []
+    entries_to_delete = []
+    
+    for entry in cache.entries():
+        answer = entry.response.get("answer", "")
         
-        for entry in cache._entries:
-            answer = entry.response.get("answer", "")
-            
-            if _is_incomplete_answer(answer):
-                incomplete_count += 1
-                entries_to_delete.append(entry.question)
-                print(f"   ✗ Found incomplete: '{entry.question[:60]}...' (ends: '...{answer[-40:]}')")
+        if _is_incomplete_answer(answer):
+            incomplete_count += 1
+            entries_to_delete.append(entry.question)
+            print(f"   ✗ Found incomplete: '{entry.question[:60]}...' (ends: '...{answer[-40:]}')")
     
     if incomplete_count > 0:
         deleted = 0
@@ -4,7 +4,8 @@ Re-embed all chunks using the configured OpenAI embedding model.
 
 This script updates the embedding vectors for ALL existing chunks in the database
 WITHOUT re-downloading audio, re-transcribing, or re-chunking. It only touches
-the `embedding` column.
+the `embedding` column. The API's in-memory retrieval index (RETRIEVAL_BACKEND=memory)
+does not notice in-place updates; redeploy or POST /admin/retrieval-index/reload afterwards.
 
 Why: The original hash-based embeddings (EMBEDDING_PROVIDER=local) are bag-of-words
 and cannot do semantic search. OpenAI embeddings understand meaning, so a query
@@ -108,7 +109,7 @@ def reembed_all_chunks(batch_size: int = 500, dry_run: bool = False):
             
             try:
                 # Embed the batch
-                embeddings = embed_text_batch(texts)
+                embeddings = embed_text_batch(texts, use_cache=False)
                 
                 # Update each chunk's embedding
                 for chunk, embedding in zip(chunks, embeddings):
@@ -140,7 +141,7 @@ def reembed_all_chunks(batch_size: int = 500, dry_run: bool = False):
                 for chunk in chunks:
                     try:
                         from app.indexing.embeddings import embed_text
-                        chunk.embedding = embed_text(chunk.text)
+                        chunk.embedding = embed_text(chunk.text, use_cache=False)
                         db.commit()
                         processed += 1
                     except Exception as e2:
@@ -168,6 +169,8 @@ def reembed_all_chunks(batch_size: int = 500, dry_run: bool = False):
             logger.info("1. Set EMBEDDING_PROVIDER=openai on Railway (Variables tab)")
             logger.info(f"2. Set EMBEDDING_MODEL={settings.embedding_model} on Railway")
             logger.info("3. Redeploy the API service")
+            logger.info("   (or, with RETRIEVAL_BACKEND=memory and no model change, reload the")
+            logger.info("   in-memory index: curl -X POST -u admin:... .../admin/retrieval-index/reload)")
             logger.info("4. Test: curl -X POST .../ask -d '{\"question\": \"addiction\"}'")
             logger.info("5. Verify addiction-related episodes now appear!")
         
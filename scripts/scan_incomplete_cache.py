@@ -25,22 +25,21 @@ def scan_and_clean_cache():
     incomplete_count = 0
     total_entries = 0
     
-    with cache._lock:
-        entries_to_delete = []
+    entries_to_delete = []
+    
+    for entry in cache.entries():
+        total_entries += 1
+        answer = entry.response.get("answer", "")
         
-        for entry in cache._entries:
-            total_entries += 1
-            answer = entry.response.get("answer", "")
+        if _is_incomplete_answer(answer):
+            incomplete_count += 1
+            entries_to_delete.append(entry.question)
             
-            if _is_incomplete_answer(answer):
-                incomplete_count += 1
-                entries_to_delete.append(entry.question)
-                
-                print(f"\n✗ Found incomplete answer:")
-                print(f"  Question: {entry.question}")
-                print(f"  Answer length: {len(answer)} chars")
-                print(f"  Answer ends: '...{answer[-80:]}'")
-                print(f"  Hit count: {entry.hit_count}")
+            print(f"\n✗ Found incomplete answer:")
+            print(f"  Question: {entry.question}")
+            print(f"  Answer length: {len(answer)} chars")
+            print(f"  Answer ends: '...{answer[-80:]}'")
+            print(f"  Hit count: {entry.hit_count}")
     
     print()
     print("=" * 80)
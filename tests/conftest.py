@@ -0,0 +1,60 @@
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from app.qa import answer, service
+from app.qa.singleflight import SingleFlight
+
+CHUNK = {"text": "Grief softens.", "start_time": 0, "end_time": 30,
+         "episode": {"id": 1, "title": "Ep 1", "audio_url": ""}, "similarity": 0.8}
+
+
+class MissingCache:
+    """Answer cache that always misses and records what would have been cached."""
+
+    def __init__(self):
+        self.put_calls = []
+
+    def get_exact(self, question):
+        return None
+
+    def get_canonical(self, question):
+        return None
+
+    def get(self, question, embedding):
+        return None
+
+    def put(self, question, embedding, payload):
+        self.put_calls.append(payload)
+
+
+@pytest.fixture
+def stub_answer_pipeline(monkeypatch):
+    """
+    Stub everything in the QA pipeline around generation; returns ``stub(model_stream=None, flights=None)``.
+
+    The cache always misses, embedding and retrieval return one fixed chunk,
+    logging returns qa_log_id 7 and follow-ups/headline are canned. With
+    ``model_stream`` the async pipeline streams from it (the sync model
+    fails the test). ``stub`` returns the ``MissingCache``.
+    """
+
+    def stub(model_stream=None, flights: SingleFlight | None = None) -> MissingCache:
+        cache = MissingCache()
+        monkeypatch.setattr(service, "get_answer_cache", lambda: cache)
+        monkeypatch.setattr(service, "get_singleflight", lambda: flights or SingleFlight())
+        monkeypatch.setattr(service, "embed_text", lambda text: [1.0, 0.0])
+        monkeypatch.setattr(service, "_start_speculative_rewrite", lambda *args, **kwargs: None)
+        monkeypatch.setattr(service, "_retrieve_for_answer",
+                            lambda db, **kwargs: (SimpleNamespace(chunk_payloads=[CHUNK], citation_payloads=[]), False, "q"))
+        monkeypatch.setattr(service, "_log_qa_with_fresh_session", lambda **kwargs: 7)
+        monkeypatch.setattr(answer, "generate_follow_up_questions", lambda *args: ["What next?"])
+        monkeypatch.setattr(answer, "generate_shareable_headline", lambda *args: "Grief softens")
+        if model_stream is not None:
+            monkeypatch.setattr(answer, "generate_intelligent_answer_stream",
+                                Mock(side_effect=AssertionError("sync model call")))
+            monkeypatch.setattr(answer, "generate_intelligent_answer_stream_async", model_stream)
+        return cache
+
+    return stub
@@ -0,0 +1,135 @@
+import json
+import threading
+from unittest.mock import Mock
+
+import anyio
+import pytest
+
+from app.core import concurrency
+from app.core.config import settings
+from app.qa import answer, service
+
+PHRASES = ("Grief softens when you let it move through you. ",
+           "Several guests describe giving it room instead of rushing it, and finding that it changes shape over time.")
+
+
+async def _collect(stream):
+    return [event async for event in stream]
+
+
+def _events(raw):
+    return [json.loads(event[len("data: "):]) for event in raw if event.startswith("data: ")]
+
+
+def test_stream_async_generates_on_the_event_loop(stub_answer_pipeline):
+    async def model_stream(question, chunks, context=None, metadata=None):
+        assert [c["text"] for c in chunks] == ["Grief softens."]
+        for phrase in PHRASES:
+            await anyio.sleep(0)
+            yield phrase
+
+    cache = stub_answer_pipeline(model_stream)
+
+    events = _events(anyio.run(_collect, service.answer_question_stream_async(
+        Mock(), "How do I heal?", user_ip="1.2.3.4", log_interaction=False,
+    )))
+
+    assert [e["text"] for e in events if e["type"] == "chunk"] == list(PHRASES)
+    assert events[-1] == {"type": "done", "qa_log_id": 7, "latency_ms": events[-1]["latency_ms"],
+                          "answer_source": "openai", "answer_status": "generated"}
+    assert cache.put_calls[0]["answer"] == "".join(PHRASES)
+
+
+def test_stream_async_model_failure_falls_back_inside_the_pipeline(stub_answer_pipeline):
+    async def model_stream(question, chunks, context=None, metadata=None):
+        yield "Partial "
+        raise TimeoutError("model stalled")
+
+    cache = stub_answer_pipeline(model_stream)
+
+    events = _events(anyio.run(_collect, service.answer_question_stream_async(
+        Mock(), "How do I heal?", user_ip="1.2.3.4", log_interaction=False,
+    )))
+
+    done = events[-1]
+    assert done["answer_status"] == "generation_failed" and done["fallback_reason"] == "TimeoutError"
+    assert cache.put_calls == []  # degraded answers are not cached
+
+
+def test_ask_async_awaits_the_answer_call_on_the_event_loop(monkeypatch, stub_answer_pipeline):
+    answer_text = "".join(PHRASES) + " Naming one memory out loud is a gentle place to start today."
+
+    async def model_answer(question, chunks):
+        assert threading.current_thread() is threading.main_thread()  # not a pipeline worker thread
+        await anyio.sleep(0)
+        return answer_text, {}
+
+    cache = stub_answer_pipeline()
+    monkeypatch.setattr(answer, "generate_answer_async", model_answer)
+    monkeypatch.setattr(answer, "generate_answer", Mock(side_effect=AssertionError("sync model call")))
+
+    result = anyio.run(lambda: service.answer_question_async(
+        Mock(), "How do I heal?", user_ip="1.2.3.4", log_interaction=False,
+    ))
+
+    assert result["answer"] == answer_text and result["answer_status"] == "generated"
+    assert result["follow_up_questions"] == ["What next?"] and result["qa_log_id"] == 7
+    assert cache.put_calls[0]["answer"] == answer_text
+
+
+def test_question_slots_reject_once_every_slot_stays_busy(monkeypatch):
+    monkeypatch.setattr(settings, "ask_max_in_flight", 1)
+    monkeypatch.setattr(settings, "ask_queue_timeout_seconds", 0.01)
+    rejected_before = concurrency.stats()["rejected"]
+
+    async def main():
+        await concurrency.acquire_question_slot()
+        with pytest.raises(concurrency.QuestionCapacityError):
+            await concurrency.acquire_question_slot()
+        concurrency.release_question_slot()
+        await concurrency.acquire_question_slot()  # the freed slot is reusable
+        concurrency.release_question_slot()
+
+    anyio.run(main)
+
+    stats = concurrency.stats()
+    assert stats["in_flight"] == 0 and stats["rejected"] == rejected_before + 1
+
+
+def test_stream_slot_is_released_when_the_client_disconnects_before_the_first_chunk(monkeypatch):
+    from app.api.main import app
+    from app.api.rate_limit import clear_rate_limits
+    from app.core.db import get_db
+    from starlette.requests import ClientDisconnect
+
+    async def never_iterated(db, question, user_ip, context):
+        raise AssertionError("the response never got far enough to iterate the stream")
+        yield
+
+    monkeypatch.setattr(service, "answer_question_stream_async", never_iterated)
+    clear_rate_limits()
+    in_flight_before = concurrency.stats()["in_flight"]
+    body = json.dumps({"question": "How do I heal?"}).encode()
+    scope = {
+        "type": "http", "asgi": {"version": "3.0", "spec_version": "2.4"}, "http_version": "1.1", "method": "POST", "scheme": "http",
+        "path": "/ask/stream", "raw_path": b"/ask/stream", "root_path": "", "query_string": b"",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("1.2.3.4", 1234), "server": ("test", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            raise OSError("client went away")  # disconnect before the first chunk
+
+    app.dependency_overrides[get_db] = lambda: Mock()
+    try:
+        with pytest.raises(ClientDisconnect):
+            anyio.run(app, scope, receive, send)
+    finally:
+        app.dependency_overrides.clear()
+
+    assert concurrency.stats()["in_flight"] == in_flight_before
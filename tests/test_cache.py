@@ -1,4 +1,13 @@
-from app.qa.cache import AnswerCache, normalize_question
+import json
+import logging
+import random
+import threading
+import time
+
+import pytest
+
+from app.core.config import CACHE_EMBEDDING_DTYPES, Settings
+from app.qa.cache import _EMBEDDING_DTYPES, CACHE_ENTRIES, AnswerCache, CacheEntry, decode_entry, encode_entry, normalize_question
 
 
 def test_exact_cache_hit_returns_without_similarity_scan():
@@ -13,3 +22,260 @@ def test_exact_cache_hit_returns_without_similarity_scan():
     assert result["cached"] is True
     assert result["cache_similarity"] == 1.0
     assert result["cache_match_type"] == "exact"
+
+
+def test_similarity_lookup_returns_best_match_above_threshold():
+    cache = AnswerCache(ttl_seconds=60, similarity_threshold=0.9)
+    cache.put("how do i heal", [1.0, 0.0, 0.0], {"answer": "healing", "citations": []})
+    cache.put("what is grief", [0.0, 1.0, 0.0], {"answer": "grief", "citations": []})
+
+    hit = cache.get("how can i heal", [0.95, 0.05, 0.0])
+    assert hit["answer"] == "healing"
+    assert hit["cache_similarity"] > 0.99
+
+    assert cache.get("something else", [0.5, 0.5, 0.7]) is None
+    assert cache.get("zero", [0.0, 0.0, 0.0]) is None
+
+
+def test_expired_entries_free_their_slots_for_reuse():
+    now = time.time()
+    cache = AnswerCache(ttl_seconds=60, similarity_threshold=0.9)
+    with cache._lock.write():
+        cache._insert(CacheEntry("old question", [1.0, 0.0], {"answer": "old"}, created_at=now - 75))
+        cache._insert(CacheEntry("newer question", [0.0, 1.0], {"answer": "newer"}, created_at=now - 45))
+
+    assert cache.get("old question", [1.0, 0.0]) is None  # past its TTL
+    assert cache.get("newer question", [0.0, 1.0])["answer"] == "newer"
+
+    cache.put("third question", [0.6, 0.8], {"answer": "third", "citations": []})
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["free_slots"] == 0  # the expired slot was reused
+    assert [e.question for e in cache.entries()] == ["newer question", "third question"]
+
+
+def test_capacity_evicts_oldest_and_replacing_a_question_keeps_one_entry():
+    cache = AnswerCache(ttl_seconds=600, max_entries=2, similarity_threshold=0.9, eviction_policy="oldest")
+    cache.put("a", [1.0, 0.0, 0.0], {"answer": "a1", "citations": []})
+    cache.put("a", [1.0, 0.0, 0.0], {"answer": "a2", "citations": []})
+    cache.put("b", [0.0, 1.0, 0.0], {"answer": "b", "citations": []})
+    assert cache.stats()["entries"] == 2
+    assert cache.get_exact("a")["answer"] == "a2"
+
+    cache.put("c", [0.0, 0.0, 1.0], {"answer": "c", "citations": []})
+
+    assert cache.get_exact("a") is None
+    assert cache.get("c?", [0.0, 0.1, 1.0])["answer"] == "c"
+    assert CACHE_ENTRIES.value() == 2
+    assert cache.delete("b") and cache.get("b?", [0.0, 1.0, 0.0]) is None
+    assert CACHE_ENTRIES.value() == 1
+    cache.clear()
+    assert CACHE_ENTRIES.value() == 0
+
+
+def test_concurrent_lookups_and_puts_count_every_hit():
+    cache = AnswerCache(ttl_seconds=600, max_entries=512, similarity_threshold=0.9)
+    cache.put("anchor", [1.0, 0.0, 0.0], {"answer": "anchor", "citations": []})
+    errors = []
+
+    def reader():
+        try:
+            for _ in range(500):
+                assert cache.get("anchor?", [0.99, 0.01, 0.0])["answer"] == "anchor"
+                assert cache.get_exact("anchor")["answer"] == "anchor"
+        except Exception as exc:  # surfaced below; assertions don't propagate out of threads
+            errors.append(exc)
+
+    def writer():
+        for i in range(200):
+            cache.put(f"q{i}", [0.0, 1.0, i / 200], {"answer": f"a{i}", "citations": []})
+
+    threads = [threading.Thread(target=reader) for _ in range(8)] + [threading.Thread(target=writer)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    stats = cache.stats()
+    assert stats["entries"] == 201
+    assert stats["total_hits"] == 8 * 500 * 2
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store, self.index, self.mget_calls = {}, {}, 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def zrevrange(self, key, start, stop):
+        return sorted(self.index, key=self.index.get, reverse=True)
+
+    def mget(self, keys):
+        self.release.wait(5)
+        self.mget_calls += 1
+        return [self.store.get(key) for key in keys]
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    def zadd(self, key, mapping):
+        self.index.update(mapping)
+
+    def expire(self, key, ttl):
+        pass
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    def zrem(self, key, *members):
+        for member in members:
+            self.index.pop(member, None)
+
+    def execute(self):
+        return []
+
+
+def _redis_cache(monkeypatch, fake, **kwargs):
+    monkeypatch.setattr(AnswerCache, "_connect_redis", lambda self, url: setattr(self, "_redis", fake))
+    return AnswerCache(ttl_seconds=600, similarity_threshold=0.9, redis_url="redis://fake", **kwargs)
+
+
+def _seed(fake, monkeypatch, count):
+    writer = _redis_cache(monkeypatch, fake)
+    answer = "A complete cached reflection about healing and patience that easily clears the one hundred char minimum."
+    for i in range(count):
+        writer.put(f"question {i}", [1.0, float(i), 0.0], {"answer": answer, "citations": []})
+    return writer
+
+
+def test_redis_load_reads_pages_and_cleans_up_in_one_batch(monkeypatch):
+    fake = FakeRedis()
+    writer = _seed(fake, monkeypatch, 450)
+    fake.index["amt:cache:default:dangling"] = time.time()
+    incomplete = CacheEntry("cut off", [0.0, 0.0, 1.0], {"answer": "This answer stops at the"})
+    fake.store[writer._entry_redis_key("cut off")] = writer._serialize_entry(incomplete)
+    fake.index[writer._entry_redis_key("cut off")] = time.time()
+    fake.mget_calls = 0
+
+    cache = _redis_cache(monkeypatch, fake)
+    load = cache.stats()["redis_load"]
+
+    assert load["state"] == "done" and load["loaded"] == 450
+    assert load["skipped_incomplete"] == 1 and load["stale_keys"] == 1
+    assert fake.mget_calls == load["pages"] == 3
+    assert len(fake.index) == 450
+    assert cache.get_exact("question 7") is not None
+
+
+def test_background_hydration_serves_exact_hits_before_load_finishes(monkeypatch):
+    fake = FakeRedis()
+    _seed(fake, monkeypatch, 5)
+    fake.release.clear()  # hold the bulk MGET
+
+    cache = _redis_cache(monkeypatch, fake, background_hydration=True)
+    assert cache.stats()["redis_load"]["state"] == "loading"
+    assert cache.get_exact("question 3") is not None
+    assert cache.get_exact("missing") is None
+
+    fake.release.set()
+    assert cache.wait_for_hydration(5)
+    load = cache.stats()["redis_load"]
+    assert load["state"] == "done" and load["lazy_fetches"] == 1
+    assert load["loaded"] == 4  # question 3 was already hydrated lazily
+    assert cache.stats()["entries"] == 5
+
+
+@pytest.mark.parametrize("dtype, tolerance", [("float32", 1e-7), ("float16", 1e-3)])
+def test_binary_entry_round_trip_is_compact(dtype, tolerance):
+    rng = random.Random(1)
+    embedding = [rng.gauss(0, 0.05) for _ in range(384)]
+    response = {"answer": "Grief softens when it is witnessed. " * 10, "citations": [{"episode_id": 4}]}
+    entry = CacheEntry("how do i grieve", embedding, response, created_at=1700000000.5, hit_count=3)
+
+    raw = encode_entry(entry, dtype)
+    restored = decode_entry(raw)
+
+    legacy = json.dumps({"question": entry.question, "embedding": embedding, "response": response,
+                         "created_at": entry.created_at, "hit_count": 3}).encode()
+    assert len(raw) < len(legacy) / (3 if dtype == "float32" else 5)
+    assert (restored.question, restored.response, restored.created_at, restored.hit_count) == (
+        entry.question, response, entry.created_at, 3)
+    assert max(abs(a - b) for a, b in zip(restored.embedding, embedding)) < tolerance
+    assert decode_entry(legacy).embedding == embedding  # pre-v1 JSON entries still load
+
+
+def test_serialization_stats_track_sizes_and_legacy_reads():
+    cache = AnswerCache(embedding_dtype="float16")
+    entry = CacheEntry("q", [0.5, -0.25], {"answer": "a"})
+    raw = cache._serialize_entry(entry)
+    cache._deserialize_entry(raw)
+    cache._deserialize_entry(json.dumps({"question": "q", "embedding": [1.0], "response": {},
+                                         "created_at": 1.0}).encode())
+    assert cache._deserialize_entry(b"not an entry") is None
+
+    stats = cache.stats()["serialization"]
+    assert stats["format"] == "v1-float16-zlib"
+    assert stats["entries_written"] == 1 and stats["avg_entry_bytes"] == len(raw)
+    assert stats["entries_read"] == 2 and stats["legacy_json_read"] == 1
+
+
+def test_unknown_embedding_dtype_setting_falls_back_to_float32_at_startup(caplog):
+    assert sorted(CACHE_EMBEDDING_DTYPES) == sorted(_EMBEDDING_DTYPES)
+    assert Settings(cache_embedding_dtype="Float16").cache_embedding_dtype == "float16"
+
+    with caplog.at_level(logging.WARNING):
+        assert Settings(cache_embedding_dtype="bfloat16").cache_embedding_dtype == "float32"
+
+    assert "CACHE_EMBEDDING_DTYPE" in caplog.text
+
+
+def test_canonical_index_serves_rephrasings_without_an_embedding():
+    cache = AnswerCache(ttl_seconds=60)
+    cache.put(normalize_question("How do I set boundaries with my family?"), [1.0, 0.0],
+              {"answer": "boundaries", "citations": []})
+
+    for variant in ("how to set boundries with my family", "How do I set boundaries with the family?!"):
+        norm_variant = normalize_question(variant)
+        assert cache.get_exact(norm_variant) is None
+        hit = cache.get_canonical(norm_variant)
+        assert hit["answer"] == "boundaries" and hit["cache_match_type"] == "canonical"
+
+    assert cache.get_canonical("why should i set boundaries with my family") is None
+    assert cache.get_canonical("the") is None
+    cache.delete(normalize_question("How do I set boundaries with my family?"))
+    assert cache.get_canonical("how to set boundaries with family") is None
+    assert cache.stats()["canonical_keys"] == 0
+
+
+def test_stale_entries_are_served_while_one_refresh_runs():
+    now = time.time()
+    refreshes = []
+    cache = AnswerCache(ttl_seconds=60, stale_ttl_seconds=60, similarity_threshold=0.9,
+                        refresh_callback=lambda key, question: refreshes.append((key, question)))
+    with cache._lock.write():
+        cache._insert(CacheEntry("how do i heal", [1.0, 0.0],
+                                 {"answer": "stale", "question": "How do I heal?"}, created_at=now - 90))
+        cache._insert(CacheEntry("too old", [0.0, 1.0], {"answer": "gone"}, created_at=now - 130))
+
+    hit = cache.get_exact("how do i heal")
+    assert hit["answer"] == "stale" and hit["cache_stale"] is True and hit["cache_age_seconds"] >= 90
+    assert cache.get("how can i heal", [0.99, 0.05])["cache_stale"] is True
+    assert refreshes == [("how do i heal", "How do I heal?")]  # later stale hits don't re-trigger
+
+    cache.refresh_done("how do i heal")
+    cache.get_exact("how do i heal")
+    assert len(refreshes) == 2
+
+    cache.put("how do i heal", [1.0, 0.0], {"answer": "fresh", "citations": []})
+    assert "cache_stale" not in cache.get_exact("how do i heal")
+    assert cache.get_exact("too old") is None  # beyond ttl + stale window
+    stats = cache.stats()
+    assert stats["stale_served"] == 3 and stats["refreshing"] == 1
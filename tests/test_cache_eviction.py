@@ -0,0 +1,79 @@
+import logging
+
+import pytest
+
+from app.core.config import CACHE_EVICTION_POLICIES, Settings
+from app.qa.cache import AnswerCache
+from app.qa.eviction import DEFAULT_REGENERATION_COST_MS, EVICTION_POLICIES, LFUPolicy, make_eviction_policy, regeneration_cost
+
+
+def _put(cache, question, vector, latency_ms=None):
+    response = {"answer": question, "citations": []}
+    if latency_ms is not None:
+        response["latency_ms"] = latency_ms
+    cache.put(question, vector, response)
+
+
+def test_gdsf_keeps_hot_and_expensive_answers_over_one_off_questions():
+    cache = AnswerCache(ttl_seconds=600, max_entries=3, similarity_threshold=0.9)
+    _put(cache, "qotd", [1.0, 0.0, 0.0, 0.0], latency_ms=12000)
+    for _ in range(3):
+        assert cache.get_exact("qotd") is not None
+    _put(cache, "slow one-off", [0.0, 1.0, 0.0, 0.0], latency_ms=20000)
+    _put(cache, "fast one-off", [0.0, 0.0, 1.0, 0.0], latency_ms=2000)
+
+    _put(cache, "newcomer", [0.0, 0.0, 0.0, 1.0], latency_ms=9000)
+
+    assert cache.get_exact("fast one-off") is None
+    assert cache.get_exact("qotd") is not None
+    assert cache.get_exact("slow one-off") is not None
+    assert cache.stats()["eviction"]["policy"] == "gdsf"
+
+
+def test_oldest_policy_ignores_hits():
+    cache = AnswerCache(ttl_seconds=600, max_entries=2, eviction_policy="oldest")
+    _put(cache, "first", [1.0, 0.0])
+    cache.get_exact("first")
+    _put(cache, "second", [0.0, 1.0])
+    _put(cache, "third", [0.7, 0.7])
+
+    assert cache.get_exact("first") is None
+    assert cache.stats()["eviction"]["evictions"] == 1
+
+
+def test_lfu_aging_lets_formerly_popular_entries_leave_the_cache():
+    cache = AnswerCache(ttl_seconds=600, max_entries=2, eviction_policy="lfu")
+    _put(cache, "old favourite", [1.0, 0.0, 0.0])
+    for _ in range(5):
+        cache.get_exact("old favourite")
+    _put(cache, "trend 0", [0.0, 1.0, 0.0])
+    assert cache.get_exact("old favourite") is not None  # still pinned by its hits
+
+    for i in range(1, 6):
+        # Each newcomer is asked twice before the next one arrives
+        cache.get_exact(f"trend {i - 1}")
+        cache.get_exact(f"trend {i - 1}")
+        _put(cache, f"trend {i}", [0.0, 1.0, float(i)])
+
+    # Without aging six hits would pin it forever; the rising clock lets it go
+    assert "old favourite" not in [e.question for e in cache.entries()]
+    assert cache.stats()["eviction"]["clock"] > 0
+
+
+def test_regeneration_cost_defaults_when_latency_is_missing():
+    assert regeneration_cost({"latency_ms": 18000}) == 18.0
+    assert regeneration_cost({}) == DEFAULT_REGENERATION_COST_MS / 1000
+    assert regeneration_cost({"latency_ms": "n/a"}) == DEFAULT_REGENERATION_COST_MS / 1000
+    assert isinstance(make_eviction_policy("lfu"), LFUPolicy)
+    with pytest.raises(ValueError):
+        make_eviction_policy("random")
+
+
+def test_unknown_eviction_policy_setting_falls_back_to_gdsf_at_startup(caplog):
+    assert sorted(CACHE_EVICTION_POLICIES) == sorted(EVICTION_POLICIES)
+    assert Settings(cache_eviction_policy=" LFU ").cache_eviction_policy == "lfu"
+
+    with caplog.at_level(logging.WARNING):
+        assert Settings(cache_eviction_policy="lru").cache_eviction_policy == "gdsf"
+
+    assert "CACHE_EVICTION_POLICY" in caplog.text
@@ -69,6 +69,7 @@ class TestCacheHeadlineSanitization:
         mock_cache_instance = Mock()
         mock_cache.return_value = mock_cache_instance
         mock_cache_instance.get_exact.return_value = None  # No exact match
+        mock_cache_instance.get_canonical.return_value = None
         
         bad_headline = "But where do I feel even the tiniest spark of quiet joy?"
         cached_response = {
@@ -0,0 +1,63 @@
+import threading
+
+import pytest
+
+from app.indexing.embedding_batcher import EmbeddingBatcher
+
+
+def _fake_embed(calls):
+    def embed(texts):
+        calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+    return embed
+
+
+def _embed_concurrently(batcher, texts_per_caller):
+    results = [None] * len(texts_per_caller)
+    start = threading.Barrier(len(texts_per_caller))
+
+    def call(i):
+        start.wait()
+        results[i] = batcher.embed(texts_per_caller[i])
+
+    threads = [threading.Thread(target=call, args=(i,)) for i in range(len(texts_per_caller))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results
+
+
+def test_concurrent_calls_share_one_request():
+    calls = []
+    batcher = EmbeddingBatcher(_fake_embed(calls), max_wait_ms=200, max_batch_size=100)
+    inputs = [["a"], ["bb"], ["ccc", "dddd"], ["eeeee"]]
+
+    results = _embed_concurrently(batcher, inputs)
+
+    assert results == [[[1.0]], [[2.0]], [[3.0], [4.0]], [[5.0]]]
+    assert len(calls) == 1
+    assert sorted(calls[0]) == ["a", "bb", "ccc", "dddd", "eeeee"]
+    assert batcher.stats()["calls_saved"] == 3
+
+
+def test_full_batch_is_sent_without_waiting_for_window():
+    calls = []
+    batcher = EmbeddingBatcher(_fake_embed(calls), max_wait_ms=10_000, max_batch_size=2)
+
+    results = _embed_concurrently(batcher, [["a"], ["bb"]])
+
+    assert results == [[[1.0]], [[2.0]]]
+    assert len(calls) == 1
+
+
+def test_lone_call_and_errors_reach_every_caller():
+    batcher = EmbeddingBatcher(_fake_embed([]), max_wait_ms=1)
+    assert batcher.embed(["hope"]) == [[4.0]]
+
+    def boom(texts):
+        raise RuntimeError("rate limited")
+
+    failing = EmbeddingBatcher(boom, max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="rate limited"):
+        failing.embed(["x"])
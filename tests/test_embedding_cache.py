@@ -0,0 +1,107 @@
+import pytest
+
+from app.indexing import embeddings
+from app.indexing.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def counted_provider(monkeypatch):
+    calls = []
+
+    def fake_embed(texts):
+        calls.append(list(texts))
+        return [[float(len(text)), 1.0, 0.5] for text in texts]
+
+    cache = EmbeddingCache(max_entries=3)
+    monkeypatch.setattr(embeddings.settings, "embedding_provider", "openai")
+    monkeypatch.setattr(embeddings.settings, "embedding_cache_enabled", True)
+    monkeypatch.setattr(embeddings.settings, "embedding_dim", 3)
+    monkeypatch.setattr(embeddings.settings, "embedding_batch_window_ms", 0)
+    monkeypatch.setattr(embeddings, "_embed_uncached", fake_embed)
+    monkeypatch.setattr("app.indexing.embedding_cache._embedding_cache", cache)
+    return calls, cache
+
+
+def test_repeated_query_skips_provider(counted_provider):
+    calls, cache = counted_provider
+
+    first = embeddings.embed_text("How do I heal?")
+    second = embeddings.embed_text("  How do   I heal? ")
+
+    assert first == second == [14.0, 1.0, 0.5]
+    assert calls == [["How do I heal?"]]
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_batch_embeds_only_unique_misses(counted_provider):
+    calls, _ = counted_provider
+    embeddings.embed_text("grief")
+
+    result = embeddings.embed_text_batch(["grief", "courage", "courage"])
+
+    assert calls == [["grief"], ["courage"]]
+    assert result == [[5.0, 1.0, 0.5], [7.0, 1.0, 0.5], [7.0, 1.0, 0.5]]
+
+
+def test_lru_evicts_least_recently_used(counted_provider):
+    calls, cache = counted_provider
+    for text in ("a", "bb", "ccc"):
+        embeddings.embed_text(text)
+    embeddings.embed_text("a")  # refresh "a"
+    embeddings.embed_text("dddd")  # evicts "bb"
+
+    embeddings.embed_text("a")
+    embeddings.embed_text("bb")
+
+    assert calls[-1] == ["bb"]
+    assert len(calls) == 5
+    assert cache.stats()["entries"] == 3
+
+
+def test_bulk_embedding_bypasses_cache(counted_provider):
+    calls, cache = counted_provider
+
+    embeddings.embed_text_batch(["chunk one", "chunk one"], use_cache=False)
+    embeddings.embed_text_batch(["chunk one"], use_cache=False)
+
+    assert len(calls) == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_cache_key_includes_model(counted_provider, monkeypatch):
+    calls, _ = counted_provider
+    embeddings.embed_text("hope")
+    monkeypatch.setattr(embeddings.settings, "embedding_model", "text-embedding-3-large")
+    embeddings.embed_text("hope")
+
+    assert len(calls) == 2
+
+
+def test_redis_tier_round_trips_float32_vectors():
+    class FakeRedis:
+        def __init__(self):
+            self.store = {}
+
+        def mget(self, keys):
+            return [self.store.get(key) for key in keys]
+
+        def pipeline(self, transaction=False):
+            return self
+
+        def set(self, key, value, ex=None):
+            self.store[key] = value
+
+        def execute(self):
+            return []
+
+    shared = FakeRedis()
+    writer, reader = EmbeddingCache(), EmbeddingCache()
+    writer._redis = reader._redis = shared
+    key = ("openai", "m", 3, "hope")
+
+    writer.put_many([key], [[0.25, -1.5, 2.0]])
+
+    assert reader.get_many([key]) == [[0.25, -1.5, 2.0]]
+    assert reader.stats()["redis_hits"] == 1
+    assert reader.get_many([key]) == [[0.25, -1.5, 2.0]]
+    assert reader.stats()["hits"] == 1
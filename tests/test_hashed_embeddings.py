@@ -0,0 +1,33 @@
+import hashlib
+import random
+
+from app.core import vectors
+from app.indexing.embeddings import _hashed_embeddings
+
+
+def _reference_hashed_embedding(text, dim):
+    """Per-text implementation the batched version must reproduce exactly."""
+    tokens = [t for t in text.lower().split() if t.isalpha()]
+    if not tokens:
+        return [0.0] * dim
+    vec = [0.0] * dim
+    for token in tokens:
+        h = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        vec[int(h[:8], 16) % dim] += 1.0
+    return vectors.to_list(vectors.normalize(vec))
+
+
+def _corpus(count=60, seed=5):
+    rng = random.Random(seed)
+    words = ["grief", "healing", "boundaries", "Courage", "love", "fear", "self-worth", "2024", "why?", "and", "the"]
+    texts = [" ".join(rng.choice(words) for _ in range(rng.randrange(0, 80))) for _ in range(count)]
+    return texts + ["", "123 456 !!!", "Hope hope HOPE"]
+
+
+def test_batched_hashed_embeddings_match_per_text_reference():
+    texts = _corpus()
+
+    batched = _hashed_embeddings(texts, 384)
+
+    assert batched == [_reference_hashed_embedding(text, 384) for text in texts]
+    assert batched[-2] == [0.0] * 384
@@ -0,0 +1,81 @@
+import sys
+import threading
+import types
+
+import numpy as np
+import pytest
+
+from app.indexing import embeddings
+
+
+class _FakeModel:
+    def __init__(self, name, **kwargs):
+        self.name = name
+        self.kwargs = kwargs
+
+    def encode(self, texts, batch_size=32):
+        return np.array([[float(len(text)), 0.0] for text in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def fake_runtime(monkeypatch):
+    loads = []
+
+    def fake_sentence_transformer(name, **kwargs):
+        loads.append(kwargs)
+        return _FakeModel(name, **kwargs)
+
+    class FakeSessionOptions:
+        intra_op_num_threads = 0
+        inter_op_num_threads = 0
+
+    monkeypatch.setitem(sys.modules, "sentence_transformers", types.SimpleNamespace(SentenceTransformer=fake_sentence_transformer))
+    monkeypatch.setitem(sys.modules, "onnxruntime", types.SimpleNamespace(SessionOptions=FakeSessionOptions))
+    monkeypatch.setattr(embeddings, "_embedding_model", None)
+    monkeypatch.setattr(embeddings, "_local_model_stats", dict(embeddings._local_model_stats, load_ms=None, batches=0, texts=0, encode_ms=0.0))
+    monkeypatch.setattr(embeddings.settings, "embedding_provider", "onnx")
+    monkeypatch.setattr(embeddings.settings, "embedding_cache_enabled", False)
+    monkeypatch.setattr(embeddings.settings, "onnx_embedding_threads", 3)
+    return loads
+
+
+def test_onnx_provider_loads_quantized_model_with_bounded_threads(fake_runtime):
+    vector = embeddings.embed_text("hope")
+
+    assert vector == [4.0, 0.0]
+    assert len(fake_runtime) == 1
+    kwargs = fake_runtime[0]
+    assert kwargs["backend"] == "onnx"
+    assert kwargs["model_kwargs"]["file_name"] == embeddings.settings.onnx_embedding_file
+    assert kwargs["model_kwargs"]["session_options"].intra_op_num_threads == 3
+
+
+def test_concurrent_first_requests_share_one_load(fake_runtime):
+    threads = [threading.Thread(target=embeddings.embed_text, args=("grief",)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(fake_runtime) == 1
+    assert embeddings.local_model_stats()["texts"] == 8
+
+
+def test_warm_up_reports_load_time_and_throughput(fake_runtime):
+    embeddings.warm_embedding_model()
+    embeddings.embed_text_batch(["a", "bb", "ccc"])
+
+    stats = embeddings.local_model_stats()
+    assert stats["loaded"] is True
+    assert stats["load_ms"] is not None
+    assert stats["batches"] == 2 and stats["texts"] == 4
+    assert stats["last_batch_size"] == 3
+    assert stats["texts_per_second"] is None or stats["texts_per_second"] > 0
+
+
+def test_onnx_cache_key_differs_from_pytorch_model(monkeypatch):
+    monkeypatch.setattr(embeddings.settings, "embedding_provider", "onnx")
+    onnx_name = embeddings._embedding_model_name()
+    monkeypatch.setattr(embeddings.settings, "embedding_provider", "sentence_transformers")
+
+    assert onnx_name != embeddings._embedding_model_name()
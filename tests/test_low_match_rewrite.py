@@ -0,0 +1,54 @@
+import logging
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from app.core.config import Settings
+from app.qa import service
+from app.qa.preprocessing import preprocess_query
+
+
+def test_batched_mode_embeds_the_rewrite_only_when_asked_after_a_cache_miss(monkeypatch):
+    calls = []
+    monkeypatch.setattr(service, "embed_text", lambda text: calls.append(text) or [2.0])
+
+    monkeypatch.setattr(service.settings, "low_match_rewrite_mode", "batched")
+    assert service._batched_rewrite_embedding("how do i heal; focus on heal?") == [2.0]
+    assert service._batched_rewrite_embedding(None) is None
+
+    monkeypatch.setattr(service.settings, "low_match_rewrite_mode", "sequential")
+    assert service._batched_rewrite_embedding("rewrite?") is None
+    assert calls == ["how do i heal; focus on heal?"]
+
+
+def test_cache_hit_never_embeds_or_searches_the_rewrite(monkeypatch):
+    embedded = []
+    cached = {"answer": "A cached reflection on healing.", "citations": [], "answer_source": "openai",
+              "answer_status": "generated"}
+    monkeypatch.setattr(service.settings, "low_match_rewrite_mode", "batched")
+    monkeypatch.setattr(service, "embed_text", lambda text: embedded.append(text) or [1.0, 0.0])
+    monkeypatch.setattr(service, "get_answer_cache", lambda: SimpleNamespace(
+        get_exact=lambda q: None, get_canonical=lambda q: None, get=lambda q, embedding: dict(cached),
+    ))
+
+    result = service.answer_question(Mock(), "How can I heal after a loss?", user_ip="1.2.3.4", log_interaction=False)
+
+    assert result["answer"] == cached["answer"]
+    assert len(embedded) == 1  # only the retrieval query
+
+
+def test_low_match_rewrite_mode_setting_is_validated(caplog):
+    assert Settings(low_match_rewrite_mode="Batched").low_match_rewrite_mode == "batched"
+    assert Settings().low_match_rewrite_mode == "sequential"
+
+    with caplog.at_level(logging.WARNING):
+        assert Settings(low_match_rewrite_mode="speculatve").low_match_rewrite_mode == "sequential"
+
+    assert "LOW_MATCH_REWRITE_MODE" in caplog.text
+
+
+def test_rewrite_query_is_skipped_when_identical_to_retrieval_query():
+    processed = preprocess_query("What does courage look like in everyday life?")
+    rewrite = service._low_match_rewrite_query(processed, "something else")
+
+    assert rewrite and "focus on" in rewrite
+    assert service._low_match_rewrite_query(processed, rewrite.upper()) is None
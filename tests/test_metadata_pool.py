@@ -0,0 +1,75 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock
+
+import pytest
+
+from app.core.config import settings
+from app.qa import answer, metadata_pool, service
+
+ANSWER = ("Grief softens when you let it move through you instead of rushing it. "
+          "You can give it room today by naming one memory out loud.")
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(metadata_pool, "_executor", executor)
+    monkeypatch.setattr(metadata_pool, "_stats", {
+        "submitted": 0, "rejected": 0, "queued": 0, "peak_queued": 0, "completed": 0, "failed": 0,
+    })
+    monkeypatch.setattr(settings, "metadata_max_queued", 2)
+    monkeypatch.setattr(settings, "metadata_headline_max_queued", 1)
+    yield metadata_pool
+    executor.shutdown(wait=True)
+
+
+def test_saturated_queue_sheds_headlines_first_then_everything(pool):
+    running, release = threading.Event(), threading.Event()
+    headline_rejected = pool.REJECTED.value(task=pool.HEADLINE)
+    waits_before = pool.QUEUE_WAIT_SECONDS.snapshot(task=pool.HEADLINE)["count"]
+
+    def busy():
+        running.set()
+        release.wait(5)
+        return ["Busy?"]
+
+    blocker = pool.submit(pool.FOLLOW_UPS, busy)
+    assert running.wait(5)  # the only worker is taken; later tasks queue
+    headline = pool.submit(pool.HEADLINE, lambda: "Queued headline.")
+    assert pool.submit(pool.HEADLINE, lambda: "Shed headline.") is None
+    follow_ups = pool.submit(pool.FOLLOW_UPS, lambda: ["Queued?"])
+    assert pool.submit(pool.FOLLOW_UPS, lambda: ["Shed?"]) is None
+    assert pool.get_metadata_pool_stats()["queued"] == 2
+
+    release.set()
+    assert blocker.result(5) == ["Busy?"] and headline.result(5) == "Queued headline."
+    assert follow_ups.result(5) == ["Queued?"]
+
+    stats = pool.get_metadata_pool_stats()
+    assert stats["queued"] == 0 and stats["peak_queued"] == 2
+    assert stats["submitted"] == 3 and stats["rejected"] == 2 and stats["completed"] == 3
+    assert pool.REJECTED.value(task=pool.HEADLINE) == headline_rejected + 1
+    assert pool.QUEUE_WAIT_SECONDS.snapshot(task=pool.HEADLINE)["count"] == waits_before + 1
+
+
+def test_cancelled_queued_task_frees_its_slot(pool):
+    release = threading.Event()
+    pool.submit(pool.FOLLOW_UPS, release.wait, 5)
+    queued = pool.submit(pool.FOLLOW_UPS, lambda: ["Never runs?"])
+
+    assert queued.cancel()
+    assert pool.get_metadata_pool_stats()["queued"] == 0
+    release.set()
+
+
+def test_shed_headline_comes_from_the_answer_without_an_openai_call(pool, monkeypatch):
+    monkeypatch.setattr(settings, "metadata_headline_max_queued", 0)
+    monkeypatch.setattr(answer, "generate_follow_up_questions", lambda *args: ["What next?"])
+    monkeypatch.setattr(answer, "generate_shareable_headline", Mock(side_effect=AssertionError("OpenAI call")))
+
+    metadata = service._start_answer_metadata("How do I grieve?", ANSWER, [], {}, "non-stream flow")()
+
+    assert metadata["follow_up_questions"] == ["What next?"]
+    assert metadata["shareable_headline"] == answer._fallback_shareable_headline("How do I grieve?", ANSWER)
+    assert metadata["shareable_headline"]
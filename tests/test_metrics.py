@@ -0,0 +1,43 @@
+import pytest
+
+from app.core import metrics
+from app.qa.cache import CACHE_LOOKUPS, CACHE_SIMILARITY, AnswerCache
+
+
+def test_counters_and_histograms_render_in_prometheus_text_format():
+    requests = metrics.counter("test_requests_total", "Requests", ("path",))
+    latency = metrics.histogram("test_latency_seconds", "Latency", buckets=(0.1, 1.0))
+    requests.inc(path='/a"b')
+    requests.inc(2, path='/a"b')
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value)
+
+    assert metrics.counter("test_requests_total", "Requests", ("path",)) is requests
+    text = metrics.render()
+    assert "# TYPE test_requests_total counter" in text
+    assert 'test_requests_total{path="/a\\"b"} 3' in text
+    assert 'test_latency_seconds_bucket{le="0.1"} 2' in text  # upper bounds are inclusive
+    assert 'test_latency_seconds_bucket{le="1"} 3' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "test_latency_seconds_sum 3.65" in text and "test_latency_seconds_count 4" in text
+
+    with pytest.raises(ValueError):
+        requests.inc(route="/a")
+    with pytest.raises(ValueError):
+        metrics.gauge("test_requests_total", "Requests")
+
+
+def test_answer_cache_counts_lookups_by_method_and_near_miss_similarity():
+    before = {
+        outcome: CACHE_LOOKUPS.value(method="similarity", outcome=outcome) for outcome in ("hit", "miss")
+    }
+    near_misses = CACHE_SIMILARITY.snapshot(outcome="miss")["buckets"][0.88]
+    cache = AnswerCache(ttl_seconds=60, similarity_threshold=0.9)
+    cache.put("how do i heal", [1.0, 0.0], {"answer": "healing", "citations": []})
+
+    assert cache.get("how can i heal", [0.99, 0.1]) is not None
+    assert cache.get("how do i grieve", [0.87, 0.49]) is None  # cosine ≈ 0.871
+
+    assert CACHE_LOOKUPS.value(method="similarity", outcome="hit") == before["hit"] + 1
+    assert CACHE_LOOKUPS.value(method="similarity", outcome="miss") == before["miss"] + 1
+    assert CACHE_SIMILARITY.snapshot(outcome="miss")["buckets"][0.88] == near_misses + 1
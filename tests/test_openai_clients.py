@@ -0,0 +1,58 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core import openai_clients
+
+
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = b'{"ok": true}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def local_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_pooled_requests_reuse_connections_and_report_setup_time(local_server):
+    pool = openai_clients.BACKGROUND
+    new_before = openai_clients.REQUESTS.value(pool=pool, connection="new")
+    reused_before = openai_clients.REQUESTS.value(pool=pool, connection="reused")
+
+    with openai_clients._sync_http_client(pool) as http, openai_clients.track_connections() as usage:
+        for _ in range(3):
+            assert http.get(f"{local_server}/v1/models").status_code == 200
+        timings = openai_clients.connection_timings()
+
+    assert usage["new"] == 1 and usage["reused"] == 2
+    assert openai_clients.REQUESTS.value(pool=pool, connection="new") == new_before + 1
+    assert openai_clients.REQUESTS.value(pool=pool, connection="reused") == reused_before + 2
+    assert timings["openai_connections_reused"] == 2 and timings["openai_connections_new"] == 1
+    assert openai_clients.connection_timings() == {}  # nothing tracked outside the request
+
+
+def test_clients_are_shared_per_pool_and_rebuilt_on_key_change(monkeypatch):
+    monkeypatch.setattr(openai_clients, "_clients", {})
+
+    interactive = openai_clients.get_openai_client("sk-test")
+    assert openai_clients.get_openai_client("sk-test") is interactive
+    background = openai_clients.get_openai_client("sk-test", pool=openai_clients.BACKGROUND)
+    assert background is not interactive
+    assert openai_clients.get_openai_client("sk-rotated") is not interactive
@@ -0,0 +1,77 @@
+import math
+import random
+from types import SimpleNamespace
+
+from app.qa.retrieval import _mmr_select
+
+
+def _reference_mmr(candidates, top_k, diversity_lambda):
+    """The original pure-Python MMR loop, kept here as the behavioural spec."""
+
+    def cosine(a, b):
+        dot = sum(x * y for x, y in zip(a, b))
+        norm_a = math.sqrt(sum(x * x for x in a))
+        norm_b = math.sqrt(sum(x * x for x in b))
+        if norm_a == 0 or norm_b == 0:
+            return 0.0
+        return dot / (norm_a * norm_b)
+
+    selected = [candidates[0]]
+    seen_episodes = {candidates[0][0].episode_id}
+    while len(selected) < top_k:
+        best_score = -1
+        best = None
+        for chunk, similarity in candidates:
+            if chunk.episode_id in seen_episodes:
+                continue
+            max_sim = max(cosine(chunk.embedding, sel.embedding) for sel, _ in selected)
+            score = diversity_lambda * similarity + (1 - diversity_lambda) * (1.0 - max_sim)
+            if score > best_score:
+                best_score = score
+                best = (chunk, similarity)
+        if not best:
+            break
+        selected.append(best)
+        seen_episodes.add(best[0].episode_id)
+    return selected
+
+
+def _candidates(count, episodes, dim=32, seed=7):
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(count):
+        chunk = SimpleNamespace(
+            id=i,
+            episode_id=rng.randrange(episodes),
+            embedding=[rng.gauss(0, 1) for _ in range(dim)],
+        )
+        candidates.append((chunk, 0.9 - i * 0.01))
+    return candidates
+
+
+def test_mmr_select_matches_reference_selection():
+    for seed in range(5):
+        candidates = _candidates(30, episodes=12, seed=seed)
+        for diversity_lambda in (0.0, 0.5, 0.7, 1.0):
+            expected = [c.id for c, _ in _reference_mmr(candidates, 6, diversity_lambda)]
+            actual = [c.id for c, _ in _mmr_select(candidates, 6, diversity_lambda)]
+            assert actual == expected
+
+
+def test_mmr_select_keeps_one_chunk_per_episode():
+    candidates = _candidates(20, episodes=3)
+
+    selected = _mmr_select(candidates, 6, 0.7)
+
+    episode_ids = [chunk.episode_id for chunk, _ in selected]
+    assert len(episode_ids) == len(set(episode_ids)) == 3
+    assert selected[0] is candidates[0]
+
+
+def test_mmr_select_treats_zero_vectors_as_orthogonal():
+    zero = SimpleNamespace(id=0, episode_id=1, embedding=[0.0, 0.0])
+    other = SimpleNamespace(id=1, episode_id=2, embedding=[1.0, 0.0])
+
+    selected = _mmr_select([(zero, 0.8), (other, 0.5)], 2, 0.7)
+
+    assert [chunk.id for chunk, _ in selected] == [0, 1]
@@ -0,0 +1,98 @@
+from sqlalchemy.dialects import postgresql
+
+from app.qa import retrieval
+
+
+class _RowsSession:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    def execute(self, stmt):
+        self.statements.append(stmt)
+        return self
+
+    def all(self):
+        return self.rows
+
+
+def test_pgvector_search_projects_columns_and_joins_episode():
+    rows = [
+        (1, 10, 0.0, 30.0, "first", [1.0, 0.0], "Ep 10", "https://a/10.mp3", 2024, 0.1, 0),
+        (2, 10, 30.0, 60.0, "second", [0.0, 1.0], "Ep 10", "https://a/10.mp3", 2024, 0.2, 0),
+        (3, 11, 0.0, 30.0, "third", [0.5, 0.5], "Ep 11", None, None, 0.4, 0),
+    ]
+    db = _RowsSession(rows)
+
+    results = retrieval._search_pgvector(db, [[1.0, 0.0]], 30)[0]
+
+    sql = str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert "JOIN episodes" in sql
+    assert "chunks.topic" not in sql and "episodes.description" not in sql
+
+    chunk, similarity = results[0]
+    assert (chunk.id, chunk.text, chunk.start_time) == (1, "first", 0.0)
+    assert abs(similarity - 0.9) < 1e-9
+    assert chunk.episode.title == "Ep 10" and chunk.episode.published_year == 2024
+    # Records from the same episode share one EpisodeInfo instance
+    assert results[1][0].episode is chunk.episode
+    assert results[2][0].episode.published_year is None
+
+
+def test_episode_map_from_chunks_needs_no_query():
+    records = retrieval._records_from_rows([
+        (1, 10, 0.0, 1.0, "a", [1.0], "Ep 10", "u", 2023),
+        (2, 11, 0.0, 1.0, "b", [1.0], "Ep 11", "v", 2022),
+    ])
+
+    episode_map = retrieval.episode_map_from_chunks(records)
+
+    assert sorted(episode_map) == [10, 11]
+    assert episode_map[11].audio_url == "v"
+
+
+def test_pgvector_multi_query_search_uses_one_round_trip():
+    rows = [
+        # UNION ALL branches may come back interleaved
+        (2, 10, 0.0, 1.0, "b", [0.0, 1.0], "Ep 10", "u", 2024, 0.3, 1),
+        (1, 10, 0.0, 1.0, "a", [1.0, 0.0], "Ep 10", "u", 2024, 0.1, 0),
+        (3, 11, 0.0, 1.0, "c", [1.0, 1.0], "Ep 11", "v", 2023, 0.2, 1),
+    ]
+    db = _RowsSession(rows)
+
+    original, rewrite = retrieval._search_pgvector(db, [[1.0, 0.0], [0.0, 1.0]], 30)
+
+    assert len(db.statements) == 1
+    assert "UNION ALL" in str(db.statements[0].compile(dialect=postgresql.dialect()))
+    assert [chunk.id for chunk, _ in original] == [1]
+    assert [chunk.id for chunk, _ in rewrite] == [3, 2]
+    # Episode metadata is shared across both queries' results
+    assert original[0][0].episode is rewrite[1][0].episode
+
+
+def test_retrieval_result_builds_answer_and_citation_payloads_in_one_pass():
+    records = retrieval._records_from_rows([
+        (1, 10, 0.0, 30.0, "a", [1.0], "Ep 10", None, 2023),
+        (2, 10, 30.0, 60.0, "b", [1.0], "Ep 10", None, 2023),
+        (3, 11, 0.0, 30.0, "c", [1.0], "Ep 11", "v", None),
+    ])
+    answer_chunks = [(records[0], 0.9), (records[1], 0.8), (records[2], 0.7)]
+    citation = {"episode_id": 10, "chunk": records[0], "similarity": 0.9,
+                "relevance_score": 88.0, "total_relevant_chunks": 2}
+
+    result = retrieval.RetrievalResult.from_two_tier(
+        {"answer_chunks": answer_chunks, "citation_episodes": [citation]}
+    )
+
+    assert [p["text"] for p in result.chunk_payloads] == ["a", "b", "c"]
+    assert result.chunk_payloads[0]["episode"] == {
+        "id": 10, "title": "Ep 10", "audio_url": "", "published_year": 2023,
+    }
+    assert result.chunk_payloads[1]["episode"] is result.chunk_payloads[0]["episode"]
+    cited = result.citation_payloads[0]
+    assert (cited["similarity"], cited["relevance_score"], cited["total_relevant_chunks"]) == (0.9, 88.0, 2)
+    assert cited["episode"] is result.chunk_payloads[0]["episode"]  # same published_year as the stream path
+
+    rewrite = retrieval.RetrievalResult.from_chunks([(records[2], 0.95)], result.episode_payloads)
+    assert rewrite.citation_payloads is None
+    assert rewrite.chunk_payloads[0]["episode"] is result.chunk_payloads[2]["episode"]
@@ -45,13 +45,13 @@ def _override_db(db):
 def test_ask_route_validates_and_returns_answer(monkeypatch):
     captured = {}
 
-    def fake_answer_question(db, question, user_ip):
+    async def fake_answer_question_async(db, question, user_ip):
         captured["db"] = db
         captured["question"] = question
         captured["user_ip"] = user_ip
         return {"answer": "ok", "citations": [], "question": question}
 
-    monkeypatch.setattr("app.qa.service.answer_question", fake_answer_question)
+    monkeypatch.setattr("app.qa.service.answer_question_async", fake_answer_question_async)
     clear_rate_limits()
 
     app.dependency_overrides[get_db] = _override_db(object())
@@ -80,11 +80,11 @@ def test_ask_route_rejects_empty_question():
 
 
 def test_ask_stream_route_returns_sse(monkeypatch):
-    def fake_answer_question_stream(db, question, user_ip, context):
+    async def fake_answer_question_stream_async(db, question, user_ip, context):
         yield 'data: {"type":"chunk","text":"Hello"}\n\n'
         yield 'data: {"type":"done","qa_log_id":1,"latency_ms":5}\n\n'
 
-    monkeypatch.setattr("app.qa.service.answer_question_stream", fake_answer_question_stream)
+    monkeypatch.setattr("app.qa.service.answer_question_stream_async", fake_answer_question_stream_async)
     clear_rate_limits()
 
     app.dependency_overrides[get_db] = _override_db(object())
@@ -104,7 +104,7 @@ def test_ask_route_blocks_malicious_prompt(monkeypatch):
     called = {"value": False}
     logged = {}
 
-    def fake_answer_question(db, question, user_ip):
+    async def fake_answer_question_async(db, question, user_ip):
         called["value"] = True
         return {"answer": "ok", "citations": [], "question": question}
 
@@ -114,7 +114,7 @@ def test_ask_route_blocks_malicious_prompt(monkeypatch):
         logged["code"] = decision.code
         logged["route"] = route
 
-    monkeypatch.setattr("app.qa.service.answer_question", fake_answer_question)
+    monkeypatch.setattr("app.qa.service.answer_question_async", fake_answer_question_async)
     monkeypatch.setattr(ask_routes, "log_guardrail_block", fake_log_guardrail_block)
     clear_rate_limits()
 
@@ -135,11 +135,11 @@ def test_ask_route_blocks_malicious_prompt(monkeypatch):
 def test_ask_route_allows_sensitive_but_sincere_question(monkeypatch):
     captured = {}
 
-    def fake_answer_question(db, question, user_ip):
+    async def fake_answer_question_async(db, question, user_ip):
         captured["question"] = question
         return {"answer": "ok", "citations": [], "question": question}
 
-    monkeypatch.setattr("app.qa.service.answer_question", fake_answer_question)
+    monkeypatch.setattr("app.qa.service.answer_question_async", fake_answer_question_async)
     clear_rate_limits()
 
     app.dependency_overrides[get_db] = _override_db(object())
@@ -197,6 +197,26 @@ def test_ingest_route_accepts_request(monkeypatch):
     assert called["count"] == 1
 
 
+def test_retrieval_index_reload_route_forces_a_full_reload(monkeypatch):
+    calls = []
+
+    class FakeIndex:
+        def refresh_in_background(self, full=False):
+            calls.append(full)
+            return True
+
+    monkeypatch.setattr(ingest_routes, "admin_auth", lambda credentials, request: None)
+    monkeypatch.setattr(ingest_routes.settings, "retrieval_backend", "memory")
+    monkeypatch.setattr("app.qa.vector_index.get_chunk_index", lambda: FakeIndex())
+
+    client = TestClient(app)
+    response = client.post("/admin/retrieval-index/reload", auth=("admin", "secret"))
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "accepted"}
+    assert calls == [True]
+
+
 def test_status_route_reports_ready_state():
     mark_db_initialized()
 
@@ -231,3 +251,20 @@ def test_health_route_is_available():
 
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+
+
+def test_metrics_route_exports_prometheus_text(monkeypatch):
+    from app.qa import cache as cache_module
+
+    cache = cache_module.AnswerCache(ttl_seconds=60)
+    monkeypatch.setattr(cache_module, "_answer_cache", cache)
+    cache.put("how do i heal", [1.0, 0.0], {"answer": "healing", "citations": []})
+    cache.get_exact("how do i heal")
+
+    response = TestClient(app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE answer_cache_lookups_total counter" in response.text
+    assert 'answer_cache_lookups_total{method="exact",outcome="hit"}' in response.text
+    assert "answer_cache_entries 1" in response.text
@@ -369,6 +369,7 @@ class TestIntegrationWithAnswerFlow:
         
         with patch('app.core.config.settings') as mock_settings:
             mock_settings.answer_generation_provider = "openai"
+            mock_settings.answer_structured_generation = False
             with patch('app.qa.answer.os.getenv', return_value='test-key'):
                 result = compose_answer("Test question?", chunks, include_followups=True)
         
@@ -398,6 +399,7 @@ class TestIntegrationWithAnswerFlow:
         
         with patch('app.core.config.settings') as mock_settings:
             mock_settings.answer_generation_provider = "openai"
+            mock_settings.answer_structured_generation = False
             with patch('app.qa.answer.os.getenv', return_value='test-key'):
                 result = compose_answer("Test question?", chunks, include_followups=False)
         
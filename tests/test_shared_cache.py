@@ -0,0 +1,87 @@
+import numpy as np
+
+from app.qa.cache import AnswerCache, CacheEntry, encode_entry
+from app.qa.shared_cache import SharedAnswerStore, open_shared_store
+
+ANSWER = "A complete cached reflection about healing and patience that easily clears the one hundred char minimum."
+
+
+def _workers(path, count=2, **kwargs):
+    """Caches as separate uvicorn workers would build them: one store mapping per worker."""
+    return [
+        AnswerCache(
+            ttl_seconds=600,
+            max_entries=4,
+            similarity_threshold=0.9,
+            shared_store=SharedAnswerStore(str(path), capacity=8, dim=3, entry_bytes=4096),
+            **kwargs,
+        )
+        for _ in range(count)
+    ]
+
+
+def test_answer_put_by_one_worker_is_a_hit_in_another(tmp_path):
+    first, second = _workers(tmp_path / "tier")
+    first.put("how do i heal", [1.0, 0.0, 0.0], {"answer": ANSWER, "citations": [], "latency_ms": 9000})
+
+    hit = second.get("how can i heal", [0.97, 0.05, 0.0])
+    assert hit["answer"] == ANSWER and hit["cache_similarity"] > 0.99
+    assert second.get_exact("how do i heal")["answer"] == ANSWER
+    assert second.stats()["entries"] == 1  # promoted into the worker's L1
+    assert second.stats()["shared"]["hits"] == 1  # the exact hit was then served from L1
+
+    assert second.delete("how do i heal")
+    assert first.get_exact("how do i heal")["answer"] == ANSWER  # first worker's L1 copy
+    assert AnswerCache(shared_store=SharedAnswerStore(str(tmp_path / "tier"), 8, 3, 4096)).get_exact(
+        "how do i heal") is None
+
+
+def test_full_tier_overwrites_oldest_and_skips_oversized_entries(tmp_path):
+    store = SharedAnswerStore(str(tmp_path / "tier"), capacity=2, dim=2, entry_bytes=512)
+    for i, created_at in enumerate((100.0, 50.0, 200.0)):
+        entry = CacheEntry(f"q{i}", [1.0, float(i)], {"answer": "a"}, created_at=created_at)
+        assert store.put(entry, encode_entry(entry))
+
+    assert store.get_exact("q1", min_created_at=0) is None  # oldest went first
+    assert store.get_exact("q0", min_created_at=0).created_at == 100.0
+    assert store.get_exact("q0", min_created_at=150) is None  # expired for this reader
+
+    big = CacheEntry("big", [0.0, 1.0], {"answer": "x" * 4000, "noise": list(range(400))})
+    assert not store.put(big, encode_entry(big))
+    assert store.stats()["skipped_oversize"] == 1
+
+
+def test_expired_or_torn_best_match_does_not_hide_the_next_live_one(tmp_path):
+    store = SharedAnswerStore(str(tmp_path / "tier"), capacity=4, dim=2, entry_bytes=512)
+    for question, unit, created_at in (("old", [1.0, 0.0], 100.0), ("fresh", [0.98, 0.2], 500.0)):
+        entry = CacheEntry(question, unit, {"answer": "a"}, created_at=created_at)
+        assert store.put(entry, encode_entry(entry))
+    query = np.array([1.0, 0.01], dtype=np.float32) / np.linalg.norm([1.0, 0.01])
+
+    entry, score = store.get_similar(query, threshold=0.9, min_created_at=200.0)
+    assert entry.question == "fresh" and score > 0.9
+
+    assert store.get_similar(query, threshold=0.9, min_created_at=0.0)[0].question == "old"
+    old_slot = int(np.flatnonzero(store._table["created_at"] == 100.0)[0])
+    store._mm[store._payload_offset + old_slot * store.entry_bytes] ^= 0xFF  # a torn payload
+    assert store._read_slot(old_slot, 0.0) is None
+    entry, _ = store.get_similar(query, threshold=0.9, min_created_at=0.0)
+    assert entry.question == "fresh"  # the torn best row falls through to the next candidate
+
+
+def test_only_one_worker_claims_hydration_and_layout_changes_start_fresh(tmp_path):
+    path = str(tmp_path / "tier")
+    first = SharedAnswerStore(path, capacity=4, dim=3, entry_bytes=1024)
+    second = SharedAnswerStore(path, capacity=4, dim=3, entry_bytes=1024)
+    assert first.claim_hydration(3600)
+    assert not second.claim_hydration(3600)
+
+    entry = CacheEntry("q", [1.0, 0.0, 0.0], {"answer": "a"})
+    first.put(entry, encode_entry(entry))
+    resized = SharedAnswerStore(path, capacity=8, dim=3, entry_bytes=1024)
+    assert resized.get_exact("q", 0) is None and resized.claim_hydration(3600)
+    assert second.get_exact("q", 0) is not None  # old mapping keeps working until restart
+
+
+def test_open_shared_store_falls_back_when_path_is_unusable(tmp_path):
+    assert open_shared_store(str(tmp_path / "missing" / "tier"), 4, 3, 1024) is None
@@ -0,0 +1,230 @@
+import json
+import threading
+from unittest.mock import Mock
+
+import anyio
+
+from app.qa import service
+from app.qa.singleflight import FlightIdle, SingleFlight
+
+RESULT = {"answer": "shared answer", "citations": []}
+
+
+def test_followers_by_question_or_embedding_share_the_leaders_answer():
+    flights = SingleFlight(similarity_threshold=0.9)
+    flight, leading = flights.join("how do i heal", [1.0, 0.0])
+    assert leading
+
+    results = []
+    joined = threading.Barrier(3)
+
+    def follow(key, embedding):
+        follower, leader = flights.join(key, embedding)
+        assert not leader and follower is flight
+        joined.wait()
+        results.append(flights.wait(follower, timeout=5))
+
+    threads = [
+        threading.Thread(target=follow, args=("how do i heal", [1.0, 0.0])),
+        threading.Thread(target=follow, args=("how can i heal", [0.98, 0.1])),
+    ]
+    for thread in threads:
+        thread.start()
+    joined.wait()
+    flights.complete(flight, RESULT)
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [RESULT, RESULT] and results[0] is not RESULT
+    assert flights.join("what is grief", [0.0, 1.0])[1]  # unrelated question leads its own flight
+    stats = flights.stats()
+    assert stats["deduplicated"] == 2 and stats["deduplicated_by_embedding"] == 1
+    assert stats["shared"] == 2 and stats["waiting"] == 0
+
+
+def test_stream_followers_replay_events_and_heartbeat_while_idle():
+    flights = SingleFlight(poll_seconds=0.01)
+    flight, _ = flights.join("q", [1.0])
+    flights.publish(flight, "chunk-1")
+    follower, leading = flights.join("q", [1.0], stream=True)
+    assert not leading
+
+    replay = flights.follow(follower, timeout=5)
+    assert next(replay) == "chunk-1"  # events published before joining are replayed
+    assert next(replay) is None  # heartbeat: the leader is quiet
+    flights.publish(flight, "chunk-2")
+    flights.complete(flight, RESULT)
+
+    events = []
+    try:
+        while True:
+            events.append(next(replay))
+    except StopIteration as finished:
+        assert finished.value == RESULT
+    assert [e for e in events if e is not None] == ["chunk-2"]
+    assert flights.stats()["stream_followers"] == 1
+
+
+def test_non_blocking_followers_await_the_leader_without_a_thread():
+    flights = SingleFlight(poll_seconds=5)
+    flight, _ = flights.join("q", [1.0])
+    follower, _ = flights.join("q", [1.0], stream=True)
+    replay = flights.follow(follower, timeout=10, blocking=False)
+
+    async def main():
+        idle = next(replay)
+        assert isinstance(idle, FlightIdle)
+        # The leader publishes from a worker thread while the follower awaits on the loop
+        threading.Timer(0.05, flights.publish, args=(flight, "chunk-1")).start()
+        with anyio.fail_after(2):
+            await idle.wait()
+        assert next(replay) == "chunk-1"
+        idle = next(replay)
+        flights.complete(flight, RESULT)
+        await idle.wait()  # already finished: returns at once
+
+    anyio.run(main)
+    try:
+        next(replay)
+    except StopIteration as finished:
+        assert finished.value == RESULT
+    assert follower.async_waiters == []
+
+
+def test_released_or_timed_out_flights_leave_followers_to_generate():
+    flights = SingleFlight(max_waiters=1)
+    flight, _ = flights.join("q", [1.0])
+    follower, _ = flights.join("q", [1.0])
+    assert flights.join("q", [1.0]) == (None, True)  # too many blocked followers
+
+    assert flights.wait(follower, timeout=0.01) is None
+    flights.release(flight)
+    flights.complete(flight, RESULT)  # no-op once released
+    assert flights.join("q", [1.0])[1]  # the key is free for a new leader
+
+    stats = flights.stats()
+    assert stats["unshared"] == 1 and stats["over_capacity"] == 1 and stats["leaders"] == 2
+
+
+def _coalesce_with(monkeypatch, stub_answer_pipeline, flights):
+    stub_answer_pipeline(flights=flights)
+    monkeypatch.setattr(service, "_retrieve_for_answer",
+                        lambda *args, **kwargs: (_ for _ in ()).throw(AssertionError("follower must not retrieve")))
+    return Mock()
+
+
+def test_answer_question_follower_returns_the_leaders_answer(monkeypatch, stub_answer_pipeline):
+    flights = SingleFlight()
+    db = _coalesce_with(monkeypatch, stub_answer_pipeline, flights)
+    flight, _ = flights.join("how do i heal", [1.0, 0.0])
+    threading.Timer(0.05, flights.complete, args=(flight, dict(RESULT, qa_log_id=7))).start()
+
+    result = service.answer_question(db, "How do I heal?", user_ip="1.2.3.4", log_interaction=False)
+
+    assert result["answer"] == "shared answer" and result["coalesced"] is True
+    assert result["question"] == "How do I heal?" and result["qa_log_id"] == 7
+    db.close.assert_called_once()  # the follower doesn't hold its DB session while waiting
+
+
+def test_answer_question_stream_follower_replays_the_leaders_events(monkeypatch, stub_answer_pipeline):
+    flights = SingleFlight(poll_seconds=0.01)
+    db = _coalesce_with(monkeypatch, stub_answer_pipeline, flights)
+    flight, _ = flights.join("how do i heal", [1.0, 0.0])
+    chunk = f"data: {json.dumps({'type': 'chunk', 'text': 'shared answer'})}\n\n"
+    flights.publish(flight, chunk)
+    threading.Timer(0.05, flights.complete, args=(flight, dict(RESULT, answer_status="generated"))).start()
+
+    events = list(service.answer_question_stream(db, "How do I heal?", user_ip="1.2.3.4", log_interaction=False))
+
+    assert chunk in events
+    done = json.loads(events[-1][len("data: "):])
+    assert done["type"] == "done" and done["coalesced"] is True and done["answer_status"] == "generated"
+    assert flights.stats()["stream_followers"] == 1
+
+
+def test_async_stream_follower_waits_for_the_leader_on_the_event_loop(monkeypatch, stub_answer_pipeline):
+    flights = SingleFlight(poll_seconds=5)
+    db = _coalesce_with(monkeypatch, stub_answer_pipeline, flights)
+    flight, _ = flights.join("how do i heal", [1.0, 0.0])
+    chunk = f"data: {json.dumps({'type': 'chunk', 'text': 'shared answer'})}\n\n"
+    threading.Timer(0.05, flights.publish, args=(flight, chunk)).start()
+    threading.Timer(0.1, flights.complete, args=(flight, dict(RESULT, answer_status="generated"))).start()
+    follower_steps = []
+    advance = service._advance_stream
+
+    def recording_advance(*args):
+        step = advance(*args)
+        follower_steps.append(step)
+        return step
+
+    monkeypatch.setattr(service, "_advance_stream", recording_advance)
+
+    async def collect():
+        with anyio.fail_after(2):  # would take poll_seconds if the wake-up were missed
+            return [event async for event in service.answer_question_stream_async(
+                db, "How do I heal?", user_ip="1.2.3.4", log_interaction=False,
+            )]
+
+    events = anyio.run(collect)
+
+    assert chunk in events
+    assert json.loads(events[-1][len("data: "):])["coalesced"] is True
+    assert any(isinstance(step, FlightIdle) for step in follower_steps)  # waited on the loop, not a thread
+
+
+def test_async_ask_follower_waits_for_the_leader_on_the_event_loop(monkeypatch, stub_answer_pipeline):
+    flights = SingleFlight()
+    db = _coalesce_with(monkeypatch, stub_answer_pipeline, flights)
+    flight, _ = flights.join("how do i heal", [1.0, 0.0])
+    threading.Timer(0.05, flights.complete, args=(flight, dict(RESULT, qa_log_id=3))).start()
+    follower_steps = []
+    advance = service._advance_answer
+
+    def recording_advance(*args):
+        step = advance(*args)
+        follower_steps.append(step[1])
+        return step
+
+    monkeypatch.setattr(service, "_advance_answer", recording_advance)
+
+    async def ask():
+        with anyio.fail_after(2):
+            return await service.answer_question_async(db, "How do I heal?", user_ip="1.2.3.4", log_interaction=False)
+
+    result = anyio.run(ask)
+
+    assert result["answer"] == "shared answer" and result["coalesced"] is True
+    assert any(isinstance(step, FlightIdle) for step in follower_steps)  # waited on the loop, not a thread
+    assert flights.stats()["waiting"] == 0
+
+
+def test_stream_follower_regenerates_when_the_leader_stops_part_way(stub_answer_pipeline):
+    own_answer = ("Grief softens when you give it room instead of rushing it. "
+                  "Several guests describe naming one memory out loud as a gentle place to start.")
+
+    async def model_stream(question, chunks, context=None, metadata=None):
+        yield own_answer
+
+    flights = SingleFlight(poll_seconds=5)
+    cache = stub_answer_pipeline(model_stream, flights=flights)
+    flight, _ = flights.join("how do i heal", [1.0, 0.0])
+    partial = f"data: {json.dumps({'type': 'chunk', 'text': 'Half of the lead'})}\n\n"
+    flights.publish(flight, partial)
+    threading.Timer(0.05, flights.release, args=(flight,)).start()  # the leader's client went away
+
+    async def collect():
+        with anyio.fail_after(2):
+            return [event async for event in service.answer_question_stream_async(
+                Mock(), "How do I heal?", user_ip="1.2.3.4", log_interaction=False,
+            )]
+
+    events = [json.loads(e[len("data: "):]) for e in anyio.run(collect) if e.startswith("data: ")]
+    types = [e["type"] for e in events]
+
+    assert types.index("restart") > types.index("chunk")  # the replayed partial chunk is discarded
+    after_restart = events[types.index("restart") + 1:]
+    assert [e["text"] for e in after_restart if e["type"] == "chunk"] == [own_answer]
+    assert {"citations", "follow_up", "headline"} <= {e["type"] for e in after_restart}
+    assert events[-1]["type"] == "done" and "coalesced" not in events[-1]
+    assert cache.put_calls[0]["answer"] == own_answer
+    assert flights.stats()["unshared"] == 1
@@ -0,0 +1,108 @@
+import threading
+
+import pytest
+
+from app.qa import service, speculative
+from app.qa.preprocessing import preprocess_query
+
+
+@pytest.fixture(autouse=True)
+def _fresh_state(monkeypatch):
+    monkeypatch.setattr(speculative, "_stats", speculative._SpeculationStats())
+    monkeypatch.setattr(speculative, "_predictor", speculative.LowMatchPredictor(max_entries=50))
+    monkeypatch.setattr(speculative.settings, "speculative_rewrite_threshold", 0.5)
+
+
+def test_vague_questions_score_higher_than_specific_ones():
+    predictor = speculative.get_low_match_predictor()
+    vague = preprocess_query("help")
+    specific = preprocess_query("How do I set healthy boundaries with my family when they criticize me?")
+
+    assert predictor.score(vague, "help") > predictor.score(specific, "specific")
+    assert predictor.predict(vague, "help")
+    assert not predictor.predict(specific, "specific")
+
+
+def test_predictor_learns_from_weak_history():
+    predictor = speculative.get_low_match_predictor()
+    question = "How do I set healthy boundaries with my family when they criticize me?"
+    processed = preprocess_query(question)
+    assert not predictor.predict(processed, question)
+
+    predictor.load_history([question])
+    assert predictor.score(processed, service.normalize_question(question)) == 1.0
+
+    # A strong primary later clears the exact-question entry again
+    predictor.record(processed, service.normalize_question(question), needed_rewrite=False)
+    assert predictor.score(processed, service.normalize_question(question)) < 1.0
+
+
+def test_predictor_history_is_bounded():
+    predictor = speculative.LowMatchPredictor(max_entries=3)
+    predictor.load_history([f"question number {i}" for i in range(10)])
+
+    assert len(predictor._weak_questions) == 3
+    assert len(predictor._term_counts) <= 3
+
+
+def test_used_speculation_counts_saved_work():
+    handle = speculative.SpeculativeRewrite(lambda cancelled: {"answer_chunks": []})
+
+    assert handle.result() == {"answer_chunks": []}
+    stats = speculative.get_speculative_rewrite_stats()
+    assert stats["started"] == 1 and stats["used"] == 1
+    assert stats["precision"] == 1.0
+
+
+def test_cancel_on_strong_primary_signals_running_work():
+    entered, release = threading.Event(), threading.Event()
+    seen_cancel = []
+
+    def work(cancelled):
+        entered.set()
+        release.wait(5)
+        seen_cancel.append(cancelled.is_set())
+        return None
+
+    handle = speculative.SpeculativeRewrite(work)
+    entered.wait(5)
+    handle.cancel()
+    release.set()
+    handle._future.result(5)
+
+    assert seen_cancel == [True]
+    assert handle.result() is None  # already settled
+    stats = speculative.get_speculative_rewrite_stats()
+    assert stats["wasted"] == 1 and stats["used"] == 0
+
+
+def test_failed_speculation_falls_back_to_none():
+    def work(cancelled):
+        raise RuntimeError("db down")
+
+    assert speculative.SpeculativeRewrite(work).result() is None
+    assert speculative.get_speculative_rewrite_stats()["failed"] == 1
+
+
+def test_service_only_speculates_in_speculative_mode(monkeypatch):
+    started = []
+    monkeypatch.setattr(service, "start_speculative_rewrite", lambda query, two_tier: started.append(query) or "handle")
+    processed = preprocess_query("help")
+
+    monkeypatch.setattr(service.settings, "low_match_rewrite_mode", "batched")
+    assert service._start_speculative_rewrite(processed, "help", "help; focus on help?", two_tier=True) is None
+
+    monkeypatch.setattr(service.settings, "low_match_rewrite_mode", "speculative")
+    assert service._start_speculative_rewrite(processed, "help", "help; focus on help?", two_tier=True) == "handle"
+    assert service._start_speculative_rewrite(processed, "help", None, two_tier=True) is None
+    assert started == ["help; focus on help?"]
+
+
+def test_weak_primary_without_prediction_is_counted_as_missed(monkeypatch):
+    monkeypatch.setattr(service.settings, "low_match_rewrite_mode", "speculative")
+    processed = preprocess_query("help")
+
+    service._settle_speculative_rewrite(None, processed, "help", "rewrite?", weak_primary=True)
+
+    stats = speculative.get_speculative_rewrite_stats()
+    assert stats["missed"] == 1 and stats["recall"] == 0.0
@@ -0,0 +1,104 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import anyio
+
+from app.core.config import settings
+from app.qa import answer, service
+
+ANSWER = ("Grief softens when you let it move through you instead of rushing it. "
+          "Several guests describe giving it room, and finding that it changes shape over time.")
+HEADLINE = "Grief asks for space, not solutions, and it changes shape when you give it room."
+METADATA = {
+    "follow_up_questions": ["How do I make room for grief", "What helps on the hardest days?", "Who can I lean on?"],
+    "shareable_headline": HEADLINE,
+}
+CHUNK = {"text": "Grief softens.", "start_time": 0, "end_time": 30,
+         "episode": {"id": 1, "title": "Ep 1", "audio_url": ""}, "similarity": 0.8}
+
+
+def _stream(deltas, metadata):
+    streamed = answer._StreamedAnswer(metadata)
+    phrases = [p for delta in deltas if (p := streamed.add(delta))]
+    last = streamed.finish()
+    return "".join(phrases + ([last] if last else []))
+
+
+def test_stream_trailer_is_kept_out_of_the_answer_even_when_the_marker_is_split():
+    raw = ANSWER + "\n\n" + answer._ANSWER_METADATA_MARKER + "\n" + json.dumps(METADATA)
+    deltas = [raw[i:i + 3] for i in range(0, len(raw), 3)]
+    metadata = {}
+
+    assert _stream(deltas, metadata) == ANSWER
+    assert answer.structured_answer_metadata(ANSWER, metadata) == {
+        "follow_up_questions": ["How do I make room for grief?", "What helps on the hardest days?", "Who can I lean on?"],
+        "shareable_headline": HEADLINE,
+    }
+
+
+def test_stream_without_trailer_keeps_the_whole_answer():
+    deltas = [ANSWER[i:i + 5] for i in range(0, len(ANSWER), 5)] + ["\n\n<<<"]
+    metadata = {}
+
+    assert _stream(deltas, metadata) == ANSWER + "\n\n<<<"  # a held-back marker prefix was answer text
+    assert metadata == {}
+    assert _stream(["Plain ", "answer <<<CARD>>> text."], None) == "Plain answer <<<CARD>>> text."
+
+
+def _completion(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content, refusal=None))])
+
+
+def test_compose_answer_takes_follow_ups_and_headline_from_one_call(monkeypatch):
+    create = Mock(return_value=_completion(json.dumps({"answer": ANSWER, **METADATA})))
+    monkeypatch.setattr(settings, "answer_structured_generation", True)
+    monkeypatch.setattr(settings, "openai_api_key", "sk-test")
+    monkeypatch.setattr("app.core.openai_clients.get_openai_client", lambda api_key: object())
+    monkeypatch.setattr("app.core.openai_compat.create_chat_completion", create)
+    monkeypatch.setattr(answer, "generate_follow_up_questions", Mock(side_effect=AssertionError("separate call")))
+    monkeypatch.setattr(answer, "generate_shareable_headline", Mock(side_effect=AssertionError("separate call")))
+
+    result = answer.compose_answer("How do I grieve?", [CHUNK])
+
+    assert create.call_count == 1
+    assert create.call_args.kwargs["response_format"]["type"] == "json_schema"
+    assert result["answer"] == ANSWER
+    assert result["follow_up_questions"][0] == "How do I make room for grief?"
+    assert result["shareable_headline"] == HEADLINE
+
+
+def test_compose_answer_falls_back_to_separate_calls_when_the_json_is_unusable(monkeypatch):
+    monkeypatch.setattr(settings, "answer_structured_generation", True)
+    monkeypatch.setattr(answer, "_generate_structured_answer", Mock(side_effect=RuntimeError("no answer text")))
+    monkeypatch.setattr(answer, "_generate_intelligent_answer", lambda question, chunks: ANSWER)
+    monkeypatch.setattr(answer, "generate_follow_up_questions", lambda *args: ["What next?"])
+    monkeypatch.setattr(answer, "generate_shareable_headline", lambda *args: HEADLINE)
+
+    result = answer.compose_answer("How do I grieve?", [CHUNK])
+
+    assert result["answer"] == ANSWER and result["answer_status"] == "generated"
+    assert result["follow_up_questions"] == ["What next?"] and result["shareable_headline"] == HEADLINE
+
+
+def test_stream_generates_only_the_metadata_the_trailer_left_out(monkeypatch, stub_answer_pipeline):
+    async def model_stream(question, chunks, context=None, metadata=None):
+        yield ANSWER
+        metadata.update({"shareable_headline": HEADLINE})  # no follow-ups in the trailer
+
+    follow_ups = Mock(return_value=["What next?"])
+    stub_answer_pipeline(model_stream)
+    monkeypatch.setattr(settings, "answer_structured_generation", True)
+    monkeypatch.setattr(answer, "generate_follow_up_questions", follow_ups)
+    monkeypatch.setattr(answer, "generate_shareable_headline", Mock(side_effect=AssertionError("separate call")))
+
+    async def collect():
+        return [event async for event in service.answer_question_stream_async(
+            Mock(), "How do I grieve?", user_ip="1.2.3.4", log_interaction=False,
+        )]
+
+    events = [json.loads(e[len("data: "):]) for e in anyio.run(collect) if e.startswith("data: ")]
+
+    assert {"type": "follow_up", "questions": ["What next?"]} in events
+    assert {"type": "headline", "text": HEADLINE} in events
+    follow_ups.assert_called_once()
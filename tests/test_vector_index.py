@@ -0,0 +1,100 @@
+import logging
+import threading
+import time
+from types import SimpleNamespace
+
+from app.core.config import Settings
+from app.qa import retrieval
+from app.qa.vector_index import ChunkVectorIndex
+
+
+class _FakeSession:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, stmt):
+        return list(self.rows)
+
+
+def test_search_returns_best_matches_first():
+    index = ChunkVectorIndex(dim=3)
+    index.load(_FakeSession([
+        (1, [1.0, 0.0, 0.0]),
+        (2, [0.0, 1.0, 0.0]),
+        (3, [0.7, 0.7, 0.0]),
+        (4, [0.0, 0.0, 0.0]),
+    ]))
+
+    hits = index.search([2.0, 0.1, 0.0], limit=2)
+
+    assert index.ready and index.size == 4
+    assert [chunk_id for chunk_id, _ in hits] == [1, 3]
+    assert abs(hits[0][1] - 0.99875) < 1e-4
+
+
+def test_search_limit_larger_than_corpus_returns_everything_sorted():
+    index = ChunkVectorIndex(dim=2)
+    index.load(_FakeSession([(1, [0.0, 1.0]), (2, [1.0, 0.0])]))
+
+    assert [chunk_id for chunk_id, _ in index.search([1.0, 0.2], limit=10)] == [2, 1]
+
+
+def test_forced_reload_picks_up_embeddings_rewritten_in_place(monkeypatch):
+    index = ChunkVectorIndex(dim=2)
+    db = _FakeSession([(1, [1.0, 0.0]), (2, [0.0, 1.0])])
+    index.load(db)
+    db.rows = [(1, [0.0, 1.0]), (2, [1.0, 0.0])]  # re-embedded, same ids
+    monkeypatch.setattr("app.core.db.get_session_local", lambda: lambda: db)
+    monkeypatch.setattr("app.core.db.safe_close_session", lambda db, context: None)
+
+    assert index.search([1.0, 0.0], limit=1)[0][0] == 1
+    assert index.refresh_in_background(full=True)
+    deadline = time.time() + 5
+    while index._refreshing and time.time() < deadline:
+        time.sleep(0.01)
+
+    assert index.search([1.0, 0.0], limit=1)[0][0] == 2
+
+
+def test_memory_backend_falls_back_to_pgvector_until_index_is_ready(monkeypatch):
+    index = ChunkVectorIndex(dim=2)
+    monkeypatch.setattr(index, "refresh_in_background", lambda: False)
+    monkeypatch.setattr("app.qa.vector_index.get_chunk_index", lambda: index)
+    monkeypatch.setattr(retrieval.settings, "retrieval_backend", "memory")
+    chunk = SimpleNamespace(id=1, episode_id=1, embedding=[1.0, 0.0])
+    monkeypatch.setattr(retrieval, "_search_pgvector", lambda db, embs, limit: [[(chunk, 0.9)]])
+
+    assert retrieval._search_candidates(object(), [[1.0, 0.0]], 30) == [[(chunk, 0.9)]]
+
+
+def test_starting_a_refresh_does_not_wait_for_a_load_in_progress(monkeypatch):
+    index = ChunkVectorIndex(dim=2)
+    loading, release = threading.Event(), threading.Event()
+    monkeypatch.setattr(index, "refresh", lambda db: None)
+    monkeypatch.setattr("app.core.db.get_session_local", lambda: lambda: object())
+    monkeypatch.setattr("app.core.db.safe_close_session", lambda db, context: None)
+
+    def slow_load():
+        with index._write_lock:  # a full load holds this for the whole DB read
+            loading.set()
+            release.wait(5)
+
+    loader = threading.Thread(target=slow_load)
+    loader.start()
+    assert loading.wait(5)
+    started = time.perf_counter()
+    index.refresh_in_background()  # what a request does when the index is stale
+    elapsed = time.perf_counter() - started
+    release.set()
+    loader.join()
+
+    assert elapsed < 0.5
+
+
+def test_retrieval_backend_setting_is_validated(caplog):
+    assert Settings(retrieval_backend=" Memory ").retrieval_backend == "memory"
+
+    with caplog.at_level(logging.WARNING):
+        assert Settings(retrieval_backend="memroy").retrieval_backend == "pgvector"
+
+    assert "RETRIEVAL_BACKEND" in caplog.text
@@ -0,0 +1,58 @@
+import math
+import random
+
+import pytest
+
+from app.core import vectors
+
+
+def _reference_cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm_a = math.sqrt(sum(x * x for x in a))
+    norm_b = math.sqrt(sum(x * x for x in b))
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+def _rows(count=20, dim=16, seed=3):
+    rng = random.Random(seed)
+    return [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(count)]
+
+
+def test_normalize_keeps_zero_vectors():
+    assert vectors.to_list(vectors.normalize([0.0, 0.0, 0.0])) == [0.0, 0.0, 0.0]
+    unit = vectors.to_list(vectors.normalize([3.0, 4.0]))
+    assert unit == pytest.approx([0.6, 0.8])
+
+
+def test_cosine_matches_reference():
+    a, b = _rows(2)
+    assert vectors.cosine_similarity(a, b) == pytest.approx(_reference_cosine(a, b), abs=1e-6)
+    assert vectors.cosine_similarity(a, [0.0] * len(a)) == 0.0
+
+
+def test_matvec_and_top_k_rank_like_reference():
+    rows = _rows()
+    query = rows[5]
+    scores = vectors.matvec(vectors.normalized_matrix(rows), vectors.normalize(query))
+
+    expected = sorted(range(len(rows)), key=lambda i: -_reference_cosine(rows[i], query))[:4]
+    assert vectors.top_k(scores, 4) == expected
+    assert vectors.top_k(scores, 0) == []
+    assert len(vectors.top_k(scores, 100)) == len(rows)
+
+
+def test_top_k_ties_keep_row_order():
+    rows = [[1.0, 0.0], [0.0, 1.0], [1.0, 0.0], [1.0, 0.0]]
+    scores = vectors.matvec(vectors.normalized_matrix(rows), vectors.normalize([1.0, 0.0]))
+    assert vectors.top_k(scores, 2) == [0, 2]
+
+
+def test_stack_of_normalized_rows_matches_normalized_matrix():
+    rows = _rows(5)
+    stacked = vectors.stack([vectors.normalize(row) for row in rows])
+    query = vectors.normalize(rows[0])
+    assert vectors.to_list(vectors.matvec(stacked, query)) == pytest.approx(
+        vectors.to_list(vectors.matvec(vectors.normalized_matrix(rows), query)), abs=1e-6
+    )
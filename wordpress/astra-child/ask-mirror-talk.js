@@ -2499,6 +2499,12 @@
             output.innerHTML = htmlParagraphs.join('');
           }
 
+          if (event.type === 'restart') {
+            // A shared answer stopped part-way; the server is answering again from scratch
+            answerText = '';
+            output.innerHTML = '';
+          }
+
           if (event.type === 'citations') {
             showCitations(event.citations);
             // Capture the first citation's theme for the explorer badge